@@ -12,10 +12,13 @@ import logging
 import os
 import re
 import glob
+import hashlib
+import json
 import math
 import subprocess
 import sys
 import threading
+import time
 
 
 from contextlib import contextmanager
@@ -34,6 +37,11 @@ class PremiereEngine(sgtk.platform.Engine):
     MAX_THUMB_SIZE = 512
 
     SHOTGUN_ADOBE_HEARTBEAT_INTERVAL = 1.0
+    SHOTGUN_ADOBE_HEARTBEAT_MIN_INTERVAL = 0.25
+    SHOTGUN_ADOBE_HEARTBEAT_MAX_INTERVAL = 3.0
+    SHOTGUN_ADOBE_HEARTBEAT_PHI_THRESHOLD = 12.0
+    SHOTGUN_ADOBE_HEARTBEAT_ACCEPTABLE_PAUSE = 10.0
+    SHOTGUN_ADOBE_HEARTBEAT_MIN_FAILURES = 3
     SHOTGUN_ADOBE_HEARTBEAT_TOLERANCE = 20
     SHOTGUN_ADOBE_NETWORK_DEBUG = ("SHOTGUN_ADOBE_NETWORK_DEBUG" in os.environ)
 
@@ -53,22 +61,53 @@ class PremiereEngine(sgtk.platform.Engine):
     _COMMAND_UID_COUNTER = 0
     _LOCK = threading.Lock()
     _FAILED_PINGS = 0
-    _CONTEXT_CACHE = dict()
+    _CONTEXT_CACHE = None
+    _CONTEXT_CACHE_SIGNATURE = None
     _CHECK_CONNECTION_TIMER = None
+    _MESSAGE_NOTIFIER = None
     _CONTEXT_CHANGES_DISABLED = False
     _DIALOG_PARENT = None
     _WIN32_AFTEREFFECTS_MAIN_HWND = None
     _PROXY_WIN_HWND = None
     _HEARTBEAT_DISABLED = False
     _PROJECT_CONTEXT = None
+    _TEMPLATE_INDEX = None
     _AFX_PID = None
     _POPUP_CACHE = None
     _AFX_WIN32_DIALOG_WINDOW_CLASS = "#32770" # the windows window class name used by Premiere for modal dialogs
     __WIN32_GW_CHILD = 5
     _CONTEXT_CACHE_KEY = "premiere_context_cache"
+    _CONTEXT_CACHE_SIZE = 500
 
     _HAS_CHECKED_CONTEXT_POST_LAUNCH = False
 
+    # seconds to wait for further active document changes before changing
+    # context, so that flipping through projects only changes context once.
+    _ACTIVE_DOCUMENT_CHANGE_DELAY = 0.25
+
+    # seconds without activity before resolving the context of the other open
+    # projects in the background, one project at a time.
+    _CONTEXT_PREFETCH_DELAY = 2.0
+
+    # the longest the context prefetch waits, in seconds, after failing to
+    # list the open projects. the wait doubles with every failure.
+    _CONTEXT_PREFETCH_MAX_BACKOFF = 120.0
+
+    # the name of the rpc stats dump, written next to the log file
+    _RPC_STATS_FILENAME = "tk-premiere-rpc-stats.json"
+
+    # host properties read through the property cache. the first ones are
+    # cached until the active document changes or is saved, the static ones
+    # for the whole session. the active sequence isn't cached since it can be
+    # switched without the active document changing.
+    _CACHED_HOST_PROPERTIES = (
+        "app.project.path",
+        "app.project.name",
+    )
+    _STATIC_HOST_PROPERTIES = (
+        "app.version",
+    )
+
     __CC_VERSION_MAPPING = {
         12: "2015",
         13: "2016",
@@ -91,6 +130,9 @@ class PremiereEngine(sgtk.platform.Engine):
         :param new_context: The current context.
         """
 
+        # the apps registered a new set of commands
+        self.__index_commands()
+
         # keep track of schema load for the current project to make sure we
         # aren't trying to use sg globals prior to load
         self.__schema_loaded = False
@@ -114,7 +156,12 @@ class PremiereEngine(sgtk.platform.Engine):
         )
 
         # go ahead and start the process of sending the current state back to js
-        self.__send_state()
+        self.__schedule_state()
+
+        # the projects open in the new context may not have been prefetched.
+        # list them again.
+        self.__prefetch_paths = None
+        self.__context_prefetch.schedule()
 
         # If the context is set in the environment, then we'll update it with
         # the new one. This will mean that a CEP extension restart will come
@@ -136,10 +183,76 @@ class PremiereEngine(sgtk.platform.Engine):
         # import and keep a handle on the bundled python module
         self.__tk_premiere = self.import_module("tk_premiere")
 
+        # log messages coming from js are written to the log file from a
+        # background thread.
+        self.__js_log_writer = self.__tk_premiere.BackgroundLogWriter(
+            lambda: sgtk.LogManager().base_file_handler,
+            "%s.js" % (self.logger.name,),
+        )
+
+        # the async rpc worker thread is only started on demand
+        self.__main_thread = threading.current_thread()
+        self.__rpc_executor = None
+        self.__rpc_dispatcher = None
+        # whether a state push waits for the async rpc worker to be done
+        self.__state_push_deferred = False
+
+        # log messages are sent to the panel in batches, once the bridge is
+        # up. debug messages only cross the bridge if debug logging is on.
+        self.__log_forwarder = self.__tk_premiere.LogForwarder(
+            lambda level, message: self.adobe.log_message(level, message),
+            ready=self.__can_send_log_messages,
+            defer=self.__request_log_flush,
+        )
+        self.__log_flush_requested = False
+        self.__log_forward_level = (
+            logging.DEBUG if self.get_setting("debug_logging") else logging.INFO
+        )
+
         # constant command uid lookups for these special commands
         self.__jump_to_sg_command_id = self.__get_command_uid()
         self.__jump_to_fs_command_id = self.__get_command_uid()
 
+        # registered commands by uid, for dispatching panel clicks
+        self.__commands_by_uid = dict()
+
+        # the commands as sent to the panel, built once per set of registered
+        # commands, and the context and digest of the state the panel shows.
+        self.__command_payload = None
+        self.__sent_state = None
+
+        # bursts of active document changes and state pushes are collapsed
+        # into a single call for the last one.
+        self.__document_change = self.__tk_premiere.Coalescer(
+            "active document change",
+            self._handle_active_document_change,
+            self._ACTIVE_DOCUMENT_CHANGE_DELAY,
+            logger=self.logger,
+        )
+        self.__state_push = self.__tk_premiere.Coalescer(
+            "panel state",
+            self.__push_state,
+            0,
+            logger=self.logger,
+        )
+        self.__force_state = False
+
+        # the contexts of the open projects are resolved while idle, so that
+        # switching to them is instant. the paths left to prefetch are None
+        # until the open projects have been listed.
+        self.__context_prefetch = self.__tk_premiere.Coalescer(
+            "context prefetch",
+            self.__prefetch_contexts,
+            self._CONTEXT_PREFETCH_DELAY,
+            logger=self.logger,
+        )
+        self.__prefetch_paths = None
+
+        # the number of times in a row listing the open projects failed, and
+        # when to try again.
+        self.__prefetch_failures = 0
+        self.__prefetch_retry_at = 0.0
+
         # get the adobe instance. it may have been initialized already by a
         # previous instance of the engine. if not, initialize a new one.
         self._adobe = self.__tk_premiere.AdobeBridge.get_or_create(
@@ -152,14 +265,74 @@ class PremiereEngine(sgtk.platform.Engine):
         self.logger.debug(
             "Network debug logging is %s" % self._adobe.network_debug)
 
+        # record the latency of every call going through the bridge. this has
+        # to wrap the bridge before it gets serialized below.
+        self.__rpc_stats = self.__tk_premiere.instrument_rpc(self._adobe)
+        self.__rpc_stats_path = None
+
+        # the heartbeat learns how regularly the bridge answers, and checks
+        # less often while nothing is going on.
+        self.__failure_detector = self.__tk_premiere.PhiAccrualDetector(
+            acceptable_pause=self.SHOTGUN_ADOBE_HEARTBEAT_ACCEPTABLE_PAUSE,
+        )
+        self.__heartbeat_schedule = self.__tk_premiere.HeartbeatSchedule(
+            self.SHOTGUN_ADOBE_HEARTBEAT_MIN_INTERVAL,
+            self.SHOTGUN_ADOBE_HEARTBEAT_INTERVAL,
+            self.SHOTGUN_ADOBE_HEARTBEAT_MAX_INTERVAL,
+        )
+        self.__bridge_activity = 0
+        # whether messages are handled as they arrive, rather than on the
+        # connection checks only.
+        self.__bridge_watched = False
+
+        # the bridge is shared by the qt thread and the async rpc worker
+        # thread. make sure their calls never interleave.
+        self.__rpc_lock = self.__tk_premiere.serialize_rpc(self._adobe)
+
+        # contexts are resolved from document paths on a worker thread of
+        # their own. only the resolution of the active document is applied.
+        self.__context_executor = None
+        self.__context_resolution = None
+
+        # uids of the commands clicked while the context was being resolved.
+        # they run once it's applied.
+        self.__pending_commands = list()
+
+        # memoizes hot host properties between document changes
+        self.__host_properties = self.__tk_premiere.PropertyCache(
+            self._adobe,
+            self._CACHED_HOST_PROPERTIES,
+            self._STATIC_HOST_PROPERTIES,
+        )
+
         self.logger.debug("%s: Initializing..." % (self,))
 
-        # connect to all the adobe bridge signals
-        self.adobe.logging_received.connect(self._handle_logging)
-        self.adobe.command_received.connect(self._handle_command)
-        self.adobe.active_document_changed.connect(self._handle_active_document_change)
-        self.adobe.run_tests_request_received.connect(self._run_tests)
-        self.adobe.state_requested.connect(self.__send_state)
+        # connect to all the adobe bridge signals. the bridge emits them from
+        # whichever thread is reading the socket, which includes the async rpc
+        # worker thread. the engine always handles them on the qt thread.
+        self.__bridge_slots = dict(
+            (signal, self.__tk_premiere.on_qt_thread(
+                slot,
+                lambda function: self.__get_qt_dispatcher()(function),
+                self.__main_thread,
+            ))
+            for signal, slot in (
+                ("logging_received", self._handle_logging),
+                ("command_received", self.__queue_command),
+                ("active_document_changed", self.__on_active_document_changed),
+                ("run_tests_request_received", self._run_tests),
+                ("state_requested", self.__on_state_requested),
+            )
+        )
+        for signal, slot in self.__bridge_slots.items():
+            getattr(self.adobe, signal).connect(slot)
+
+        # harvests the structure of the open projects. whatever it remembers
+        # between harvests is reset when the active document changes.
+        self.__session_info = self.__tk_premiere.SessionInfo(
+            self,
+            cache_root=os.path.join(self.cache_location, "session_info"),
+        )
 
         # in order to use frameworks, they have to be imported via
         # import_module. so they're exposed in the bundled python.
@@ -180,6 +353,23 @@ class PremiereEngine(sgtk.platform.Engine):
         # get outselves a settings manager where we can store metadata.
         self.__settings_manager = settings.UserSettings(self)
 
+        # the context cache outlives engine restarts, as long as the pipeline
+        # configuration and project stay the same. it's written out from a
+        # background thread, which gets a settings manager of its own. what
+        # a previous session stored is only read on the first lookup.
+        signature = self.__get_context_cache_signature()
+        if (PremiereEngine._CONTEXT_CACHE is None or
+                PremiereEngine._CONTEXT_CACHE_SIGNATURE != signature):
+            PremiereEngine._CONTEXT_CACHE = self.__tk_premiere.ContextCache(
+                capacity=self._CONTEXT_CACHE_SIZE,
+                logger=self.logger,
+            )
+            PremiereEngine._CONTEXT_CACHE_SIGNATURE = signature
+        self._CONTEXT_CACHE.store = self.__store_context_cache
+        self._CONTEXT_CACHE.load = self.__load_context_cache
+        self._CONTEXT_CACHE.deserialize = self.__deserialize_cached_context
+        self.__context_cache_settings = None
+
         # connect the retriever signals
         self.__sg_data.work_completed.connect(self.__on_worker_signal)
         self.__sg_data.work_failure.connect(self.__on_worker_failure)
@@ -189,6 +379,12 @@ class PremiereEngine(sgtk.platform.Engine):
         self.__context_find_uid = None
         self.__context_thumb_uid = None
 
+        # the fields of the entities shown in the context header, by entity
+        # type and id, and the uids of the requests prefetching them.
+        self.__context_entity_data = dict()
+        self.__context_display_cached = False
+        self.__prefetch_uids = set()
+
         # keep track if sg global schema has been cached
         self.__schema_loaded = False
 
@@ -205,28 +401,36 @@ class PremiereEngine(sgtk.platform.Engine):
         if not self.adobe.event_processor:
             try:
                 from sgtk.platform.qt import QtGui
-                self.adobe.event_processor = QtGui.QApplication.processEvents
+                self.adobe.event_processor = self.__process_events
             except ImportError:
                 pass
 
         self.__setup_connection_timer()
-        self.__send_state()
 
         # forward the log file path back to the js side. this is used to direct
         # clients to the file in the event of an error
         log_file = sgtk.LogManager().base_file_handler.baseFilename
-        self.adobe.send_log_file_path(log_file)
-
-        # If there are fewer than 2 documents open, we don't need the stored
-        # cache, regardless of whether this is a restart situation or a fresh
-        # launch of AE. In that case, we take the opportunity to clear anything
-        # that might exist in the stored cache, as it's data we don't need.
-        self.logger.debug("Single document found, clearing stored context cache.")
 
-        self.__settings_manager.store(
-            self._CONTEXT_CACHE_KEY,
-            dict(),
+        # the rpc stats are dumped next to the log file
+        self.__rpc_stats_path = os.path.join(
+            os.path.dirname(log_file),
+            self._RPC_STATS_FILENAME,
         )
+        self.register_command(
+            "Performance Stats",
+            self.__show_performance_stats,
+            dict(
+                type="context_menu",
+                description="Log the time spent in calls to Premiere and "
+                            "dump them to %s." % (self._RPC_STATS_FILENAME,),
+            ),
+        )
+
+        self.__send_state()
+        self.adobe.send_log_file_path(log_file)
+
+        # get the contexts of the other open projects ready
+        self.__context_prefetch.schedule()
 
     def destroy_engine(self):
         """
@@ -242,6 +446,15 @@ class PremiereEngine(sgtk.platform.Engine):
         # No longer poll for new messages from this engine.
         if self._CHECK_CONNECTION_TIMER:
             self._CHECK_CONNECTION_TIMER.stop()
+        if self._MESSAGE_NOTIFIER:
+            self._MESSAGE_NOTIFIER.stop()
+
+        # Drop the pending context change and state push, the panel is going
+        # away.
+        self.__document_change.cancel()
+        self.__state_push.cancel()
+        self.__context_prefetch.cancel()
+        self.__prefetch_paths = None
 
         # We're going to hide and force the garbage collection of any dialogs
         # that we know about. This will stop memory leaks, and is also prudent
@@ -252,6 +465,29 @@ class PremiereEngine(sgtk.platform.Engine):
             dialog.setParent(None)
             dialog.deleteLater()
 
+        # Write out the js log messages received so far.
+        self.__js_log_writer.stop(timeout=5.0)
+
+        # Send whatever is left in the log buffer while we still can.
+        self.__flush_log_messages()
+
+        # Keep the rpc stats of this session around for inspection.
+        self.__dump_rpc_stats()
+
+        # Write out the last changes to the context cache.
+        self._CONTEXT_CACHE.stop(timeout=5.0)
+
+        # Let the async rpc worker finish what's queued, without waiting for it.
+        if self.__rpc_executor:
+            self.__rpc_executor.shutdown()
+
+        # Any context being resolved is of no use anymore, nor are the
+        # commands waiting for it.
+        self.__context_resolution = None
+        self.__pending_commands = list()
+        if self.__context_executor:
+            self.__context_executor.shutdown()
+
         # Gracefully stop our data retriever. This call will block until the
         # currently-processing request has completed.
         self.__sg_data.stop()
@@ -262,11 +498,8 @@ class PremiereEngine(sgtk.platform.Engine):
         # Disconnect the signals in case there are references to this engine
         # out there. without disconnecting, it will still respond to signals
         # from the adobe bridge.
-        self.adobe.logging_received.disconnect(self._handle_logging)
-        self.adobe.command_received.disconnect(self._handle_command)
-        self.adobe.active_document_changed.disconnect(self._handle_active_document_change)
-        self.adobe.run_tests_request_received.disconnect(self._run_tests)
-        self.adobe.state_requested.disconnect(self.__send_state)
+        for signal, slot in self.__bridge_slots.items():
+            getattr(self.adobe, signal).disconnect(slot)
 
     def post_qt_init(self):
         """
@@ -275,8 +508,7 @@ class PremiereEngine(sgtk.platform.Engine):
         """
         # We need to have the RPC API call processEvents during its response
         # wait loop. This will keep that loop from blocking the UI thread.
-        from sgtk.platform.qt import QtGui
-        self.adobe.event_processor = QtGui.QApplication.processEvents
+        self.adobe.event_processor = self.__process_events
 
         # Since this is running in our own Qt event loop, we'll use the bundled
         # dark look and feel. breaking encapsulation to do so.
@@ -293,12 +525,22 @@ class PremiereEngine(sgtk.platform.Engine):
         """
         properties = properties or dict()
         properties["uid"] = self.__get_command_uid()
-        return super(PremiereEngine, self).register_command(
+        result = super(PremiereEngine, self).register_command(
             name,
             callback,
             properties,
         )
 
+        # the command may have been registered under a different name to
+        # avoid a clash. find it through its properties instead.
+        command = self.commands.get(name)
+        if command is None or command.get("properties") is not properties:
+            self.__index_commands()
+        else:
+            self.__commands_by_uid[properties["uid"]] = (name, command)
+            self.__command_payload = None
+        return result
+
     @property
     def host_info(self):
         """
@@ -311,7 +553,7 @@ class PremiereEngine(sgtk.platform.Engine):
             # Don't error out if the bridge was not yet started
             return {"name": "Premiere", "version": "unknown"}
 
-        version = self.adobe.app.version
+        version = self.host_properties.get("app.version")
         # app.premiere.PremiereVersion just returns 18.1.1 which is not what users see in the UI
         # extract a more meaningful version from the systemInformation property
         # which gives something like:
@@ -336,9 +578,8 @@ class PremiereEngine(sgtk.platform.Engine):
         :returns: The current project path or an empty string
         :rtype: str
         """
-        if self.adobe.app.project.path[0:4] == '\\\\?\\':
-            return self.adobe.app.project.path[4:]
-        return self.adobe.app.project.path
+        path = self.host_properties.get("app.project.path")
+        return self.__tk_premiere.strip_long_path_prefix(path)
 
     def save(self, path=None):
         """
@@ -355,6 +596,8 @@ class PremiereEngine(sgtk.platform.Engine):
                 # Premiere won't ensure that the folder is created when saving, so we must make sure it exists
                 ensure_folder_exists(os.path.dirname(path))
                 self.adobe.app.project.saveAs(path)
+            # the path and name change with saveAs, the file stamp with both
+            self.__host_properties.invalidate()
             new_path = self.project_path
             self.logger.info("Saved file to to {!r}".format(new_path))
 
@@ -472,20 +715,69 @@ class PremiereEngine(sgtk.platform.Engine):
         if self._HEARTBEAT_DISABLED:
             return
 
-        try:
-            self.adobe.ping()
-        except Exception:
-            if self._FAILED_PINGS >= self.SHOTGUN_ADOBE_HEARTBEAT_TOLERANCE:
-                from sgtk.platform.qt import QtCore
-                QtCore.QCoreApplication.instance().quit()
+        # a call in flight on the async rpc worker thread holds the bridge.
+        # don't block the qt thread waiting for it, the next tick will do.
+        if self.__rpc_executor and self.__rpc_executor.busy:
+            return
+
+        # any call that went through since the last check proves the bridge
+        # is alive, in which case there's no need to ping.
+        last_success = self.__rpc_stats.last_success
+        if last_success:
+            self.__failure_detector.heartbeat(last_success)
+
+        now = time.time()
+        if last_success and now - last_success < self.__heartbeat_schedule.interval:
+            self._FAILED_PINGS = 0
+            alive = True
+        else:
+            try:
+                self.adobe.ping()
+            except Exception:
+                self._FAILED_PINGS += 1
+                alive = False
             else:
+                self._FAILED_PINGS = 0
+                self.__failure_detector.heartbeat(time.time())
+                alive = True
+
+        if alive:
+            # Will allow queued up messages (like logging calls)
+            # to be handled on the Python end. Most of them have been handled
+            # as they arrived already, see __drain_bridge_messages, this
+            # catches whatever the socket notifier missed.
+            try:
+                self.adobe.process_new_messages()
+            except Exception:
                 self._FAILED_PINGS += 1
+                alive = False
+
+        if alive:
+            # follow the bridge socket across reconnections. the notifier
+            # reports losing it.
+            if self._MESSAGE_NOTIFIER:
+                self.__bridge_watched = self._MESSAGE_NOTIFIER.refresh()
         else:
-            self._FAILED_PINGS = 0
+            # give up once the silence is way out of line with how the bridge
+            # usually answers. a few failed pings are required regardless,
+            # and the tolerance is a backstop for when there isn't enough
+            # history to tell.
+            if self.__failure_detector.is_lost(
+                now,
+                self._FAILED_PINGS,
+                self.SHOTGUN_ADOBE_HEARTBEAT_PHI_THRESHOLD,
+                self.SHOTGUN_ADOBE_HEARTBEAT_MIN_FAILURES,
+                self.SHOTGUN_ADOBE_HEARTBEAT_TOLERANCE,
+            ):
+                self.logger.debug(
+                    "Lost the connection to Premiere (%d failed pings, phi %.1f)." % (
+                        self._FAILED_PINGS, self.__failure_detector.phi(now))
+                )
+                from sgtk.platform.qt import QtCore
+                QtCore.QCoreApplication.instance().quit()
+                return
 
-            # Will allow queued up messages (like logging calls)
-            # to be handled on the Python end.
-            self.adobe.process_new_messages()
+        self.__update_heartbeat_interval(failing=not alive)
 
         # We also have a one-time check we need to make after the timer is
         # started. In the event that the user opened a document before the
@@ -543,10 +835,18 @@ class PremiereEngine(sgtk.platform.Engine):
         # back to the js process via rpc.
         if hasattr(self, "_adobe"):
 
+            if record.levelno < self.__log_forward_level:
+                return
+
             level = self.PY_TO_JS_LOG_LEVEL_MAPPING[record.levelname]
 
-            # log the message back to js via rpc
-            self.adobe.log_message(level, record.message)
+            # queue the message to be sent back to js in the next batch. errors
+            # are sent right away, along with everything queued before them.
+            self.__log_forwarder.add(
+                level,
+                record.message,
+                urgent=record.levelno >= logging.ERROR,
+            )
 
         # prior to the _adobe attribute being set, we rely on the js process
         # handling stdout and logging it.
@@ -567,10 +867,16 @@ class PremiereEngine(sgtk.platform.Engine):
         Gets the active document from the host application, determines which
         context it belongs to, and changes to that context.
 
+        The context of documents which aren't in the context cache is resolved
+        on a worker thread, and changed to once resolved.
+
         :param str active_document_path: The path to the new active document.
 
-        :returns: True if the context changed, False if it did not.
+        :returns: True if the context changed, False if it did not, None if
+            it's being resolved.
         """
+        self.__bridge_activity += 1
+
         # If the config says to not change context on active document change, then
         # we don't do anything here.
         if not self.get_setting("automatic_context_switch"):
@@ -585,6 +891,11 @@ class PremiereEngine(sgtk.platform.Engine):
         if isinstance(active_document_path, unicode):
             active_document_path = active_document_path.encode("utf-8")
 
+        # the context cache and the template index work with regular paths
+        active_document_path = self.__tk_premiere.strip_long_path_prefix(
+            active_document_path
+        )
+
         # This will be True if the context_changes_disabled context manager is
         # used. We're just in a temporary state of not allowing context changes,
         # which is useful when an app is doing a lot of Premiere work that
@@ -600,55 +911,349 @@ class PremiereEngine(sgtk.platform.Engine):
             if active_document_path:
                 self.logger.debug("New active document is %s" % active_document_path)
 
+            # whatever was being resolved for the previous document is stale
+            cancelled = self.__cancel_context_resolution()
+
             cached_context = self.__get_from_context_cache(active_document_path)
 
             if cached_context:
                 context = cached_context
                 self.logger.debug("Document found in context cache: %r" % context)
+            elif not self.__get_template_index().contains(active_document_path):
+                # documents outside of all the storage roots can't yield a
+                # context
+                self.logger.debug(
+                    "Document isn't under any storage root. Setting the Project context."
+                )
+                context = self.__get_project_context()
             else:
-                try:
-                    context = self.tank.context_from_path(
-                        active_document_path,
-                        previous_context=self.context,
+                context = None
+
+            if context:
+                changed = self.__apply_document_context(context)
+
+                # the panel was told the context was about to change for the
+                # cancelled document. when it didn't, it needs the current
+                # state back.
+                if cancelled and not changed:
+                    self.__schedule_state(force=True)
+                self.__run_pending_commands()
+                return changed
+
+        # Resolving the context can take a while with deep templates on network
+        # storage. It's done on a worker thread while the panel shows that the
+        # context is about to change.
+        self.adobe.context_about_to_change()
+        self.__resolve_document_context(active_document_path)
+        return None
+
+    def __resolve_document_context(self, active_document_path):
+        """
+        Resolves the context of a document on a worker thread, and changes
+        to it once resolved, unless another document became active meanwhile.
+
+        :param str active_document_path: The path to the active document.
+        """
+        previous_context = self.context
+        resolution = dict(path=active_document_path, start=time.time())
+
+        templates = self.__get_template_index().lookup(active_document_path)[1]
+        self.logger.debug(
+            "Resolving the context of %s, matching %d templates: %s" % (
+                active_document_path, len(templates), ", ".join(sorted(templates)))
+        )
+
+        def _resolve():
+            # requests queued behind a slow one may already be stale
+            if resolution is not self.__context_resolution:
+                return None
+            return self.tank.context_from_path(
+                active_document_path,
+                previous_context=previous_context,
+            )
+
+        self.__context_resolution = resolution
+        resolution["future"] = self.__get_context_executor().submit(_resolve)
+        resolution["future"].add_done_callback(
+            lambda future: self.__finish_context_resolution(resolution)
+        )
+
+    def __get_context_executor(self):
+        """
+        :returns: The worker resolving contexts. It's a plain worker thread of
+            its own, which never holds the bridge: panel messages keep being
+            handled while a context is resolved.
+        """
+        if self.__context_executor is None:
+            self.__context_executor = self.__tk_premiere.BackgroundWorker(
+                self.__get_qt_dispatcher(),
+                self.logger,
+                name="PremiereContextResolver",
+            )
+        return self.__context_executor
+
+    def __is_idle(self):
+        """
+        :returns: True if nothing is going on in the foreground, i.e. no
+            document change, context resolution or async rpc call is pending
+            and no message came from the panel since the last heartbeat.
+        """
+        return not (
+            self._HEARTBEAT_DISABLED or
+            self.__bridge_activity > 0 or
+            self.__document_change.pending or
+            self.__context_resolution is not None or
+            (self.__rpc_executor is not None and self.__rpc_executor.busy) or
+            (self.__context_executor is not None and self.__context_executor.busy)
+        )
+
+    def __prefetch_contexts(self):
+        """
+        Resolves and caches the context of one of the open projects, and
+        schedules the next one. Backs off whenever the engine is busy with
+        something else, and for longer and longer after failing to list the
+        open projects.
+        """
+        if not self.__is_idle() or time.time() < self.__prefetch_retry_at:
+            self.__context_prefetch.schedule()
+            return
+
+        if self.__prefetch_paths is None:
+            # listing the projects goes through the bridge. do it on the rpc
+            # worker thread, out of the way of the qt thread.
+            def _on_listed(future):
+                error = future.exception()
+                if error is None and not isinstance(future.result(), list):
+                    error = "unexpected result %r" % (future.result(),)
+                if error is not None:
+                    # list them again once the backoff has elapsed
+                    self.__prefetch_failures += 1
+                    backoff = min(
+                        self._CONTEXT_PREFETCH_DELAY * 2 ** self.__prefetch_failures,
+                        self._CONTEXT_PREFETCH_MAX_BACKOFF,
                     )
-                    self.__add_to_context_cache(active_document_path, context)
-                except Exception:
-                    self.logger.debug(
-                        "Unable to determine context from path. Setting the Project context."
+                    self.__prefetch_retry_at = time.time() + backoff
+                    self.__prefetch_paths = None
+                    self.logger.warning(
+                        "Unable to list the open projects, retrying in %.0f "
+                        "seconds: %s" % (backoff, error)
                     )
-                    # clear the context finding task ids so that any tasks that
-                    # finish won't send data to js.
-                    self.__context_find_uid = None
-                    self.__context_thumb_uid = None
-
-                    # We go to the project context if this is a file outside of
-                    # SGTK control.
-                    if self._PROJECT_CONTEXT is None:
-                        self._PROJECT_CONTEXT = sgtk.Context(
-                            tk=self.context.sgtk,
-                            project=self.context.project,
-                        )
+                    self.__context_prefetch.schedule()
+                    return
+                self.__prefetch_failures = 0
+                self.__prefetch_retry_at = 0.0
+                self.__prefetch_paths = [
+                    p.encode("utf-8") if isinstance(p, unicode) else p
+                    for p in future.result()
+                ]
+                self.__context_prefetch.schedule()
+
+            self.__prefetch_paths = list()
+            self.rpc_async(self.__session_info.get_project_paths).add_done_callback(
+                _on_listed
+            )
+            return
 
-                    context = self._PROJECT_CONTEXT
+        index = self.__get_template_index()
+        while self.__prefetch_paths:
+            path = self.__prefetch_paths.pop(0)
+            if path in self._CONTEXT_CACHE or not index.contains(path):
+                continue
+
+            # no previous context: its task would be carried over into a
+            # context cached for a project which has nothing to do with it.
+            start = time.time()
+            future = self.__get_context_executor().submit(
+                self.tank.context_from_path,
+                path,
+            )
+            future.add_done_callback(
+                lambda f: self.__on_context_prefetched(path, f, start)
+            )
+            return
+
+    def __on_context_prefetched(self, path, future, start):
+        """
+        Caches a context resolved in the background, prefetches the fields to
+        show for it in the context header, and moves on to the next project.
 
-            if not context.project and not self.context.project:
+        :param str path: The path of the project.
+        :param future: The future holding the context.
+        :param float start: When the resolution was requested.
+        """
+        if future.exception() is not None:
+            self.logger.debug(
+                "Unable to prefetch the context of %s: %s" % (path, future.exception())
+            )
+        else:
+            context = future.result()
+            self.logger.debug(
+                "Prefetched the context of %s in %.3f seconds: %r" % (
+                    path, time.time() - start, context)
+            )
+            if path not in self._CONTEXT_CACHE:
+                self.__add_to_context_cache(path, context)
+            self.__prefetch_context_display(context)
+
+        self.__context_prefetch.schedule()
+
+    def __cancel_context_resolution(self):
+        """
+        Forgets about the context being resolved, if any. The worker thread
+        skips it if it hasn't started yet, and its result is discarded.
+
+        :returns: True if a resolution was cancelled.
+        """
+        resolution = self.__context_resolution
+        if resolution is None:
+            return False
+        self.__context_resolution = None
+        self.logger.debug(
+            "Cancelled the context resolution of %s after %.3f seconds." % (
+                resolution["path"], time.time() - resolution["start"])
+        )
+        return True
+
+    def __finish_context_resolution(self, resolution):
+        """
+        Changes to the context resolved for the active document, and runs the
+        commands clicked in the meantime. Called on the Qt thread once the
+        resolution is done.
+
+        :param dict resolution: The resolution to finish.
+        :returns: True if the context changed, False if it did not.
+        """
+        if resolution is not self.__context_resolution:
+            # another document became active meanwhile
+            return False
+
+        future = resolution["future"]
+        self.__context_resolution = None
+
+        active_document_path = resolution["path"]
+        try:
+            context = future.result()
+            self.__add_to_context_cache(active_document_path, context)
+        except Exception:
+            self.logger.debug(
+                "Unable to determine context from path. Setting the Project context."
+            )
+            # clear the context finding task ids so that any tasks that
+            # finish won't send data to js.
+            self.__context_find_uid = None
+            self.__context_thumb_uid = None
+
+            # We go to the project context if this is a file outside of
+            # SGTK control.
+            context = self.__get_project_context()
+
+        self.logger.debug(
+            "Resolved the context of %s in %.3f seconds." % (
+                active_document_path, time.time() - resolution["start"])
+        )
+
+        with self.heartbeat_disabled():
+            if self._CONTEXT_CHANGES_DISABLED:
                 self.logger.debug(
-                    "New context doesn't have a Project entity. Not changing "
-                    "context."
-                )
-                return False
-            elif not context.project:
-                context = self.tank.context_from_entity(
-                    self.context.project["type"],
-                    self.context.project["id"]
+                    "Engine is in 'no context changes' mode. Not changing context."
                 )
+                changed = False
+            else:
+                changed = self.__apply_document_context(context)
+
+        # the panel was told the context was about to change. when it didn't,
+        # it needs the current state back.
+        if not changed:
+            self.__schedule_state(force=True)
+
+        self.__run_pending_commands()
+        return changed
+
+    def __run_pending_commands(self):
+        """
+        Runs the commands which were waiting for the context of the active
+        document to be resolved.
+        """
+        commands = self.__pending_commands
+        self.__pending_commands = list()
+        for uid in commands:
+            self.__run_command(uid)
+
+    def __get_project_context(self):
+        """
+        :returns: The context of the current project, used for the documents
+            outside of SGTK control.
+        """
+        if self._PROJECT_CONTEXT is None:
+            self._PROJECT_CONTEXT = sgtk.Context(
+                tk=self.context.sgtk,
+                project=self.context.project,
+            )
+        return self._PROJECT_CONTEXT
 
-            if context and context != self.context:
-                self.adobe.context_about_to_change()
-                sgtk.platform.change_context(context)
-                return True
+    def __get_template_index(self):
+        """
+        Indexes the storage roots and path templates of the pipeline
+        configuration, once per configuration.
 
+        :returns: A :class:`~tk_premiere.template_index.TemplatePrefixIndex`.
+        """
+        pipeline_configuration = self.sgtk.pipeline_configuration.get_path()
+        if (PremiereEngine._TEMPLATE_INDEX is None or
+                PremiereEngine._TEMPLATE_INDEX[0] != pipeline_configuration):
+            start = time.time()
+            index = self.__tk_premiere.TemplatePrefixIndex(
+                self.sgtk.roots,
+                self.sgtk.templates,
+            )
+            self.logger.debug(
+                "Indexed %d storage roots and %d path templates in %.3f seconds." % (
+                    index.root_count, index.template_count, time.time() - start)
+            )
+            PremiereEngine._TEMPLATE_INDEX = (pipeline_configuration, index)
+        return PremiereEngine._TEMPLATE_INDEX[1]
+
+    def __apply_document_context(self, context):
+        """
+        Changes to the context of the active document.
+
+        :param context: The context of the active document.
+        :returns: True if the context changed, False if it did not.
+        """
+        if not context.project and not self.context.project:
+            self.logger.debug(
+                "New context doesn't have a Project entity. Not changing "
+                "context."
+            )
             return False
+        elif not context.project:
+            context = self.tank.context_from_entity(
+                self.context.project["type"],
+                self.context.project["id"]
+            )
+
+        if context and context != self.context:
+            self.adobe.context_about_to_change()
+            sgtk.platform.change_context(context)
+            return True
+
+        return False
+
+    def __queue_command(self, uid):
+        """
+        Handles a command request once the bridge lock is released.
+
+        Requests are read from the bridge socket with the lock held. Running
+        the command right away would keep it held for the whole command, and
+        async rpc calls made by the command could never start. The command is
+        handed to a later turn of the Qt event loop instead.
+
+        :param int uid: The unique id of the engine command to run.
+        """
+        if self.__rpc_lock.held():
+            self.__get_qt_dispatcher()(lambda: self.__queue_command(uid))
+            return
+        self._handle_command(uid)
 
     def _handle_command(self, uid):
         """
@@ -657,8 +1262,29 @@ class PremiereEngine(sgtk.platform.Engine):
         :param int uid: The unique id of the engine command to run.
         """
 
+        self.__bridge_activity += 1
         self.logger.debug("Handling command request for uid: %s" % (uid,))
 
+        # the command has to run in the context of the active document. don't
+        # wait for the context to be resolved here, the resolver thread may
+        # need the bridge in the meantime, e.g. to log.
+        self.__document_change.flush()
+        if self.__context_resolution is not None:
+            self.logger.debug(
+                "Running command %s once the context of the active document "
+                "is resolved." % (uid,)
+            )
+            self.__pending_commands.append(uid)
+            return
+
+        self.__run_command(uid)
+
+    def __run_command(self, uid):
+        """
+        Runs an engine command.
+
+        :param int uid: The unique id of the engine command to run.
+        """
         with self.heartbeat_disabled():
             from sgtk.platform.qt import QtGui
 
@@ -670,14 +1296,24 @@ class PremiereEngine(sgtk.platform.Engine):
                 # self._jump_to_sg()
             else:
                 # a registered command was triggered
-                for command in self.commands.values():
-                    if command.get("properties", dict()).get("uid") == uid:
-                        self.logger.debug(
-                            "Executing callback for command: %s" % (command,))
-                        result = command["callback"]()
-                        if isinstance(result, QtGui.QWidget):
-                            # if the callback returns a widget, keep a handle on it
-                            self.__qt_dialogs.append(result)
+                name, command = self.__commands_by_uid.get(uid, (None, None))
+                if command is None:
+                    self.logger.debug("No command registered for uid: %s" % (uid,))
+                    return
+
+                self.logger.debug(
+                    "Executing callback for command: %s" % (command,))
+                start = time.time()
+                try:
+                    result = command["callback"]()
+                finally:
+                    duration = time.time() - start
+                    self.__rpc_stats.record("command:%s" % (name,), duration)
+                    self.logger.debug(
+                        "Command %r ran for %.3f seconds." % (name, duration))
+                if isinstance(result, QtGui.QWidget):
+                    # if the callback returns a widget, keep a handle on it
+                    self.__qt_dialogs.append(result)
 
     def _handle_logging(self, level, message):
         """
@@ -686,6 +1322,7 @@ class PremiereEngine(sgtk.platform.Engine):
         :param str level: One of "debug", "info", "warning", or "error".
         :param str message: The log message.
         """
+        self.__bridge_activity += 1
 
         # manually create a record to log to the standard file handler.
         # we format it to match the regular logs, but tack on the '.js' to
@@ -697,9 +1334,9 @@ class PremiereEngine(sgtk.platform.Engine):
         })
 
         # forward this message to the base file handler so that it is logged
-        # appropriately.
-        if sgtk.LogManager().base_file_handler:
-            sgtk.LogManager().base_file_handler.handle(record)
+        # appropriately. this is done from a background thread, so that a
+        # flood of js messages doesn't hold up the qt thread.
+        self.__js_log_writer.submit(record)
 
     def _run_tests(self):
         """
@@ -769,6 +1406,23 @@ class PremiereEngine(sgtk.platform.Engine):
         """
         return self._adobe
 
+    @property
+    def host_properties(self):
+        """
+        The :class:`~tk_premiere.property_cache.PropertyCache` to read hot host
+        properties such as ``"app.project.path"`` through. Its values are
+        forgotten whenever the active document changes or is saved.
+        """
+        return self.__host_properties
+
+    @property
+    def session_info(self):
+        """
+        The :class:`SessionInfo` harvesting the structure of the open
+        projects, shared by the apps and hooks running in this engine.
+        """
+        return self.__session_info
+
     @property
     def app_id(self):
         """
@@ -799,6 +1453,80 @@ class PremiereEngine(sgtk.platform.Engine):
         yield
         self._CONTEXT_CHANGES_DISABLED = False
 
+    def rpc_async(self, function, *args, **kwargs):
+        """
+        Runs RPC calls without blocking the Qt thread.
+
+        The function is called on a worker thread. Its calls are serialized
+        with the RPC calls made on the Qt thread, which stays responsive in the
+        meantime. Callbacks registered on the returned future are run on the
+        Qt thread.
+
+        The call can't start while the Qt thread holds the bridge, i.e. during
+        a synchronous RPC call, including from the slots run while it waits for
+        the response. Waiting for the future there raises ``RuntimeError``
+        rather than deadlocking. Panel commands run with the bridge released,
+        they can wait for the future, though a callback is preferable.
+
+        Example::
+
+            future = engine.rpc_async(
+                lambda: engine.adobe.app.project.saveAs(path)
+            )
+            future.add_done_callback(lambda f: self.logger.info("Saved."))
+
+        :param function: The callable making the RPC calls.
+        :param args: Positional arguments to call it with.
+        :param kwargs: Keyword arguments to call it with.
+        :returns: A :class:`~tk_premiere.rpc_async.AsyncRPCFuture` instance.
+        """
+        if self.__rpc_executor is None:
+            self.__rpc_executor = self.__tk_premiere.AsyncRPCExecutor(
+                self.__get_qt_dispatcher(),
+                self.logger,
+                lock=self.__rpc_lock,
+            )
+        future = self.__rpc_executor.submit(function, *args, **kwargs)
+        # errors logged and state pushed while the worker held the bridge are
+        # sent right after
+        future.add_done_callback(self.__run_deferred_bridge_work)
+        return future
+
+    def __run_deferred_bridge_work(self, future):
+        """
+        Runs the log flush and the state push requested while the async rpc
+        worker held the bridge, if any.
+
+        :param future: The :class:`~tk_premiere.rpc_async.AsyncRPCFuture` of
+            the call which just completed.
+        """
+        if self.__log_flush_requested:
+            self.__flush_log_messages()
+        if self.__state_push_deferred:
+            self.__state_push_deferred = False
+            self.__state_push.schedule()
+
+    @contextmanager
+    def rpc_batch(self):
+        """
+        A context manager queuing host property reads and method calls, which
+        are all sent in a single round trip on exit. The results are available
+        from the returned futures once the block has been left. Nothing is
+        sent if the block raises.
+
+        Example::
+
+            with engine.rpc_batch() as batch:
+                name = batch.get("app.project.name")
+                path = batch.get("app.project.path")
+            self.logger.debug("%s: %s" % (name.result(), path.result()))
+
+        :returns: A :class:`~tk_premiere.rpc_batch.RPCBatch` instance.
+        """
+        batch = self.__tk_premiere.RPCBatch(self.adobe)
+        yield batch
+        batch.send()
+
     @contextmanager
     def heartbeat_disabled(self):
         """
@@ -893,6 +1621,144 @@ class PremiereEngine(sgtk.platform.Engine):
         q_message_box.question = _question_wrapper
         q_message_box.warning = _warning_wrapper
 
+    def __update_heartbeat_interval(self, failing=False):
+        """
+        Checks the connection more often while messages are going back and
+        forth, and less often while idle.
+
+        :param bool failing: Whether the last check failed, in which case it
+            is retried at the regular interval.
+        """
+        busy = self.__bridge_activity > 0 or len(self.__log_forwarder) > 0
+        self.__bridge_activity = 0
+
+        if failing:
+            interval = self.__heartbeat_schedule.reset()
+        elif self.__bridge_watched:
+            interval = self.__heartbeat_schedule.update(busy)
+        else:
+            # the checks are the only way messages get handled, never wait
+            # longer than the regular interval between them.
+            interval = self.__heartbeat_schedule.update(
+                busy, max_interval=self.SHOTGUN_ADOBE_HEARTBEAT_INTERVAL
+            )
+        timer = self._CHECK_CONNECTION_TIMER
+        if timer and timer.interval() != int(interval * 1000.0):
+            timer.setInterval(int(interval * 1000.0))
+
+    def __drain_bridge_messages(self):
+        """
+        Handles the messages waiting on the bridge socket.
+
+        :returns: False if they have to wait for the next connection check.
+        """
+        if self._HEARTBEAT_DISABLED:
+            return False
+
+        # the async rpc worker thread holds the bridge, and will read the
+        # socket itself while waiting for its response.
+        if self.__rpc_executor and self.__rpc_executor.busy:
+            return False
+
+        self.adobe.process_new_messages()
+        return True
+
+    def __get_qt_dispatcher(self):
+        """
+        :returns: The callable running functions on the Qt thread, shared by
+            the worker threads of the engine.
+        """
+        if self.__rpc_dispatcher is None:
+            self.__rpc_dispatcher = self.__tk_premiere.create_qt_dispatcher()
+        return self.__rpc_dispatcher
+
+    def __can_send_log_messages(self):
+        """
+        :returns: True if log messages can be sent to js without blocking, i.e.
+            from the Qt thread while the async rpc worker isn't holding the
+            bridge. Other threads leave the messages to the connection timer.
+        """
+        if threading.current_thread() is not self.__main_thread:
+            return False
+        return not (self.__rpc_executor and self.__rpc_executor.busy)
+
+    def __request_log_flush(self):
+        """
+        Flushes the log messages from the Qt thread as soon as it's free to,
+        rather than on the next connection check. Called from any thread when
+        an error can't be sent right away.
+        """
+        if self.__log_flush_requested:
+            return
+        self.__log_flush_requested = True
+        self.__get_qt_dispatcher()(self.__flush_log_messages)
+
+    def __flush_log_messages(self):
+        """
+        Sends the buffered log messages to js, unless that would block. A
+        requested flush which would is run again once the async rpc worker is
+        done with its call, see :meth:`rpc_async`.
+        """
+        if not self.__can_send_log_messages():
+            return
+        self.__log_flush_requested = False
+        try:
+            self.__log_forwarder.flush()
+        except Exception:
+            # the bridge is gone. the messages are in the log file regardless.
+            pass
+
+    def __dump_rpc_stats(self):
+        """
+        Writes the rpc stats next to the log file.
+
+        :returns: The path written to, or None if that failed.
+        """
+        if not self.__rpc_stats_path:
+            return None
+        try:
+            self.__rpc_stats.dump(self.__rpc_stats_path)
+        except Exception as e:
+            self.logger.debug("Unable to dump the RPC stats: %s" % (e,))
+            return None
+        return self.__rpc_stats_path
+
+    def __show_performance_stats(self):
+        """
+        Logs the rpc stats, the slowest calls first, and the hit rates of the
+        caches, and dumps the rpc stats to disk.
+        """
+        summary = self.__rpc_stats.summary()
+        self.logger.info(
+            "RPC calls over the last %.0f seconds:" % (summary["seconds"],)
+        )
+        for line in self.__rpc_stats.format(limit=25):
+            self.logger.info(line)
+
+        cache = self._CONTEXT_CACHE
+        self.logger.info(
+            "Context cache: %d documents, %d hits, %d misses (%.0f%% hit rate)." % (
+                len(cache), cache.hits, cache.misses, cache.hit_rate * 100.0)
+        )
+        properties = self.__host_properties
+        self.logger.info(
+            "Host properties: %d hits, %d misses." % (
+                properties.hits, properties.misses)
+        )
+
+        path = self.__dump_rpc_stats()
+        if path:
+            self.logger.info("Full RPC stats written to %s" % (path,))
+
+    def __process_events(self):
+        """
+        Processes Qt events while the bridge waits for a response. Only done on
+        the Qt thread: calls made from the async rpc worker thread just wait.
+        """
+        if threading.current_thread() is self.__main_thread:
+            from sgtk.platform.qt import QtGui
+            QtGui.QApplication.processEvents()
+
     def __check_for_popups(self):
         """
         Method will check if a popup dialog from premiere was openend
@@ -1207,6 +2073,17 @@ class PremiereEngine(sgtk.platform.Engine):
             self._COMMAND_UID_COUNTER += 1
             return self._COMMAND_UID_COUNTER
 
+    def __index_commands(self):
+        """
+        Rebuilds the lookup of the registered commands by uid.
+        """
+        self.__commands_by_uid = dict(
+            (command["properties"]["uid"], (name, command))
+            for name, command in self.commands.items()
+            if "uid" in command.get("properties", dict())
+        )
+        self.__command_payload = None
+
     def __get_icon_path(self, properties):
         """
         Processes the command properties dictionary to find the most appropriate
@@ -1252,10 +2129,72 @@ class PremiereEngine(sgtk.platform.Engine):
 
         return icon_path
 
-    def __send_state(self):
+    def __on_active_document_changed(self, active_document_path):
+        """
+        Changes context to the new active document once the active document
+        settles, see :meth:`_handle_active_document_change`.
+
+        :param str active_document_path: The path to the new active document.
+        """
+        self.__bridge_activity += 1
+
+        # whatever was read from the previous document is stale already, even
+        # if the context only changes once the active document settles.
+        self.__session_info.reset()
+        self.__host_properties.invalidate()
+
+        self.__document_change.schedule(active_document_path)
+
+        # the document may have just been opened, list the projects again
+        self.__prefetch_paths = None
+        self.__context_prefetch.schedule()
+
+    def __on_state_requested(self):
+        """
+        Sends the whole state when the panel asks for it. The panel only does
+        so when it has nothing to show, e.g. after being reloaded.
+        """
+        self.__schedule_state(force=True)
+
+    def __schedule_state(self, force=False):
+        """
+        Sends the state to the panel once the Qt event loop is idle. Requests
+        made in the meantime result in a single push.
+
+        :param bool force: Send the state even if the panel shows it already.
+        """
+        self.__force_state = self.__force_state or force
+        self.__state_push.schedule()
+
+    def __push_state(self):
+        """
+        Sends the state requested through :meth:`__schedule_state`. Waits for
+        the async rpc worker to be done with the bridge if it's busy, rather
+        than blocking the Qt thread on it.
+        """
+        if self.__rpc_executor and self.__rpc_executor.busy:
+            self.__state_push_deferred = True
+            return
+
+        force = self.__force_state
+        self.__force_state = False
+        self.__send_state(force=force)
+
+    def __send_state(self, force=False):
         """
         Sends information back to javascript representing the current context.
+
+        :param bool force: Send the state even if the panel shows it already.
         """
+        commands, digest = self.__get_command_payload()
+
+        # the panel is up to date, e.g. when switching between projects
+        # sharing a context. don't make it reload for nothing.
+        state = (self.context, digest)
+        if not force and self.__sent_state == state:
+            self.logger.debug("The panel state is up to date.")
+            return
+
         # alert js that the state is about to change. this allows the panel to
         # clear its current state and display a loading message.
         self.adobe.context_about_to_change()
@@ -1266,6 +2205,7 @@ class PremiereEngine(sgtk.platform.Engine):
         self.__context_find_uid = None
         self.__context_thumb_uid = None
         self.__sg_data.clear()
+        self.__prefetch_uids = set()
 
         # determine the best entity to show for the current context
         context_entity = self.__get_context_entity()
@@ -1274,6 +2214,30 @@ class PremiereEngine(sgtk.platform.Engine):
         # that are required to show it
         self.__request_context_display(context_entity)
 
+        # send the commands back to adobe
+        self.adobe.send_commands(commands)
+        self.__sent_state = state
+
+    def __get_command_payload(self):
+        """
+        Builds the commands to hand over to the panel. The result is kept
+        until the set of registered commands changes.
+
+        :returns: A tuple with the commands, and a digest of them.
+        """
+        if self.__command_payload is None:
+            commands = self.__build_command_payload()
+            digest = hashlib.md5(
+                json.dumps(commands, sort_keys=True, default=str)
+            ).hexdigest()
+            self.__command_payload = (commands, digest)
+        return self.__command_payload
+
+    def __build_command_payload(self):
+        """
+        :returns: The favorites, commands and context menu commands for the
+            panel.
+        """
         # ---- the engine already has access to all the commands that need to
         #      be display for the current context. so go ahead and process those
         #      and send them back separately
@@ -1303,6 +2267,12 @@ class PremiereEngine(sgtk.platform.Engine):
         context_menu_cmds = []
         commands = []
 
+        # map the apps back to their instance names
+        app_instance_names = dict(
+            (id(app_instance_obj), app_instance_name)
+            for (app_instance_name, app_instance_obj) in self.apps.items()
+        )
+
         # iterate over all the registered commands and gather the necessary info
         # to display them in adobe
         for (command_name, command_info) in self.commands.iteritems():
@@ -1318,9 +2288,7 @@ class PremiereEngine(sgtk.platform.Engine):
 
             # check this command's app against the engine's apps.
             if app_instance:
-                for (app_instance_name, app_instance_obj) in self.apps.items():
-                    if app_instance_obj == app_instance:
-                        app_name = app_instance_name
+                app_name = app_instance_names.get(id(app_instance))
 
             cmd_type = properties.get("type", "default")
 
@@ -1403,15 +2371,12 @@ class PremiereEngine(sgtk.platform.Engine):
 
         # ---- populate the state structure to hand over to adobe
 
-        all_commands = {
+        return {
             "favorites": favorites,
             "commands": commands,
             "context_menu_cmds": context_menu_cmds,
         }
 
-        # send the commands back to adobe
-        self.adobe.send_commands(all_commands)
-
     def __setup_connection_timer(self, force=False):
         """
         Sets up the connection timer that handles monitoring of the live
@@ -1444,6 +2409,7 @@ class PremiereEngine(sgtk.platform.Engine):
 
             timer.timeout.connect(self._check_connection)
             timer.timeout.connect(self.__check_for_popups)
+            timer.timeout.connect(self.__flush_log_messages)
 
             # The class variable is in seconds, so multiply to get milliseconds.
             timer.start(
@@ -1453,6 +2419,21 @@ class PremiereEngine(sgtk.platform.Engine):
             self._CHECK_CONNECTION_TIMER = timer
             self.log_debug("Connection timer created and started.")
 
+            # Messages sent by the panel are handled as soon as they arrive
+            # on the bridge socket. The timer remains as a fallback for when
+            # the socket can't be watched.
+            if self._MESSAGE_NOTIFIER:
+                self._MESSAGE_NOTIFIER.stop()
+            self._MESSAGE_NOTIFIER = self.__tk_premiere.BridgeMessageNotifier(
+                self.adobe,
+                self.__drain_bridge_messages,
+                logger=self.logger,
+            )
+            # the connection checks don't back off past the regular interval
+            # while falling back on them, see __update_heartbeat_interval. the
+            # notifier warns when the socket can't be found.
+            self.__bridge_watched = self._MESSAGE_NOTIFIER.refresh()
+
 #    def _jump_to_sg(self):
 #        """
 #        Jump to shotgun, launch web browser
@@ -1501,23 +2482,91 @@ class PremiereEngine(sgtk.platform.Engine):
         :param context: The context object to associate with the document.
         """
         if path not in self._CONTEXT_CACHE:
-            # We're storing the context cache in a sgtk user setting at the project
-            # level. This will ensure that when we read the cache back, we'll only
-            # be getting contexts in our current project. Anything outside of that
-            # scope would be unusable, as we don't allow context changing across
-            # project boundaries.
-            self._CONTEXT_CACHE[path] = context
-
-            serial_cache = dict()
-            for k, v in self._CONTEXT_CACHE.iteritems():
-                serial_cache[k] = v.serialize()
-
-            self.logger.debug("Storing context cache: %s" % serial_cache)
-            self.__settings_manager.store(
-                self._CONTEXT_CACHE_KEY,
-                serial_cache,
-                self.__settings_manager.SCOPE_PROJECT,
+            self._CONTEXT_CACHE.add(path, context)
+
+    def __store_context_cache(self, serial_cache):
+        """
+        Stores the serialized context cache. Called from the context cache's
+        background thread.
+
+        :param dict serial_cache: The document paths and their serialized
+            context.
+        """
+        # We're storing the context cache in a sgtk user setting at the project
+        # level. This will ensure that when we read the cache back, we'll only
+        # be getting contexts in our current project. Anything outside of that
+        # scope would be unusable, as we don't allow context changing across
+        # project boundaries.
+        if self.__context_cache_settings is None:
+            self.__context_cache_settings = self.__tk_premiere.shotgun_settings.UserSettings(self)
+
+        self.logger.debug("Storing %d cached contexts." % (len(serial_cache),))
+        self.__context_cache_settings.store(
+            self._CONTEXT_CACHE_KEY,
+            dict(
+                signature=self._CONTEXT_CACHE_SIGNATURE,
+                contexts=serial_cache,
+            ),
+            self.__context_cache_settings.SCOPE_PROJECT,
+        )
+
+    def __load_context_cache(self):
+        """
+        Reads the context cache stored by a previous session.
+
+        :returns: A dictionary of document paths and their serialized context,
+            or None if there is nothing usable.
+        """
+        stored = self.__settings_manager.retrieve(
+            self._CONTEXT_CACHE_KEY,
+            None,
+            self.__settings_manager.SCOPE_PROJECT,
+        )
+
+        # caches stored by older versions of the engine don't have a signature
+        if not isinstance(stored, dict) or "signature" not in stored:
+            return None
+
+        if stored["signature"] != self._CONTEXT_CACHE_SIGNATURE:
+            self.logger.debug(
+                "The stored context cache was built for another pipeline "
+                "configuration, ignoring it."
             )
+            return None
+        return stored.get("contexts")
+
+    def __deserialize_cached_context(self, serialized):
+        """
+        Turns a context from the stored context cache back into a context.
+
+        :param str serialized: The serialized context.
+        :returns: The context, or None if it doesn't belong to the current
+            pipeline configuration and project.
+        """
+        context = sgtk.Context.deserialize(serialized)
+
+        if context.sgtk.pipeline_configuration.get_path() != \
+                self.sgtk.pipeline_configuration.get_path():
+            return None
+
+        project = context.project or dict()
+        if project.get("id") != self.__get_project_id():
+            return None
+        return context
+
+    def __get_context_cache_signature(self):
+        """
+        Identifies what the cached contexts were resolved against.
+
+        :returns: A dictionary with the pipeline configuration path and uri,
+            and the project id.
+        """
+        descriptor = getattr(self.sgtk, "configuration_descriptor", None)
+        return dict(
+            pipeline_configuration=self.sgtk.pipeline_configuration.get_path(),
+            configuration_uri=descriptor.get_uri() if descriptor else None,
+            project_id=self.__get_project_id(),
+        )
 
     def __get_from_context_cache(self, path):
         """
@@ -1552,31 +2601,79 @@ class PremiereEngine(sgtk.platform.Engine):
             self.adobe.send_context_thumbnail(data)
             return
 
+        entity_type = entity["type"]
+        entity_id = entity["id"]
+
+        # show what was queried before right away, e.g. by the prefetch. the
+        # query below then refreshes it.
+        cached_entity = self.__context_entity_data.get((entity_type, entity_id))
+        self.__context_display_cached = cached_entity is not None
+        if cached_entity:
+            self.__display_context_entity(cached_entity)
+
+        # kick off an async request to query the necessary fields
+        self.__context_find_uid = self.__sg_data.execute_find_one(
+            entity_type,
+            [["id", "is", entity_id]],
+            self.__get_context_display_fields(entity_type),
+        )
+
+    def __get_context_display_fields(self, entity_type):
+        """
+        :returns: The fields of the given entity type to show in the context
+            header.
+        """
         # get the fields to query from the hook
         fields = self.execute_hook_method(
             "context_fields_display_hook",
             "get_entity_fields",
-            entity_type=entity["type"]
+            entity_type=entity_type
         )
 
         # always try to query the image for the entity
         if "image" not in fields:
             fields.append("image")
+        return fields
 
-        entity_type = entity["type"]
-        entity_id = entity["id"]
+    def __prefetch_context_display(self, context):
+        """
+        Queries the fields to show in the context header for a context, so
+        that they can be shown right away once it becomes the current one.
 
-        # kick off an async request to query the necessary fields
-        self.__context_find_uid = self.__sg_data.execute_find_one(
-            entity_type, [["id", "is", entity_id]], fields)
+        :param context: The context to prefetch the fields of.
+        """
+        entity = self.__get_context_entity(context)
+        if not entity:
+            return
+        if (entity["type"], entity["id"]) in self.__context_entity_data:
+            return
+
+        self.__prefetch_uids.add(
+            self.__sg_data.execute_find_one(
+                entity["type"],
+                [["id", "is", entity["id"]]],
+                self.__get_context_display_fields(entity["type"]),
+            )
+        )
 
     def __on_worker_failure(self, uid, msg):
         """
         Asynchronous callback - the worker thread errored.
         """
 
+        # prefetching is best effort
+        if uid in self.__prefetch_uids:
+            self.__prefetch_uids.discard(uid)
+            self.logger.debug("Failed to prefetch context fields: %s" % (msg,))
+
         # log a message if the worker failed to retrieve the necessary info.
-        if uid == self.__context_find_uid:
+        elif uid == self.__context_find_uid and self.__context_display_cached:
+
+            # the header shows what was queried before, leave it.
+            self.__context_find_uid = None
+            self.logger.debug("Failed to refresh context fields: %s" % (msg,))
+
+        elif uid == self.__context_find_uid:
 
             # clear the find id since we are now processing it
             self.__context_find_uid = None
@@ -1609,50 +2706,36 @@ class PremiereEngine(sgtk.platform.Engine):
 
         self.logger.debug("Worker signal: %s" % (data,))
 
+        # fields queried ahead of time, or the thumbnail they pointed at
+        if uid in self.__prefetch_uids:
+            self.__prefetch_uids.discard(uid)
+            context_entity = data.get("sg")
+            if context_entity:
+                self.__context_entity_data[
+                    (context_entity["type"], context_entity["id"])] = context_entity
+
+                # have the thumbnail downloaded to the disk cache as well
+                if context_entity.get("image"):
+                    self.__prefetch_uids.add(
+                        self.__sg_data.request_thumbnail(
+                            context_entity["image"],
+                            context_entity["type"],
+                            context_entity["id"],
+                            "image",
+                            load_image=False,
+                        )
+                    )
+
         # the find query for the context entity with the specified fields
-        if uid == self.__context_find_uid:
+        elif uid == self.__context_find_uid:
 
             # clear the find id since we are now processing it
             self.__context_find_uid = None
 
             context_entity = data["sg"]
-
-            # should have an image url now. submit a request to download the
-            # entity's thumbnail.
-            if "image" in context_entity and context_entity["image"]:
-                self.__context_thumb_uid = self.__sg_data.request_thumbnail(
-                    context_entity["image"],
-                    context_entity["type"],
-                    context_entity["id"],
-                    "image",
-                    load_image=False,
-                )
-            # no image, use a default image based on the entity type
-            else:
-                if context_entity["type"] in ["Asset", "Project", "Shot", "Task"]:
-                    thumb_path = "../images/default_%s_thumb_dark.png" % (
-                        context_entity["type"])
-                    data["thumb_path"] = thumb_path
-                else:
-                    thumb_path = "../images/default_Entity_thumb_dark.png"
-
-                data = dict(
-                    thumb_path=thumb_path,
-                    url=self.get_entity_url(context_entity),
-                )
-                self.adobe.send_context_thumbnail(data)
-
-            # now that we have all the field values, go back to the hook and
-            # build the html to display them.
-            fields_html = self.execute_hook_method(
-                "context_fields_display_hook",
-                "get_context_html",
-                entity=context_entity,
-                sg_globals=self.__shotgun_globals,
-            )
-
-            # forward the display html back to the js panel
-            self.adobe.send_context_display(fields_html)
+            self.__context_entity_data[
+                (context_entity["type"], context_entity["id"])] = context_entity
+            self.__display_context_entity(context_entity)
 
         # thumbnail download. forward the path and a url back to js
         elif uid == self.__context_thumb_uid:
@@ -1667,6 +2750,48 @@ class PremiereEngine(sgtk.platform.Engine):
 
             self.adobe.send_context_thumbnail(data)
 
+    def __display_context_entity(self, context_entity):
+        """
+        Sends the context header of an entity to the panel.
+
+        :param dict context_entity: The entity, with the fields to display.
+        """
+        # should have an image url now. submit a request to download the
+        # entity's thumbnail.
+        if "image" in context_entity and context_entity["image"]:
+            self.__context_thumb_uid = self.__sg_data.request_thumbnail(
+                context_entity["image"],
+                context_entity["type"],
+                context_entity["id"],
+                "image",
+                load_image=False,
+            )
+        # no image, use a default image based on the entity type
+        else:
+            if context_entity["type"] in ["Asset", "Project", "Shot", "Task"]:
+                thumb_path = "../images/default_%s_thumb_dark.png" % (
+                    context_entity["type"])
+            else:
+                thumb_path = "../images/default_Entity_thumb_dark.png"
+
+            data = dict(
+                thumb_path=thumb_path,
+                url=self.get_entity_url(context_entity),
+            )
+            self.adobe.send_context_thumbnail(data)
+
+        # now that we have all the field values, go back to the hook and
+        # build the html to display them.
+        fields_html = self.execute_hook_method(
+            "context_fields_display_hook",
+            "get_context_html",
+            entity=context_entity,
+            sg_globals=self.__shotgun_globals,
+        )
+
+        # forward the display html back to the js panel
+        self.adobe.send_context_display(fields_html)
+
     def __get_project_id(self):
         """Helper method to return the project id for the current context."""
 
@@ -1675,10 +2800,12 @@ class PremiereEngine(sgtk.platform.Engine):
         else:
             return None
 
-    def __get_context_entity(self):
-        """Helper method to return an entity to display for current context."""
-
-        context = self.context
+    def __get_context_entity(self, context=None):
+        """
+        Helper method to return an entity to display for a context, the
+        current one by default.
+        """
+        context = context or self.context
 
         # determine the best entity for displaying the thumbnail. just return
         # the first of task, entity, project that is defined
@@ -70,6 +70,11 @@ class PremiereSceneCollector(HookBaseClass):
         :param parent_item: Root item instance
         """
 
+        # the project may have been saved under another name from Premiere's
+        # own menu, which the engine isn't told about. read the path and name
+        # afresh once per collection, the publish plugins then share them.
+        self.parent.engine.host_properties.invalidate()
+
         # check if the current project was saved already
         # if not we will not add a publish item for it
         parent_item = self.__get_project_publish_item(settings, parent_item)
@@ -97,10 +102,16 @@ class PremiereSceneCollector(HookBaseClass):
         :param parent_item: Root item instance
         :returns: the newly created project item
         """
+        engine = self.parent.engine
+
+        # fetch the path and the name in a single round trip. they're then
+        # served from the engine's cache, here and in the publish plugins.
+        engine.host_properties.prefetch("app.project.path", "app.project.name")
+
         project_name = "Untitled"
-        path = self.parent.engine.project_path
+        path = engine.project_path
         if path:
-            project_name = self.parent.engine.adobe.app.project.name
+            project_name = engine.host_properties.get("app.project.name")
         project_item = parent_item.create_item(
             "premiere.project",
             "Premiere Scene",
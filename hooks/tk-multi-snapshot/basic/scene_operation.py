@@ -32,15 +32,15 @@ class SceneOperation(Hook):
                                      file path as a String
                     all others     - None
         """
-        adobe = self.parent.engine.adobe
+        engine = self.parent.engine
+        adobe = engine.adobe
 
         if operation == "current_path":
-            # FIXME under windows, path has a prefix \\?\
-            if adobe.app.project.path[0:4] == '\\\\?\\':
-                return adobe.app.project.path[4:]
-            return adobe.app.project.path
+            return engine.project_path
 
-        elif operation == "open":
+        # all other operations replace or save the project. the host
+        # properties read meanwhile are stale once they're done.
+        if operation == "open":
             adobe.app.project.closeDocument(0, 0)
             adobe.app.openDocument(file_path)
 
@@ -48,4 +48,6 @@ class SceneOperation(Hook):
             # save the current script
             adobe.app.project.save()
 
+        engine.host_properties.invalidate()
+
 
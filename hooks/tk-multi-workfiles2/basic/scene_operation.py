@@ -80,9 +80,12 @@ class SceneOperation(HookClass):
         logger = engine.logger
 
         if operation == "current_path":
-            return adobe.app.project.path
+            return engine.project_path
 
-        elif operation == "open":
+        # all other operations replace, rename or save the project. the host
+        # properties read meanwhile, e.g. by the context change, are stale
+        # once they're done.
+        if operation == "open":
             adobe.app.openDocument(file_path)
 
         elif operation == "save":
@@ -93,6 +96,7 @@ class SceneOperation(HookClass):
 
         elif operation == "reset":
             adobe.app.project.closeDocument(0, 0)
+            engine.host_properties.invalidate()
             return True
 
         elif operation == "prepare_new":
@@ -106,3 +110,5 @@ class SceneOperation(HookClass):
                 prproj = os.path.join(engine.disk_location, "resources", "Untitled.prproj")
 
             adobe.app.openDocument(prproj)
+
+        engine.host_properties.invalidate()
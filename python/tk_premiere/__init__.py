@@ -9,32 +9,62 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import sys
-import sgtk
 
 from .session_info import SessionInfo
-
-
-adobe_bridge = sgtk.platform.import_framework(
-    "tk-framework-adobe",
-    "tk_framework_adobe.adobe_bridge"
+from .prproj_reader import PremiereProjectReader
+from .snapshot_cache import SnapshotCache
+from .rpc_batch import RPCBatch, RPCBatchError
+from .property_cache import PropertyCache
+from .rpc_async import (
+    AsyncRPCExecutor,
+    create_qt_dispatcher,
+    on_qt_thread,
+    serialize_rpc,
 )
+from .worker import BackgroundWorker, Future
+from .rpc_stats import RPCStats, instrument_rpc
+from .log_forwarder import LogForwarder
+from .log_writer import BackgroundLogWriter
+from .heartbeat import HeartbeatSchedule, PhiAccrualDetector
+from .message_notifier import BridgeMessageNotifier
+from .coalescer import Coalescer
+from .context_cache import ContextCache
+from .paths import strip_long_path_prefix
+from .template_index import TemplatePrefixIndex
+from . import timeline_model
+from .timebase import Timebase
+from .timeline_index import TimelineIndex
 
+# the modules above don't need toolkit, so that e.g. project files can be read
+# and timelines queried outside of Premiere:
+#
+#     import tk_premiere
+#     info = tk_premiere.PremiereProjectReader("/path/to/project.prproj").get_info()
+#
+# the frameworks below are only available to the running engine.
+try:
+    import sgtk
+except ImportError:
+    sgtk = None
 
-AdobeBridge = adobe_bridge.AdobeBridge
-
-
-shotgun_data = sgtk.platform.import_framework("tk-framework-shotgunutils", "shotgun_data")
 
+if sgtk is not None:
+    adobe_bridge = sgtk.platform.import_framework(
+        "tk-framework-adobe",
+        "tk_framework_adobe.adobe_bridge"
+    )
 
-shotgun_globals = sgtk.platform.import_framework("tk-framework-shotgunutils", "shotgun_globals")
+    AdobeBridge = adobe_bridge.AdobeBridge
 
+    shotgun_data = sgtk.platform.import_framework("tk-framework-shotgunutils", "shotgun_data")
 
-shotgun_settings = sgtk.platform.import_framework("tk-framework-shotgunutils", "settings")
+    shotgun_globals = sgtk.platform.import_framework("tk-framework-shotgunutils", "shotgun_globals")
 
+    shotgun_settings = sgtk.platform.import_framework("tk-framework-shotgunutils", "settings")
 
-if sys.platform == "win32":
-    win_32_api = sgtk.platform.import_framework(
-        "tk-framework-adobe",
-        "tk_framework_adobe_utils.win_32_api"
-    )
+    if sys.platform == "win32":
+        win_32_api = sgtk.platform.import_framework(
+            "tk-framework-adobe",
+            "tk_framework_adobe_utils.win_32_api"
+        )
 
@@ -0,0 +1,120 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import time
+
+
+class Coalescer(object):
+    """
+    Collapses bursts of requests into a single call on the Qt thread.
+
+    Every request restarts a single shot timer, and only the arguments of the
+    last request are used once it fires. Requests superseded that way are
+    counted, and logged along with an estimate of the time their calls would
+    have taken, based on how long the calls that did run took.
+    """
+
+    def __init__(self, name, callback, delay, logger=None):
+        """
+        :param str name: What the calls do, for logging, e.g.
+            ``"context change"``.
+        :param callback: The callable to run.
+        :param float delay: Seconds to wait for further requests. 0 runs the
+            call the next time the Qt event loop is idle.
+        :param logger: Optional logger to report the coalesced calls to.
+        """
+        self._name = name
+        self._callback = callback
+        self._delay = delay
+        self._logger = logger
+        self._timer = None
+        self._pending = None
+        self._superseded = 0
+        self._first_request = None
+
+        # the number and total duration of the calls run
+        self._calls = 0
+        self._duration = 0.0
+
+    @property
+    def pending(self):
+        """
+        True while a call is waiting to run.
+        """
+        return self._pending is not None
+
+    @property
+    def mean_duration(self):
+        """
+        The mean duration of the calls run so far, in seconds.
+        """
+        if not self._calls:
+            return 0.0
+        return self._duration / self._calls
+
+    def schedule(self, *args, **kwargs):
+        """
+        Requests a call with the given arguments, superseding any pending one.
+        """
+        if self._pending is not None:
+            self._superseded += 1
+        else:
+            self._first_request = time.time()
+        self._pending = (args, kwargs)
+
+        if self._timer is None:
+            # imported here since the engine is responsible for defining Qt
+            from sgtk.platform.qt import QtCore
+
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        self._timer.start(int(self._delay * 1000.0))
+
+    def cancel(self):
+        """
+        Drops the pending call, if any.
+        """
+        if self._timer is not None:
+            self._timer.stop()
+        self._pending = None
+        self._superseded = 0
+
+    def flush(self):
+        """
+        Runs the pending call right away, if any.
+
+        :returns: The value returned by the call, or None.
+        """
+        if self._timer is not None:
+            self._timer.stop()
+        if self._pending is None:
+            return None
+
+        (args, kwargs) = self._pending
+        superseded = self._superseded
+        waited = time.time() - self._first_request
+        self._pending = None
+        self._superseded = 0
+
+        if superseded and self._logger:
+            self._logger.debug(
+                "Coalesced %d %s requests over %.3f seconds, saving about "
+                "%.3f seconds." % (
+                    superseded + 1, self._name, waited,
+                    superseded * self.mean_duration)
+            )
+
+        start = time.time()
+        try:
+            return self._callback(*args, **kwargs)
+        finally:
+            self._calls += 1
+            self._duration += time.time() - start
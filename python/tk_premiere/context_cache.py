@@ -0,0 +1,238 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import threading
+
+
+class ContextCache(object):
+    """
+    Remembers the context of the documents opened, so that switching back to
+    a document doesn't have to resolve its context again.
+
+    The least recently used documents are forgotten once the cache is full.
+    Contexts are serialized once, when added, and the serialized cache is
+    handed to :attr:`store` from a background thread: writes requested while
+    one is pending are coalesced into a single one.
+
+    A cache persisted by a previous session is read through :attr:`load` on
+    first use. Its contexts are only deserialized when looked up.
+    """
+
+    def __init__(self, capacity=500, store=None, delay=1.0, logger=None,
+                 load=None, deserialize=None):
+        """
+        :param int capacity: The number of documents to remember at most.
+        :param store: Callable taking a dictionary of document paths and their
+            serialized context, persisting it. It's called from a background
+            thread.
+        :param float delay: Seconds to wait for further changes before writing.
+        :param logger: Optional logger to report failed writes to.
+        :param load: Callable returning the dictionary of document paths and
+            their serialized context last stored, or None.
+        :param deserialize: Callable turning a serialized context back into a
+            context, or returning None if it can't be used anymore.
+        """
+        self.store = store
+        self.load = load
+        self.deserialize = deserialize
+        self._loaded = False
+        self._capacity = capacity
+        self._delay = delay
+        self._logger = logger
+
+        # path -> (context, serialized context), the most recently used last.
+        # the context is None until a loaded entry is looked up.
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # set when there's a change to write, or to wake the thread up when
+        # stopping. _pending tells the two apart.
+        self._dirty = threading.Event()
+        self._pending = False
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        self.__load()
+        return path in self._entries
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups which found a context, 0 without lookups.
+        """
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return float(self.hits) / lookups
+
+    def get(self, path):
+        """
+        :param str path: The path of a document.
+        :returns: The context of the document, or None if it isn't cached.
+        """
+        self.__load()
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries[path] = entry
+
+        (context, serialized) = entry
+        if context is None:
+            context = self.__deserialize(serialized)
+            with self._lock:
+                if context is None:
+                    self._entries.pop(path, None)
+                elif self._entries.get(path) is entry:
+                    self._entries[path] = (context, serialized)
+
+        with self._lock:
+            if context is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return context
+
+    def add(self, path, context, serialized=None):
+        """
+        Caches the context of a document and schedules a write.
+
+        :param str path: The path of the document.
+        :param context: The context of the document.
+        :param str serialized: The serialized context, if known already.
+        """
+        if serialized is None:
+            serialized = context.serialize()
+
+        self.__load()
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            self._entries[path] = (context, serialized)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+        if previous is None or previous[1] != serialized:
+            self.__schedule_write()
+
+    def clear(self):
+        """
+        Forgets all the cached documents, and schedules a write.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+        self.__schedule_write()
+
+    def serialized(self):
+        """
+        :returns: A dictionary of the cached document paths and their
+            serialized context.
+        """
+        with self._lock:
+            return dict(
+                (path, serialized)
+                for path, (context, serialized) in self._entries.items()
+            )
+
+    def __load(self):
+        """
+        Reads the persisted cache, the first time only.
+        """
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.load is None:
+            return
+
+        try:
+            persisted = self.load() or dict()
+        except Exception as e:
+            if self._logger:
+                self._logger.debug("Unable to load the context cache: %s" % (e,))
+            return
+
+        with self._lock:
+            for path, serialized in persisted.items():
+                if len(self._entries) >= self._capacity:
+                    break
+                if path not in self._entries:
+                    self._entries[path] = (None, serialized)
+        if self._logger:
+            self._logger.debug("Loaded %d cached contexts." % (len(persisted),))
+
+    def __deserialize(self, serialized):
+        """
+        :returns: The context, or None if it can't be used.
+        """
+        if self.deserialize is None:
+            return None
+        try:
+            return self.deserialize(serialized)
+        except Exception as e:
+            if self._logger:
+                self._logger.debug("Dropping a cached context: %s" % (e,))
+            return None
+
+    def __schedule_write(self):
+        if self.store is None:
+            return
+        self._pending = True
+        self._dirty.set()
+        if self._thread is None:
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(
+                target=self.__work, args=(self._stopping,),
+                name="PremiereContextCacheWriter")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def __work(self, stopping):
+        while True:
+            self._dirty.wait()
+            # let the changes made in quick succession pile up
+            stopping.wait(self._delay)
+            self._dirty.clear()
+            if self._pending:
+                self._pending = False
+                self.__write()
+            if stopping.is_set():
+                return
+
+    def __write(self):
+        store = self.store
+        if store is None:
+            return
+        try:
+            store(self.serialized())
+        except Exception as e:
+            # the cache is only an optimization, the next write will retry
+            if self._logger:
+                self._logger.debug("Unable to store the context cache: %s" % (e,))
+
+    def stop(self, timeout=None):
+        """
+        Writes out any pending change and stops the background thread.
+
+        :param float timeout: Seconds to wait for the write.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._stopping.set()
+        self._dirty.set()
+        thread.join(timeout)
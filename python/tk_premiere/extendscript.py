@@ -0,0 +1,51 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+ExtendScript snippets shared by the code evaluating scripts on the host.
+"""
+
+# ExtendScript has no native JSON support, so scripts returning structured
+# data bundle this minimal encoder and hand back enc(value) as a string. Only
+# plain values, arrays and plain objects can be encoded, host objects have to
+# be turned into plain objects first.
+JSON_ENCODER = r"""
+    function enc(v) {
+        if (v === null || v === undefined) {
+            return "null";
+        }
+        var t = typeof v;
+        if (t === "number") {
+            return isFinite(v) ? String(v) : "null";
+        }
+        if (t === "boolean") {
+            return v ? "true" : "false";
+        }
+        if (t === "string") {
+            return '"' + v.replace(/[\\"\u0000-\u001f]/g, function (c) {
+                var code = c.charCodeAt(0).toString(16);
+                return "\\u" + "0000".substr(code.length) + code;
+            }) + '"';
+        }
+        var parts = [];
+        if (v instanceof Array) {
+            for (var i = 0; i < v.length; i++) {
+                parts.push(enc(v[i]));
+            }
+            return "[" + parts.join(",") + "]";
+        }
+        for (var k in v) {
+            if (v.hasOwnProperty(k)) {
+                parts.push(enc(k) + ":" + enc(v[k]));
+            }
+        }
+        return "{" + parts.join(",") + "}";
+    }
+"""
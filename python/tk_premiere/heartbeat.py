@@ -0,0 +1,150 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers deciding how often to check the connection to the panel, and when to
+give up on it.
+"""
+
+import collections
+import math
+
+
+class PhiAccrualDetector(object):
+    """
+    A phi accrual failure detector.
+
+    Instead of giving up after a fixed number of missed heartbeats, it learns
+    the usual interval between heartbeats and expresses the time since the
+    last one as a suspicion level ``phi``: the odds of the connection still
+    being alive are roughly ``10 ** -phi``. A phi of 8 means a one in a
+    hundred million chance of a heartbeat arriving this late from a live peer.
+    """
+
+    def __init__(self, window=100, min_std=0.5, acceptable_pause=0.0):
+        """
+        :param int window: The number of intervals to base the estimate on.
+        :param float min_std: The lower bound of the standard deviation, in
+            seconds. Keeps a very regular history from making the detector
+            jumpy.
+        :param float acceptable_pause: Seconds added to the expected interval,
+            e.g. to allow for a slow host call.
+        """
+        self._intervals = collections.deque(maxlen=window)
+        self._min_std = min_std
+        self._acceptable_pause = acceptable_pause
+        self._last = None
+
+    @property
+    def last_heartbeat(self):
+        """
+        The time of the last heartbeat, or None.
+        """
+        return self._last
+
+    def heartbeat(self, now):
+        """
+        Records a sign of life. Heartbeats older than the last one are ignored.
+
+        :param float now: The time the heartbeat was received.
+        """
+        if self._last is not None:
+            if now <= self._last:
+                return
+            self._intervals.append(now - self._last)
+        self._last = now
+
+    def phi(self, now):
+        """
+        :param float now: The current time.
+        :returns: The suspicion level. 0 as long as there isn't enough history
+            to tell.
+        """
+        if self._last is None or len(self._intervals) < 2:
+            return 0.0
+
+        count = float(len(self._intervals))
+        mean = sum(self._intervals) / count
+        variance = sum((i - mean) ** 2 for i in self._intervals) / count
+        std = max(math.sqrt(variance), self._min_std)
+
+        # logistic approximation of the normal distribution's tail
+        y = (now - self._last - mean - self._acceptable_pause) / std
+        z = y * (1.5976 + 0.070566 * y * y)
+        if z < -700.0:
+            # well within the usual interval
+            return 0.0
+        if z > 700.0:
+            # further out than floats can express
+            return float("inf")
+        return max(0.0, -math.log10(1.0 / (1.0 + math.exp(z))))
+
+    def is_lost(self, now, failures, threshold, min_failures, tolerance):
+        """
+        Tells whether to give up on the connection.
+
+        :param float now: The current time.
+        :param int failures: The number of checks failed in a row.
+        :param float threshold: The phi from which the connection is suspected
+            to be lost.
+        :param int min_failures: The number of failed checks required
+            regardless of phi, so that a single hiccup is never fatal.
+        :param int tolerance: The number of failed checks after which to give
+            up regardless of phi, for when there isn't enough history to tell.
+        :returns: True if the connection is lost.
+        """
+        if failures >= tolerance:
+            return True
+        return failures >= min_failures and self.phi(now) >= threshold
+
+
+class HeartbeatSchedule(object):
+    """
+    Adapts the interval between connection checks to the traffic: it drops
+    to the minimum while there's work going on, and doubles up to the maximum
+    for every check during which nothing happened.
+    """
+
+    def __init__(self, min_interval, interval, max_interval):
+        """
+        :param float min_interval: The interval to use while busy, in seconds.
+        :param float interval: The interval to start with.
+        :param float max_interval: The longest interval to back off to.
+        """
+        self._min_interval = min_interval
+        self._default_interval = interval
+        self._max_interval = max_interval
+        self.interval = interval
+
+    def reset(self):
+        """
+        Goes back to the initial interval, e.g. while retrying a failed check.
+
+        :returns: The interval to wait for until the next check.
+        """
+        self.interval = self._default_interval
+        return self.interval
+
+    def update(self, busy, max_interval=None):
+        """
+        :param bool busy: Whether anything happened since the last check.
+        :param float max_interval: Overrides the longest interval to back off
+            to for this check, if lower. E.g. to keep checking at the initial
+            interval while the checks are the only way messages get handled.
+        :returns: The interval to wait for until the next check.
+        """
+        longest = self._max_interval
+        if max_interval is not None:
+            longest = min(longest, max_interval)
+        if busy:
+            self.interval = self._min_interval
+        else:
+            self.interval = min(self.interval * 2.0, longest)
+        return self.interval
@@ -0,0 +1,118 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import threading
+
+
+class LogForwarder(object):
+    """
+    Buffers log messages on their way to the panel and sends them in batches.
+
+    Messages are kept in a ring buffer until :meth:`flush` is called, the
+    buffer holds ``flush_size`` messages, or an urgent message comes in.
+    Consecutive messages of the same level are then joined and sent as a
+    single message, so a burst of debug output costs one round trip instead
+    of one per line. When messages come in faster than they can be flushed
+    the oldest ones are dropped, and a warning saying how many were lost is
+    sent with the next batch.
+
+    Messages are only sent as they are added while ``ready`` says so. They are
+    buffered otherwise, until the next explicit :meth:`flush`, which ``defer``
+    is called to request.
+    """
+
+    def __init__(self, send, capacity=2000, flush_size=100, ready=None,
+                 defer=None):
+        """
+        :param send: Callable taking a level and a message, sending them to
+            the panel.
+        :param int capacity: The number of messages to keep at most.
+        :param int flush_size: The number of buffered messages triggering a
+            flush.
+        :param ready: Optional callable returning whether messages can be sent
+            from the calling thread right now, without blocking.
+        :param defer: Optional callable taking no argument, called when
+            messages due to be sent can't be, e.g. to schedule a flush on
+            another thread.
+        """
+        self._send = send
+        self._ready = ready
+        self._defer = defer
+        self._capacity = capacity
+        self._flush_size = flush_size
+        self._records = collections.deque(maxlen=capacity)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+        # messages logged while a batch is being sent, e.g. by the bridge
+        # itself, are only buffered to avoid recursing.
+        self._flushing = threading.local()
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, level, message, urgent=False):
+        """
+        Buffers a message.
+
+        :param str level: The panel log level, e.g. ``"info"``.
+        :param str message: The message.
+        :param bool urgent: Whether to flush right away, e.g. for errors.
+        """
+        with self._lock:
+            if len(self._records) == self._capacity:
+                self._dropped += 1
+            self._records.append((level, message))
+            full = len(self._records) >= self._flush_size
+
+        if (urgent or full) and not getattr(self._flushing, "active", False):
+            if self._ready is None or self._ready():
+                self.flush()
+            elif self._defer is not None:
+                self._defer()
+
+    def flush(self):
+        """
+        Sends all buffered messages.
+        """
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+            dropped = self._dropped
+            self._dropped = 0
+
+        if not records and not dropped:
+            return
+
+        batches = list()
+        if dropped:
+            batches.append((
+                "warn",
+                ["%d log messages were dropped, see the log file for the "
+                 "complete output." % (dropped,)],
+            ))
+        for level, message in records:
+            if batches and batches[-1][0] == level:
+                batches[-1][1].append(message)
+            else:
+                batches.append((level, [message]))
+
+        self._flushing.active = True
+        try:
+            for level, messages in batches:
+                try:
+                    self._send(level, "\n".join(messages))
+                except UnicodeError:
+                    # mixed byte and unicode strings which can't be joined
+                    for message in messages:
+                        self._send(level, message)
+        finally:
+            self._flushing.active = False
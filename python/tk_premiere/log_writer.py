@@ -0,0 +1,138 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import logging
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class BackgroundLogWriter(object):
+    """
+    Hands log records to a logging handler from a background thread.
+
+    Submitting a record never blocks: records go into a bounded queue, which a
+    worker thread drains in batches. When the queue is full the record is
+    dropped and counted instead, and a single warning with the number of
+    dropped records is written once the worker catches up.
+    """
+
+    def __init__(self, get_handler, name, capacity=5000, batch_size=200):
+        """
+        :param get_handler: Callable returning the handler to write the records
+            to, or None if there is none at the moment.
+        :param str name: The logger name of the overflow warnings.
+        :param int capacity: The number of records to queue at most.
+        :param int batch_size: The number of records to write between two
+            flushes of the handler.
+        """
+        self._get_handler = get_handler
+        self._name = name
+        self._batch_size = batch_size
+        self._capacity = capacity
+        self._queue = None
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def dropped(self):
+        """
+        The number of records dropped and not reported yet.
+        """
+        return self._dropped
+
+    def submit(self, record):
+        """
+        Queues a record to be written.
+
+        :param record: A :class:`logging.LogRecord`.
+        """
+        with self._thread_lock:
+            if self._thread is None:
+                self._queue = queue.Queue(maxsize=self._capacity)
+                self._thread = threading.Thread(
+                    target=self.__work, args=(self._queue,),
+                    name="PremiereLogWriter")
+                self._thread.daemon = True
+                self._thread.start()
+            records = self._queue
+        try:
+            records.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def __work(self, records):
+        while True:
+            batch = [records.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            self.__write([r for r in batch if r is not None])
+            if stop:
+                return
+
+    def __write(self, records):
+        """
+        Writes a batch of records, reporting any dropped ones first.
+        """
+        with self._dropped_lock:
+            dropped = self._dropped
+            self._dropped = 0
+
+        if dropped:
+            records.insert(0, logging.makeLogRecord({
+                "levelname": "WARNING",
+                "levelno": logging.WARNING,
+                "name": self._name,
+                "msg": "%d log messages were dropped, too many were sent at "
+                       "once." % (dropped,),
+            }))
+
+        handler = self._get_handler()
+        if not handler or not records:
+            return
+
+        for record in records:
+            try:
+                handler.handle(record)
+            except Exception:
+                # logging must never take the worker down
+                pass
+        try:
+            handler.flush()
+        except Exception:
+            pass
+
+    def stop(self, timeout=None):
+        """
+        Writes the queued records and stops the worker thread.
+
+        :param float timeout: Seconds to wait for the worker to finish.
+        """
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+            records = self._queue
+        if thread is None:
+            return
+        # the stop marker has to get through even if the queue is full. the
+        # worker only ever reads from the queue it was started with.
+        records.put(None)
+        thread.join(timeout)
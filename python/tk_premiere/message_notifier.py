@@ -0,0 +1,218 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Handling the messages sent by the panel as soon as they arrive.
+
+The adobe bridge doesn't expose its socket, nor does it tell when something
+was received: messages are only read when ``process_new_messages`` is called.
+:class:`BridgeMessageNotifier` digs the socket out of the socket.io client
+the bridge is built on and watches it from the Qt event loop instead. A
+bridge providing a ``fileno()`` method of its own is watched through it.
+"""
+
+import sys
+
+# the attributes leading from the bridge to its socket, for the socket.io
+# client versions the bridge has been shipped with. the first one found wins.
+_SOCKET_ATTRIBUTES = (
+    ("_io", "_transport_instance", "_connection", "sock"),
+    ("_io", "_transport_instance", "_connection"),
+    ("_io", "_transport", "_connection", "sock"),
+    ("_io", "_transport", "_connection"),
+    ("_io", "_http_session", "sock"),
+)
+
+
+def _get_attribute(obj, name):
+    """
+    :returns: The value of an attribute, or None if it doesn't exist or is a
+        property. Some of the client's properties reconnect when accessed.
+    """
+    if isinstance(getattr(type(obj), name, None), property):
+        return None
+    return getattr(obj, name, None)
+
+
+def _get_fileno(obj):
+    """
+    :returns: The file descriptor of a socket like object, or None if it
+        isn't one or it's closed.
+    """
+    try:
+        fileno = obj.fileno()
+    except Exception:
+        return None
+    if isinstance(fileno, int) and fileno >= 0:
+        return fileno
+    return None
+
+
+def _describe_client(adobe):
+    """
+    :returns: The module and version of the socket.io client of a bridge, for
+        logging.
+    """
+    client = _get_attribute(adobe, "_io")
+    if client is None:
+        return "no socket.io client"
+    module = type(client).__module__
+    package = sys.modules.get(module.split(".")[0])
+    return "%s %s" % (module, getattr(package, "__version__", "(unknown version)"))
+
+
+def find_bridge_socket(adobe):
+    """
+    Looks for the file descriptor of the socket a bridge talks through: the
+    one handed out by the ``fileno()`` method of the bridge if it has one,
+    otherwise the one found through the private attributes of its socket.io
+    client.
+
+    :param adobe: The adobe bridge instance.
+    :returns: The file descriptor, or None if it couldn't be found, e.g. when
+        the bridge fell back to http polling.
+    """
+    if callable(_get_attribute(adobe, "fileno")):
+        return _get_fileno(adobe)
+
+    for attributes in _SOCKET_ATTRIBUTES:
+        current = adobe
+        for attribute in attributes:
+            current = _get_attribute(current, attribute)
+            if current is None:
+                break
+        if current is None:
+            continue
+
+        fileno = _get_fileno(current)
+        if fileno is not None:
+            return fileno
+    return None
+
+
+class BridgeMessageNotifier(object):
+    """
+    Calls a function on the Qt thread whenever data arrives on the socket of
+    the adobe bridge.
+
+    The callback is expected to drain the socket, e.g. by calling
+    ``process_new_messages``. The notifier is disabled while it runs, so that
+    the Qt events processed by the bridge while reading don't trigger it
+    again. A callback unable to drain the socket right away returns False:
+    the socket is then ignored until the next :meth:`refresh`, rather than
+    reporting the same data over and over.
+    """
+
+    def __init__(self, adobe, callback, logger=None):
+        """
+        :param adobe: The adobe bridge instance.
+        :param callback: The callable to run when data arrives.
+        :param logger: Optional logger to report failures to.
+        """
+        self._adobe = adobe
+        self._callback = callback
+        self._logger = logger
+        self._fileno = None
+        self._notifier = None
+        self._draining = False
+        # whether the last refresh failed to find the socket, so that the
+        # fallback on polling is only reported once.
+        self._missing = False
+
+    @property
+    def active(self):
+        """
+        True while the socket is being watched.
+        """
+        return self._notifier is not None and self._notifier.isEnabled()
+
+    def refresh(self):
+        """
+        Starts watching the socket of the bridge, or watches the new one if
+        the bridge reconnected since. Cheap enough to call on every heartbeat.
+
+        :returns: True if the socket is being watched.
+        """
+        fileno = find_bridge_socket(self._adobe)
+        if fileno == self._fileno and self._notifier is not None:
+            if not self._draining:
+                self._notifier.setEnabled(True)
+            return True
+
+        self.stop()
+        if fileno is None:
+            if self._logger and not self._missing:
+                # e.g. a socket.io client upgrade moved the socket elsewhere
+                self._logger.warning(
+                    "The bridge socket can't be found (%s), messages from "
+                    "the panel are only handled on the connection timer." % (
+                        _describe_client(self._adobe),)
+                )
+            self._missing = True
+            return False
+        self._missing = False
+
+        # imported here since the engine is responsible for defining Qt
+        from sgtk.platform.qt import QtCore
+
+        notifier = QtCore.QSocketNotifier(
+            fileno,
+            QtCore.QSocketNotifier.Read,
+            QtCore.QCoreApplication.instance(),
+        )
+        notifier.activated.connect(self.__on_activated)
+        self._notifier = notifier
+        self._fileno = fileno
+        if self._logger:
+            self._logger.debug("Watching the bridge socket (%d) for messages." % (fileno,))
+        return True
+
+    def stop(self):
+        """
+        Stops watching the socket.
+        """
+        notifier = self._notifier
+        self._notifier = None
+        self._fileno = None
+        if notifier is None:
+            return
+        try:
+            notifier.setEnabled(False)
+            notifier.activated.disconnect(self.__on_activated)
+            notifier.deleteLater()
+        except Exception:
+            # the application is going away, nothing left to clean up
+            pass
+
+    def __on_activated(self, *args):
+        if self._draining or self._notifier is None:
+            return
+
+        notifier = self._notifier
+        self._draining = True
+        notifier.setEnabled(False)
+        try:
+            drained = self._callback()
+        except Exception as e:
+            # a socket that keeps reporting data which can't be read, e.g.
+            # once the panel has gone away, would keep the event loop spinning.
+            # leave it to the heartbeat from now on.
+            if self._logger:
+                self._logger.warning(
+                    "Stopped watching the bridge socket, messages from the "
+                    "panel are only handled on the connection timer: %s" % (e,)
+                )
+            self.stop()
+            return
+        finally:
+            self._draining = False
+
+        if drained is not False and notifier is self._notifier:
+            notifier.setEnabled(True)
@@ -0,0 +1,35 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers for the paths handed out by Premiere.
+"""
+
+# the prefixes of windows extended length paths, as handed out by Premiere
+_UNC_PREFIX = "\\\\?\\UNC\\"
+_LONG_PATH_PREFIX = "\\\\?\\"
+
+
+def strip_long_path_prefix(path):
+    """
+    Turns a windows extended length path, e.g. ``\\\\?\\C:\\project.prproj``
+    or ``\\\\?\\UNC\\server\\share\\project.prproj``, into a regular path.
+    Other paths are returned as they are.
+
+    :param str path: The path to strip.
+    :returns: The path without prefix.
+    """
+    if not path:
+        return path
+    if path[:len(_UNC_PREFIX)].upper() == _UNC_PREFIX:
+        return "\\\\" + path[len(_UNC_PREFIX):]
+    if path.startswith(_LONG_PATH_PREFIX):
+        return path[len(_LONG_PATH_PREFIX):]
+    return path
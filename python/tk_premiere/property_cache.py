@@ -0,0 +1,124 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from .rpc_batch import RPCBatch
+
+
+class PropertyCache(object):
+    """
+    A read-through cache for a selected set of host properties.
+
+    Properties are addressed by their path from the bridge, e.g.
+    ``"app.project.path"``. The first read goes through the bridge, later
+    reads are served from memory until :meth:`invalidate` is called, which the
+    engine does whenever the active document changes or the project is saved.
+    Premiere doesn't report every change though, e.g. a Save As from its own
+    menu, so callers about to rely on a value for an operation, such as the
+    publisher's collector, invalidate the cache first. Properties that never
+    change during a session, such as ``app.version``, can be marked as static
+    so that they survive invalidation.
+
+    Reading a property which wasn't registered isn't an error: it's simply
+    read through the bridge every time.
+    """
+
+    def __init__(self, adobe, properties, static_properties=None):
+        """
+        :param adobe: The adobe bridge to read the properties through.
+        :param properties: The paths of the properties to cache until the next
+            invalidation.
+        :param static_properties: The paths of the properties to cache for
+            the lifetime of the cache.
+        """
+        self._adobe = adobe
+        self._properties = frozenset(properties)
+        self._static_properties = frozenset(static_properties or list())
+        self._values = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, path):
+        return path in self._values
+
+    def is_cached(self, path):
+        """
+        :returns: True if the given property is cached by this instance.
+        """
+        return path in self._properties or path in self._static_properties
+
+    def __read(self, path):
+        """
+        Reads a property through the bridge, one attribute at a time.
+        """
+        value = self._adobe
+        for name in path.split("."):
+            value = getattr(value, name)
+        return value
+
+    def get(self, path):
+        """
+        :param str path: The path of the property, e.g. ``"app.project.name"``.
+        :returns: The value of the property.
+        """
+        if not self.is_cached(path):
+            return self.__read(path)
+
+        try:
+            value = self._values[path]
+        except KeyError:
+            self.misses += 1
+            value = self.__read(path)
+            self._values[path] = value
+        else:
+            self.hits += 1
+        return value
+
+    def prefetch(self, *paths):
+        """
+        Reads all given properties which aren't cached yet in a single round
+        trip, so that subsequent :meth:`get` calls are served from memory.
+        Only plain values can be prefetched, host objects have to be read with
+        :meth:`get`.
+
+        :param paths: The paths of the properties to prefetch.
+        """
+        batch = RPCBatch(self._adobe)
+        requests = [
+            (path, batch.get(path)) for path in paths
+            if self.is_cached(path) and path not in self._values
+        ]
+        batch.send()
+
+        for path, request in requests:
+            # a failed read is left for get() to retry, and to report
+            if request.exception() is None:
+                self.misses += 1
+                self._values[path] = request.result()
+
+    def invalidate(self):
+        """
+        Forgets all cached values, except those of static properties.
+        """
+        self._values = dict(
+            (path, value) for path, value in self._values.items()
+            if path in self._static_properties
+        )
+
+    @property
+    def stats(self):
+        """
+        A dictionary holding the ``hits`` and ``misses`` counts, along with
+        the ``cached`` properties.
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            cached=sorted(self._values),
+        )
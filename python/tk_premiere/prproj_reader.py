@@ -0,0 +1,446 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import gzip
+import os
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
+
+from .paths import strip_long_path_prefix
+from .timebase import TICKS_PER_SECOND
+from .timeline_model import Project
+
+
+class PremiereProjectReader(object):
+    """
+    Reads the structure of a Premiere project file without Premiere.
+
+    A ``.prproj`` file is gzipped XML. Its top level elements are serialized
+    objects which reference each other through ``ObjectID``/``ObjectRef`` and
+    ``ObjectUID``/``ObjectURef`` attribute pairs. The file is parsed as a
+    stream: only the handful of fields needed from the timeline related
+    objects are kept, everything else is discarded as soon as it has been
+    read. Memory use is therefore bound by the size of the timelines and not
+    by the size of the file, which is mostly made up of workspace and view
+    settings.
+
+    The result mirrors :meth:`SessionInfo.get_info`, with two differences:
+    all sequences of the project are reported, and ``activeSequence`` is
+    always ``None``, since that's a property of a running Premiere session.
+    """
+
+    # gzip magic number, used to also allow reading uncompressed xml
+    _GZIP_MAGIC = b"\x1f\x8b"
+
+    # top level element tag -> name of the method extracting its fields
+    _EXTRACTORS = {
+        "Project": "_read_project",
+        "Sequence": "_read_sequence",
+        "VideoTrackGroup": "_read_track_group",
+        "AudioTrackGroup": "_read_track_group",
+        "VideoClipTrack": "_read_track",
+        "AudioClipTrack": "_read_track",
+        "VideoClipTrackItem": "_read_clip_track_item",
+        "AudioClipTrackItem": "_read_clip_track_item",
+        "VideoTransitionTrackItem": "_read_transition_track_item",
+        "AudioTransitionTrackItem": "_read_transition_track_item",
+        "SubClip": "_read_sub_clip",
+        "VideoClip": "_read_clip",
+        "AudioClip": "_read_clip",
+        "VideoMediaSource": "_read_media_source",
+        "AudioMediaSource": "_read_media_source",
+        "Media": "_read_media",
+    }
+
+    def __init__(self, path):
+        """
+        :param str path: The path to the ``.prproj`` file to read.
+        """
+        self._path = path
+
+        # object id -> (tag, extracted fields)
+        self._objects = dict()
+        self._project_guid = None
+        self._sequence_ids = list()
+
+    ############################################################################
+    # public interface
+
+    def get_info(self):
+        """
+        Reads the project file.
+
+        :returns: A list holding a single project dictionary, in the layout
+            returned by :meth:`SessionInfo.get_info`.
+        """
+        return [p.to_dict() for p in self.get_projects()]
+
+    def get_projects(self):
+        """
+        Reads the project file.
+
+        :returns: A list holding a single :class:`~timeline_model.Project`.
+        """
+        self._objects = dict()
+        self._project_guid = None
+        self._sequence_ids = list()
+
+        with self.__open() as fh:
+            self.__parse(fh)
+
+        raw_sequences = list()
+        for sequence_id in self._sequence_ids:
+            raw_sequence = self.__build_sequence(sequence_id)
+            if raw_sequence:
+                raw_sequences.append(raw_sequence)
+
+        # nothing but the raw sequences are needed past this point
+        self._objects = dict()
+
+        project = Project.from_raw(dict(
+            documentID=self._project_guid,
+            name=os.path.basename(self._path),
+            path=self._path,
+            sequences=raw_sequences,
+        ))
+        return [project]
+
+    ############################################################################
+    # parsing
+
+    def __open(self):
+        """
+        Opens the project file, transparently decompressing it if required.
+        """
+        with open(self._path, "rb") as fh:
+            magic = fh.read(len(self._GZIP_MAGIC))
+
+        if magic == self._GZIP_MAGIC:
+            return gzip.open(self._path, "rb")
+        return open(self._path, "rb")
+
+    def __parse(self, fh):
+        """
+        Streams through the xml, extracting the top level objects we're
+        interested in and discarding everything else.
+        """
+        depth = 0
+        root = None
+        extractor = None
+
+        for event, element in ElementTree.iterparse(fh, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    root = element
+                elif depth == 2:
+                    extractor = None
+                    if _id(element) is not None:
+                        name = self._EXTRACTORS.get(element.tag)
+                        extractor = getattr(self, name) if name else None
+                continue
+
+            depth -= 1
+            if depth == 1:
+                if extractor:
+                    object_id = _id(element)
+                    self._objects[object_id] = (element.tag, extractor(element))
+                element.clear()
+                root.clear()
+            elif depth > 1 and extractor is None:
+                # not interested in this object. drop its contents as we go
+                # so that large settings blobs are never held in full.
+                element.clear()
+
+    ############################################################################
+    # field extraction
+
+    def _read_project(self, element):
+        self._project_guid = _text(element, ".//MZ.Project.GUID")
+        return None
+
+    def _read_sequence(self, element):
+        self._sequence_ids.append(_id(element))
+        groups = list()
+        for group in element.findall("TrackGroups/TrackGroup/Second"):
+            groups.append(_ref(group))
+        return dict(
+            name=_text(element, "Name"),
+            groups=groups,
+            inPoint=_int(_first_text(element, (
+                "Node/Properties/MZ.InPoint",
+                "Node/Properties/MZ.WorkInPoint",
+            ))),
+            outPoint=_int(_first_text(element, (
+                "Node/Properties/MZ.OutPoint",
+                "Node/Properties/MZ.WorkOutPoint",
+            ))),
+            zeroPoint=_int(_first_text(element, (
+                "Node/Properties/MZ.ZeroPoint",
+                "Node/Properties/MZ.Sequence.ZeroPoint",
+            )), 0),
+        )
+
+    def _read_track_group(self, element):
+        return dict(
+            tracks=[_ref(t) for t in element.findall("TrackGroup/Tracks/Track")],
+            frameRate=_int(_text(element, "TrackGroup/FrameRate")),
+        )
+
+    def _read_track(self, element):
+        return dict(
+            id=_int(_text(element, "ClipTrack/Track/ID")),
+            name=_first_text(element, (
+                "ClipTrack/Track/Node/Properties/MZ.TrackName",
+                "ClipTrack/Track/Name",
+            )),
+            isMuted=_bool(_first_text(element, (
+                "ClipTrack/Track/IsMuted",
+                "ClipTrack/Track/Muted",
+            ))),
+            clips=[_ref(i) for i in element.findall("ClipTrack/ClipItems/TrackItems/TrackItem")],
+            transitions=[_ref(i) for i in element.findall("ClipTrack/TransitionItems/TrackItems/TrackItem")],
+        )
+
+    def _read_clip_track_item(self, element):
+        return dict(
+            start=_int(_text(element, "ClipTrackItem/TrackItem/Start"), 0),
+            end=_int(_text(element, "ClipTrackItem/TrackItem/End"), 0),
+            isSelected=_bool(_first_text(element, (
+                "ClipTrackItem/TrackItem/IsSelected",
+                "ClipTrackItem/TrackItem/Selected",
+            ))),
+            isAdjustmentLayer=_bool(_text(element, "ClipTrackItem/IsAdjustmentLayer")),
+            subClip=_ref(element.find("ClipTrackItem/SubClip")),
+        )
+
+    def _read_transition_track_item(self, element):
+        return dict(
+            name=_first_text(element, (".//DisplayName", ".//MatchName", ".//Name")),
+            start=_int(_text(element, "TransitionTrackItem/TrackItem/Start"), 0),
+            end=_int(_text(element, "TransitionTrackItem/TrackItem/End"), 0),
+            speed=_float(_text(element, "TransitionTrackItem/PlaybackSpeed"), 1.0),
+        )
+
+    def _read_sub_clip(self, element):
+        return dict(
+            name=_text(element, "Name"),
+            clip=_ref(element.find("Clip")),
+        )
+
+    def _read_clip(self, element):
+        return dict(
+            inPoint=_int(_text(element, "Clip/InPoint"), 0),
+            outPoint=_int(_text(element, "Clip/OutPoint"), 0),
+            speed=_float(_text(element, "Clip/PlaybackSpeed"), 1.0),
+            source=_ref(element.find("Clip/Source")),
+        )
+
+    def _read_media_source(self, element):
+        return dict(
+            media=_ref(element.find("MediaSource/Media")),
+        )
+
+    def _read_media(self, element):
+        # paths are saved with windows extended length prefixes, which the
+        # host hands out without.
+        return dict(
+            path=strip_long_path_prefix(
+                _first_text(element, ("ActualMediaFilePath", "FilePath"))
+            ),
+        )
+
+    ############################################################################
+    # object resolution
+
+    def __get(self, object_id, tag=None):
+        """
+        Returns the extracted fields for the given object id, or None if the
+        object is unknown or not of the expected tag.
+        """
+        entry = self._objects.get(object_id)
+        if entry is None or (tag and not entry[0].endswith(tag)):
+            return None
+        return entry[1]
+
+    def __build_sequence(self, sequence_id):
+        """
+        Resolves the references of a sequence into a raw sequence dictionary.
+        """
+        sequence = self.__get(sequence_id, "Sequence")
+        if sequence is None:
+            return None
+
+        raw = dict(
+            sequenceID=sequence_id,
+            name=sequence["name"],
+            timebase=None,
+            zeroPoint=sequence["zeroPoint"],
+            videoTracks=list(),
+            audioTracks=list(),
+        )
+
+        for group_id in sequence["groups"]:
+            entry = self._objects.get(group_id)
+            if entry is None:
+                continue
+            tag, group = entry
+            if tag == "VideoTrackGroup":
+                media_type = "Video"
+                raw["timebase"] = group["frameRate"]
+            elif tag == "AudioTrackGroup":
+                media_type = "Audio"
+            else:
+                continue
+
+            tracks = raw["%sTracks" % media_type.lower()]
+            for index, track_id in enumerate(group["tracks"]):
+                track = self.__build_track(track_id, media_type, index)
+                if track:
+                    tracks.append(track)
+
+        # sequences without video still need a timebase to express their
+        # times in. fall back to a common 25 fps.
+        if not raw["timebase"]:
+            raw["timebase"] = TICKS_PER_SECOND // 25
+
+        ends = [c["end"] for kind in ("videoTracks", "audioTracks")
+                for t in raw[kind] for c in t["clips"]]
+        raw["end"] = max(ends) if ends else 0
+        raw["inPoint"] = sequence["inPoint"] if sequence["inPoint"] is not None else 0
+        raw["outPoint"] = sequence["outPoint"] if sequence["outPoint"] is not None else raw["end"]
+        return raw
+
+    def __build_track(self, track_id, media_type, index):
+        """
+        Resolves the references of a track into a raw track dictionary.
+        """
+        track = self.__get(track_id, "ClipTrack")
+        if track is None:
+            return None
+
+        clips = list()
+        for item_id in track["clips"]:
+            clip = self.__build_clip(item_id, media_type)
+            if clip:
+                clips.append(clip)
+
+        transitions = list()
+        for item_id in track["transitions"]:
+            item = self.__get(item_id, "TransitionTrackItem")
+            if item is None:
+                continue
+            transitions.append(dict(
+                name=item["name"],
+                duration=item["end"] - item["start"],
+                start=item["start"],
+                end=item["end"],
+                mediaType=media_type,
+                speed=item["speed"],
+            ))
+
+        return dict(
+            id=track["id"] if track["id"] is not None else index,
+            name=track["name"] or "%s %d" % (media_type, index + 1),
+            mediaType=media_type,
+            isMuted=track["isMuted"],
+            clips=clips,
+            transitions=transitions,
+        )
+
+    def __build_clip(self, item_id, media_type):
+        """
+        Resolves the references of a clip track item into a raw clip
+        dictionary.
+        """
+        item = self.__get(item_id, "ClipTrackItem")
+        if item is None:
+            return None
+
+        sub_clip = self.__get(item["subClip"], "SubClip") or dict()
+        clip = self.__get(sub_clip.get("clip"), "Clip") or dict()
+        source = self.__get(clip.get("source"), "MediaSource") or dict()
+        media = self.__get(source.get("media"), "Media") or dict()
+
+        return dict(
+            name=sub_clip.get("name"),
+            duration=item["end"] - item["start"],
+            start=item["start"],
+            end=item["end"],
+            inPoint=clip.get("inPoint", 0),
+            outPoint=clip.get("outPoint", 0),
+            mediaType=media_type,
+            mediaPath=media.get("path"),
+            isSelected=item["isSelected"],
+            speed=clip.get("speed", 1.0),
+            isAdjustmentLayer=item["isAdjustmentLayer"],
+        )
+
+
+def _text(element, path):
+    """
+    Returns the stripped text of the sub element at the given path, or None.
+    """
+    child = element.find(path)
+    if child is None or child.text is None:
+        return None
+    return child.text.strip()
+
+
+def _first_text(element, paths):
+    """
+    Returns the text of the first of the given paths that exists, or None.
+    Fields moved around between Premiere versions, which is what this caters
+    for.
+    """
+    for path in paths:
+        text = _text(element, path)
+        if text is not None:
+            return text
+    return None
+
+
+def _id(element):
+    """
+    Returns the id of an object, which ``ObjectRef``/``ObjectURef`` elements
+    point to, see :func:`_ref`.
+    """
+    return element.get("ObjectID") or element.get("ObjectUID")
+
+
+def _ref(element):
+    """
+    Returns the id an ``ObjectRef``/``ObjectURef`` element points to.
+    """
+    if element is None:
+        return None
+    return element.get("ObjectRef") or element.get("ObjectURef")
+
+
+def _int(text, default=None):
+    if not text:
+        return default
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+def _float(text, default=None):
+    if not text:
+        return default
+    return float(text)
+
+
+def _bool(text):
+    return text is not None and text.lower() == "true"
@@ -0,0 +1,234 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Running RPC calls off the Qt thread.
+
+The adobe bridge isn't thread safe: every call writes a request to its
+socket and reads from it until the response arrives, and the messages sent to
+the panel go through the same socket. :func:`serialize_rpc` guards the bridge
+with a lock so that calls made from the Qt thread and from the worker thread
+of an :class:`AsyncRPCExecutor` never interleave.
+
+While waiting for its response, the bridge also handles the messages sent by
+the panel and emits their signals on the thread making the call. Slots
+connected through :func:`on_qt_thread` are run on the Qt thread regardless.
+"""
+
+import threading
+
+from .worker import BackgroundWorker, Future
+
+
+# the methods of the bridge that talk through its socket, besides the rpc_*
+# family: those reading it, and those emitting messages to the panel.
+_SOCKET_METHODS = (
+    "ping",
+    "process_new_messages",
+    "context_about_to_change",
+    "log_message",
+    "send_commands",
+    "send_context_display",
+    "send_context_thumbnail",
+    "send_log_file_path",
+)
+
+
+def wrap_bridge_methods(adobe, decorate):
+    """
+    Replaces all the socket bound methods of a bridge instance, i.e. its
+    ``rpc_*`` methods, ``ping``, ``process_new_messages`` and the methods
+    emitting messages to the panel.
+
+    :param adobe: The adobe bridge instance.
+    :param decorate: A callable taking the name of a method and the method,
+        and returning its replacement.
+    """
+    for name in dir(adobe):
+        if not (name.startswith("rpc_") or name in _SOCKET_METHODS):
+            continue
+        method = getattr(adobe, name, None)
+        if callable(method):
+            setattr(adobe, name, decorate(name, method))
+
+
+class BridgeLock(object):
+    """
+    A reentrant lock, telling whether the current thread holds it.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._local.depth = self.__depth() + 1
+        return self
+
+    def __exit__(self, *args):
+        self._local.depth -= 1
+        self._lock.release()
+
+    def __depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def held(self):
+        """
+        :returns: True if the current thread holds the lock.
+        """
+        return self.__depth() > 0
+
+
+def serialize_rpc(adobe):
+    """
+    Guards all the socket bound methods of a bridge instance with a single
+    reentrant lock. Wrapping an already guarded bridge, e.g. on an engine
+    restart, returns its existing lock.
+
+    :param adobe: The adobe bridge instance.
+    :returns: The :class:`BridgeLock` guarding the bridge.
+    """
+    lock = getattr(adobe, "_tk_premiere_rpc_lock", None)
+    if lock is not None:
+        return lock
+
+    lock = BridgeLock()
+
+    def _guarded(name, method):
+        def _call(*args, **kwargs):
+            with lock:
+                return method(*args, **kwargs)
+        _call.__name__ = name
+        _call.__doc__ = method.__doc__
+        return _call
+
+    wrap_bridge_methods(adobe, _guarded)
+    adobe._tk_premiere_rpc_lock = lock
+    return lock
+
+
+def on_qt_thread(function, dispatch, qt_thread):
+    """
+    Wraps a slot of a bridge signal so that it always runs on the Qt thread.
+    Signals emitted on another thread, e.g. by the worker thread of an
+    :class:`AsyncRPCExecutor` reading panel messages while it waits for a
+    response, are queued and handled once the Qt event loop gets to them.
+
+    :param function: The slot to wrap.
+    :param dispatch: A callable running the functions handed to it on the
+        Qt thread, see :func:`create_qt_dispatcher`. It's only called from
+        other threads.
+    :param qt_thread: The Qt thread, as a :class:`threading.Thread`.
+    :returns: The slot to connect the signal to.
+    """
+    def _slot(*args):
+        if threading.current_thread() is qt_thread:
+            return function(*args)
+        dispatch(lambda: function(*args))
+    _slot.__name__ = getattr(function, "__name__", "_slot")
+    _slot.__doc__ = function.__doc__
+    return _slot
+
+
+def create_qt_dispatcher():
+    """
+    Creates a callable running the functions handed to it on the Qt thread,
+    whichever thread it's called from.
+
+    :returns: A ``QObject`` instance. Keep a reference to it for as long as it
+        is used.
+    """
+    # imported here since the engine is responsible for defining Qt
+    from sgtk.platform.qt import QtCore
+
+    class QtDispatcher(QtCore.QObject):
+        invoke = QtCore.Signal(object)
+
+        def __init__(self):
+            super(QtDispatcher, self).__init__()
+            self.invoke.connect(self.__run, QtCore.Qt.QueuedConnection)
+
+        def __call__(self, function):
+            self.invoke.emit(function)
+
+        def __run(self, function):
+            function()
+
+    dispatcher = QtDispatcher()
+
+    # queued slots run on the thread the receiver lives on
+    application = QtCore.QCoreApplication.instance()
+    if application:
+        dispatcher.moveToThread(application.thread())
+    return dispatcher
+
+
+class AsyncRPCFuture(Future):
+    """
+    The pending result of an async rpc call.
+
+    Waiting for it on a thread holding the bridge lock, e.g. from a slot run
+    while the Qt thread reads the bridge socket, would never end: the call
+    can't start until the lock is released. This raises ``RuntimeError``
+    instead.
+    """
+
+    def __init__(self, dispatch, logger=None, lock=None):
+        """
+        :param dispatch: See :class:`~worker.Future`.
+        :param logger: See :class:`~worker.Future`.
+        :param lock: The :class:`BridgeLock` the call needs, if any.
+        """
+        super(AsyncRPCFuture, self).__init__(dispatch, logger)
+        self._bridge_lock = lock
+
+    def __check_wait(self):
+        if self.done() or self._bridge_lock is None:
+            return
+        if self._bridge_lock.held():
+            raise RuntimeError(
+                "Waiting for an async rpc call while holding the bridge lock "
+                "would deadlock. Use add_done_callback() instead."
+            )
+
+    def result(self, timeout=None):
+        self.__check_wait()
+        return super(AsyncRPCFuture, self).result(timeout)
+
+    def exception(self, timeout=None):
+        self.__check_wait()
+        return super(AsyncRPCFuture, self).exception(timeout)
+
+
+class AsyncRPCExecutor(BackgroundWorker):
+    """
+    Runs RPC calls one after the other on a single worker thread.
+
+    Calls are serialized with those made on the Qt thread by the bridge lock,
+    see :func:`serialize_rpc`, but the Qt thread is free to do other work while
+    a call is in flight. The executor is idle by the time the callbacks of a
+    call run, so that they can use the bridge from the Qt thread.
+    """
+
+    def __init__(self, dispatch, logger=None, name="PremiereRPCWorker", lock=None):
+        """
+        :param dispatch: A callable running the functions handed to it on the
+            Qt thread, see :func:`create_qt_dispatcher`.
+        :param logger: Optional logger to report failing callbacks to.
+        :param str name: The name of the worker thread.
+        :param lock: The :class:`BridgeLock` guarding the bridge, see
+            :func:`serialize_rpc`. Waiting for a call while holding it raises.
+        """
+        super(AsyncRPCExecutor, self).__init__(dispatch, logger, name=name)
+        self._lock = lock
+
+    def _create_future(self):
+        return AsyncRPCFuture(self._dispatch, self._logger, self._lock)
@@ -0,0 +1,179 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+
+from .extendscript import JSON_ENCODER
+
+
+class RPCBatchError(Exception):
+    """
+    Raised when reading the result of a batched request which failed on the
+    host, or which hasn't been sent yet.
+    """
+
+
+class RPCFuture(object):
+    """
+    The pending result of a request queued in an :class:`RPCBatch`.
+    """
+
+    __slots__ = ("expression", "_done", "_value", "_error")
+
+    def __init__(self, expression):
+        """
+        :param str expression: The ExtendScript expression evaluated for this
+            request.
+        """
+        self.expression = expression
+        self._done = False
+        self._value = None
+        self._error = None
+
+    def __repr__(self):
+        state = "done" if self._done else "pending"
+        return "<RPCFuture %s (%s)>" % (self.expression, state)
+
+    def _resolve(self, value=None, error=None):
+        self._value = value
+        self._error = error
+        self._done = True
+
+    def done(self):
+        """
+        :returns: True once the batch holding this request has been sent.
+        """
+        return self._done
+
+    def exception(self):
+        """
+        :returns: The :class:`RPCBatchError` describing why the request failed
+            on the host, or None.
+        """
+        if self._error is None:
+            return None
+        return RPCBatchError("%s failed: %s" % (self.expression, self._error))
+
+    def result(self):
+        """
+        :returns: The value the request evaluated to on the host.
+        :raises RPCBatchError: If the batch hasn't been sent yet, or the
+            request failed on the host.
+        """
+        if not self._done:
+            raise RPCBatchError(
+                "The batch holding %s hasn't been sent yet." % (self.expression,)
+            )
+        if self._error is not None:
+            raise self.exception()
+        return self._value
+
+
+class RPCBatch(object):
+    """
+    Queues property reads and method calls on the host and sends them all in
+    a single evaluation, instead of one round trip each.
+
+    Requests are ExtendScript expressions such as ``"app.project.path"``.
+    They are evaluated in the order they were queued, each one guarded on its
+    own so that a failing request doesn't prevent the others from running.
+    Results have to be plain values: host objects can't be transferred, read
+    the properties needed from them instead.
+
+    Usually obtained through ``engine.rpc_batch()``::
+
+        with engine.rpc_batch() as batch:
+            path = batch.get("app.project.path")
+            name = batch.get("app.project.name")
+        path.result(), name.result()
+    """
+
+    def __init__(self, adobe):
+        """
+        :param adobe: The adobe bridge to send the batch through.
+        """
+        self._adobe = adobe
+        self._requests = list()
+
+    def __len__(self):
+        return len(self._requests)
+
+    def __queue(self, expression, statement):
+        future = RPCFuture(expression)
+        self._requests.append((future, statement))
+        return future
+
+    def get(self, expression):
+        """
+        Queues reading a value.
+
+        :param str expression: The expression to read, e.g.
+            ``"app.project.path"``.
+        :returns: A :class:`RPCFuture` resolving to the value.
+        """
+        return self.__queue(expression, "return %s;" % (expression,))
+
+    def call(self, expression, *args):
+        """
+        Queues calling a method.
+
+        :param str expression: The method to call, e.g.
+            ``"app.project.saveAs"``.
+        :param args: The arguments to call it with. They must be JSON
+            serializable.
+        :returns: A :class:`RPCFuture` resolving to the return value.
+        """
+        arguments = ", ".join(json.dumps(arg) for arg in args)
+        return self.__queue(
+            "%s(%s)" % (expression, arguments),
+            "return %s(%s);" % (expression, arguments),
+        )
+
+    def script(self):
+        """
+        :returns: The ExtendScript evaluating all queued requests.
+        """
+        parts = [
+            "(function () {",
+            JSON_ENCODER,
+            "var results = [];",
+            "function run(f) {"
+            " try { results.push([true, f()]); }"
+            " catch (e) { results.push([false, String(e)]); } }",
+        ]
+        for _, statement in self._requests:
+            parts.append("run(function () { %s });" % (statement,))
+        parts.append("return enc(results);})();")
+        return "\n".join(parts)
+
+    def send(self):
+        """
+        Sends all queued requests and resolves their futures. Does nothing if
+        nothing is queued.
+        """
+        if not self._requests:
+            return
+
+        script = self.script()
+        requests = self._requests
+        self._requests = list()
+
+        results = self._adobe.rpc_eval(script)
+        if isinstance(results, (bytes, type(u""))):
+            results = json.loads(results)
+        results = results or list()
+
+        for i, (future, _) in enumerate(requests):
+            if i >= len(results):
+                future._resolve(error="No result was returned.")
+            elif results[i][0]:
+                future._resolve(value=results[i][1])
+            else:
+                future._resolve(error=results[i][1])
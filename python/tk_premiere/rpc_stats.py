@@ -0,0 +1,251 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import collections
+import json
+import threading
+import time
+
+from .rpc_async import wrap_bridge_methods
+
+
+_STRING_TYPES = (bytes, type(u""))
+
+# the attribute the function proxies got through rpc_get are tagged with,
+# holding the name of the method they stand for.
+_NAME_ATTRIBUTE = "_tk_premiere_rpc_name"
+
+
+def _payload_size(args, result):
+    """
+    Estimates the number of bytes sent and received by a call from the strings
+    it carries, e.g. the scripts handed to rpc_eval and the snapshots it
+    returns. Anything else is counted as empty: serializing it would cost as
+    much as the call being measured.
+    """
+    size = len(result) if isinstance(result, _STRING_TYPES) else 0
+    for arg in args:
+        if isinstance(arg, _STRING_TYPES):
+            size += len(arg)
+    return size
+
+
+def _tag_proxy(proxy, name):
+    """
+    Remembers the name a function proxy was got by, so that calling it can be
+    recorded under that name.
+
+    The proxies forward unknown attributes to the host, their dictionary is
+    written to directly.
+    """
+    try:
+        vars(proxy)[_NAME_ATTRIBUTE] = name
+    except TypeError:
+        # not a proxy, e.g. a plain value
+        pass
+
+
+def _proxy_name(proxy):
+    """
+    :returns: The name a function proxy was got by, or None if unknown.
+    """
+    try:
+        return vars(proxy).get(_NAME_ATTRIBUTE)
+    except TypeError:
+        return None
+
+
+def _percentile(ordered, fraction):
+    """
+    :returns: The nearest rank percentile of a sorted list of samples.
+    """
+    if not ordered:
+        return 0.0
+    index = int(round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class RPCStats(object):
+    """
+    Collects the latency and payload size of the calls going through the
+    adobe bridge.
+
+    Calls are grouped by bridge method, and by the host property or method
+    they target, e.g. ``rpc_get:path`` or ``rpc_call:save``. Argument values
+    never make it into the groups. Percentiles are computed over the most
+    recent :attr:`SAMPLES` calls of each group.
+    """
+
+    # the number of durations to keep per group for the percentiles
+    SAMPLES = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [count, total seconds, max seconds, total payload, samples]
+        self._groups = dict()
+        self._started = time.time()
+
+        # when the last call got a reply from the panel, i.e. the last time
+        # the connection was known to be alive. process_new_messages only
+        # reads what was received already, it doesn't prove anything.
+        self.last_success = None
+
+    @staticmethod
+    def key(name, args):
+        """
+        :returns: The group a call of the given bridge method with the given
+            arguments is recorded in.
+        """
+        if name in ("rpc_get", "rpc_set"):
+            # (proxy, property name[, value])
+            if len(args) > 1 and isinstance(args[1], _STRING_TYPES):
+                return "%s:%s" % (name, args[1])
+        elif name == "rpc_call":
+            # (function proxy, params, parent), the name comes from the proxy
+            target = _proxy_name(args[0]) if args else None
+            if target:
+                return "%s:%s" % (name, target)
+        return name
+
+    def record(self, key, seconds, payload=0):
+        """
+        Records a call.
+
+        :param str key: The group to record the call in.
+        :param float seconds: How long the call took.
+        :param int payload: The estimated number of bytes transferred.
+        """
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = [
+                    0, 0.0, 0.0, 0, collections.deque(maxlen=self.SAMPLES)
+                ]
+            group[0] += 1
+            group[1] += seconds
+            group[2] = max(group[2], seconds)
+            group[3] += payload
+            group[4].append(seconds)
+
+    def reset(self):
+        """
+        Forgets all recorded calls.
+        """
+        with self._lock:
+            self._groups = dict()
+            self._started = time.time()
+
+    def summary(self):
+        """
+        :returns: A dictionary with the ``groups``, keyed by group and holding
+            their ``count``, ``total``, ``mean``, ``p50``, ``p95``, ``p99`` and
+            ``max`` durations in milliseconds and their ``payload`` in bytes.
+            Also holds the number of ``seconds`` covered.
+        """
+        with self._lock:
+            groups = dict(
+                (key, (count, total, maximum, payload, sorted(samples)))
+                for key, (count, total, maximum, payload, samples) in self._groups.items()
+            )
+            started = self._started
+
+        summary = dict()
+        for key, (count, total, maximum, payload, ordered) in groups.items():
+            summary[key] = dict(
+                count=count,
+                total=round(total * 1000.0, 3),
+                mean=round(total * 1000.0 / count, 3),
+                p50=round(_percentile(ordered, 0.50) * 1000.0, 3),
+                p95=round(_percentile(ordered, 0.95) * 1000.0, 3),
+                p99=round(_percentile(ordered, 0.99) * 1000.0, 3),
+                max=round(maximum * 1000.0, 3),
+                payload=payload,
+            )
+        return dict(
+            seconds=round(time.time() - started, 3),
+            groups=summary,
+        )
+
+    def format(self, limit=None):
+        """
+        :param int limit: The number of groups to include. All by default.
+        :returns: A list of lines describing the groups, the ones having taken
+            the most time in total first.
+        """
+        groups = self.summary()["groups"]
+        ordered = sorted(groups.items(), key=lambda g: g[1]["total"], reverse=True)
+        lines = [
+            "%-40s %7s %10s %8s %8s %8s %10s" % (
+                "call", "count", "total ms", "p50", "p95", "p99", "bytes"),
+        ]
+        for key, group in ordered[:limit]:
+            lines.append(
+                "%-40s %7d %10.1f %8.1f %8.1f %8.1f %10d" % (
+                    key[:40], group["count"], group["total"], group["p50"],
+                    group["p95"], group["p99"], group["payload"])
+            )
+        return lines
+
+    def dump(self, path):
+        """
+        Writes the summary to a JSON file.
+
+        :param str path: The file to write.
+        """
+        with open(path, "w") as fh:
+            json.dump(self.summary(), fh, indent=2, sort_keys=True)
+
+
+def instrument_rpc(adobe):
+    """
+    Records every call going through the socket bound methods of a bridge
+    instance. Instrumenting an already instrumented bridge, e.g. on an engine
+    restart, returns its existing stats.
+
+    Has to be done before :func:`~rpc_async.serialize_rpc`, so that the time
+    spent waiting for the bridge lock isn't attributed to the calls.
+
+    :param adobe: The adobe bridge instance.
+    :returns: The :class:`RPCStats` collecting the calls.
+    """
+    stats = getattr(adobe, "_tk_premiere_rpc_stats", None)
+    if stats is not None:
+        return stats
+
+    stats = RPCStats()
+
+    def _timed(name, method):
+        round_trip = name.startswith("rpc_") or name == "ping"
+        getter = name == "rpc_get"
+
+        def _call(*args, **kwargs):
+            # failed calls, e.g. pings timing out, are recorded as well
+            result = None
+            start = time.time()
+            try:
+                result = method(*args, **kwargs)
+                if round_trip:
+                    stats.last_success = time.time()
+                if getter and callable(result) and len(args) > 1:
+                    _tag_proxy(result, args[1])
+                return result
+            finally:
+                stats.record(
+                    stats.key(name, args),
+                    time.time() - start,
+                    _payload_size(args, result),
+                )
+        _call.__name__ = name
+        _call.__doc__ = method.__doc__
+        return _call
+
+    wrap_bridge_methods(adobe, _timed)
+    adobe._tk_premiere_rpc_stats = stats
+    return stats
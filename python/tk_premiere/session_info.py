@@ -1,102 +1,874 @@
-
-class SessionInfo(object):
-
-    def __init__(self, engine):
-       self._engine = engine
-
-    def __get_transitions(self, track_items, timebase):
-        items = list()
-        for i in track_items:
-            item = dict(
-                name=i.name,
-                duration=i.duration.ticks/timebase,
-                start=i.start.ticks/timebase,
-                end=i.end.ticks/timebase,
-                mediaType=i.mediaType,
-                speed=i.getSpeed(),
-            )
-            items.append(item)
-        return items
-
-    def __get_track_items(self, track_items, timebase):
-        # import sgtk
-        # import os
-        # engine = sgtk.platform.current_engine()
-        items = list()
-
-        for i in track_items:
-            clip_name = i.name
-            
-            getMediaPath_clip = i.projectItem.getMediaPath() if hasattr(i.projectItem, 'getMediaPath') else None
-            canChangeMediaPath = i.projectItem.canChangeMediaPath() if hasattr(i.projectItem, 'canChangeMediaPath') else None
-
-            item = dict(
-                # shot_exists = shot_exists,
-                name=i.name,
-                duration=i.duration.ticks/timebase,
-                start=i.start.ticks/timebase,
-                end=i.end.ticks/timebase,
-                inPoint=i.inPoint.ticks/timebase,
-                outPoint=i.outPoint.ticks/timebase,
-                mediaType=i.mediaType,
-                # sym_link_entity=sym_link_entity,
-                source_path_clip=getMediaPath_clip,
-                # canChangeMediaPath = canChangeMediaPath,
-                # videoComponents=videoComponents,
-                isSelected = i.isSelected(),
-                speed=i.getSpeed(),
-                isAdjustmentLayer=i.isAdjustmentLayer()
-            )
-
-            items.append(item)
-
-        return items
-
-    def __get_tracks(self, sequence_tracks, timebase):
-        tracks = list()
-        for t in sequence_tracks:
-            track = dict(
-                id=t.id,
-                name=t.name,
-                mediaType=t.mediaType,
-                clips=self.__get_track_items(t.clips, timebase),
-                transitions=self.__get_transitions(t.transitions, timebase),
-                isMuted=t.isMuted()
-            )
-            tracks.append(track)
-        return tracks
-
-    def __get_sequences(self, project_sequences):
-        sequences = list()
-        prj = self._engine.adobe.app.project
-        active_seq = prj.activeSequence
-        for s in project_sequences:
-            # get info just for active sequence
-            if s.name == active_seq.name: 
-                timebase = s.timebase
-                sequence = dict(
-                    sequenceID=s.sequenceID,
-                    name=s.name,
-                    inPoint=s.getInPointAsTime().ticks/timebase,
-                    outPoint=s.getOutPointAsTime().ticks/timebase,
-                    timebase=s.timebase,
-                    zeroPoint=s.zeroPoint/timebase,
-                    end=s.end/timebase,
-                    videoTracks=self.__get_tracks(s.videoTracks, timebase),
-                    audioTracks=self.__get_tracks(s.audioTracks, timebase)
-                )
-                sequences.append(sequence)
-        return sequences
-
-    def get_info(self):
-        session_info = list()
-        for p in self._engine.adobe.app.projects:
-                project = dict(
-                    documentID=p.documentID,
-                    name=p.name,
-                    path=p.path,
-                    sequences=self.__get_sequences(p.sequences),
-                    activeSequence=p.activeSequence
-                )
-                session_info.append(project)
-        return session_info
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import copy
+import json
+
+from .extendscript import JSON_ENCODER
+from .paths import strip_long_path_prefix
+from .snapshot_cache import SnapshotCache
+from .timebase import Timebase, as_number
+from .timeline_model import Project, Sequence, Track
+
+
+def _apply_selection(raw_project, selection):
+    """
+    Sets the selection of the clips of a raw project.
+
+    :param dict raw_project: A raw project, as built by
+        :attr:`SessionInfo._SNAPSHOT_SCRIPT`.
+    :param list selection: The selected clips of the project, as reported by
+        :attr:`SessionInfo._SUMMARY_SCRIPT`.
+    """
+    selected = set(tuple(item) for item in selection)
+    for sequence in raw_project["sequences"]:
+        for kind in ("videoTracks", "audioTracks"):
+            for track in sequence[kind]:
+                for clip in track["clips"]:
+                    clip["isSelected"] = (
+                        clip["mediaType"], clip["name"], clip["start"], clip["end"]
+                    ) in selected
+
+
+def _without_selection(raw_project):
+    """
+    :returns: A copy of a raw project without the selection of its clips,
+        which changes without the project being edited.
+    """
+    raw_project = copy.deepcopy(raw_project)
+    for sequence in raw_project["sequences"]:
+        for kind in ("videoTracks", "audioTracks"):
+            for track in sequence[kind]:
+                for clip in track["clips"]:
+                    clip.pop("isSelected", None)
+    return raw_project
+
+
+class SessionInfo(object):
+    """
+    Collects the structure of the projects open in Premiere: their sequences,
+    and for the active sequence its tracks, clips and transitions.
+    """
+
+    # ExtendScript functions shared by the host side scripts below. They walk
+    # the same objects as the proxy based code path, but do so inside Premiere
+    # and hand back the result as a single JSON string. Time values are
+    # returned as raw tick counts so that the python side can apply the exact
+    # same conversion as the live code path.
+    _SNAPSHOT_LIBRARY = JSON_ENCODER + r"""
+    function ticks(value) {
+        return Number(value);
+    }
+
+    function hasMethod(obj, name) {
+        return obj !== null && obj !== undefined && typeof obj[name] === "function";
+    }
+
+    // media paths by project item node id. many clips usually share a
+    // project item, e.g. a plate cut up many times.
+    var mediaPaths = {};
+
+    function mediaPath(item) {
+        var projectItem = item.projectItem;
+        if (!hasMethod(projectItem, "getMediaPath")) {
+            return null;
+        }
+        // items without a node id can't be told apart, don't memoize them
+        if (projectItem.nodeId === undefined || projectItem.nodeId === null) {
+            return projectItem.getMediaPath();
+        }
+        var key = "#" + projectItem.nodeId;
+        if (!mediaPaths.hasOwnProperty(key)) {
+            mediaPaths[key] = projectItem.getMediaPath();
+        }
+        return mediaPaths[key];
+    }
+
+    function transitions(items) {
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            var item = items[i];
+            result.push({
+                name: item.name,
+                duration: ticks(item.duration.ticks),
+                start: ticks(item.start.ticks),
+                end: ticks(item.end.ticks),
+                mediaType: item.mediaType,
+                speed: item.getSpeed()
+            });
+        }
+        return result;
+    }
+
+    function clips(items) {
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            var item = items[i];
+            result.push({
+                name: item.name,
+                duration: ticks(item.duration.ticks),
+                start: ticks(item.start.ticks),
+                end: ticks(item.end.ticks),
+                inPoint: ticks(item.inPoint.ticks),
+                outPoint: ticks(item.outPoint.ticks),
+                mediaType: item.mediaType,
+                mediaPath: mediaPath(item),
+                isSelected: item.isSelected(),
+                speed: item.getSpeed(),
+                isAdjustmentLayer: item.isAdjustmentLayer()
+            });
+        }
+        return result;
+    }
+
+    function trackHeader(track) {
+        return {
+            id: track.id,
+            name: track.name,
+            mediaType: track.mediaType,
+            isMuted: track.isMuted()
+        };
+    }
+
+    function tracks(items) {
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            var track = trackHeader(items[i]);
+            track.clips = clips(items[i].clips);
+            track.transitions = transitions(items[i].transitions);
+            result.push(track);
+        }
+        return result;
+    }
+
+    function hashValues(hash, values) {
+        for (var i = 0; i < values.length; i++) {
+            var s = String(values[i]);
+            for (var j = 0; j < s.length; j++) {
+                hash = ((hash << 5) - hash + s.charCodeAt(j)) | 0;
+            }
+            // separate the values so that "ab", "c" and "a", "bc" differ
+            hash = ((hash << 5) - hash + 31) | 0;
+        }
+        return hash;
+    }
+
+    // a cheap summary of everything the python side reports for a track. the
+    // hash covers every clip and transition field, the remaining values make
+    // the common edits (adding, removing, trimming) trivially visible. the
+    // selection of the clips is left out of the hash unless withSelection is
+    // set.
+    function fingerprint(track, withSelection) {
+        var items = track.clips;
+        var hash = 5381;
+        var first = null;
+        var last = null;
+        for (var i = 0; i < items.length; i++) {
+            var item = items[i];
+            var start = item.start.ticks;
+            var end = item.end.ticks;
+            if (i === 0) {
+                first = ticks(start);
+            }
+            last = ticks(end);
+            hash = hashValues(hash, [
+                item.name, start, end, item.inPoint.ticks, item.outPoint.ticks,
+                item.mediaType, mediaPath(item),
+                withSelection ? item.isSelected() : null,
+                item.getSpeed(), item.isAdjustmentLayer()
+            ]);
+        }
+        var trans = track.transitions;
+        for (var t = 0; t < trans.length; t++) {
+            hash = hashValues(hash, [
+                trans[t].name, trans[t].start.ticks, trans[t].end.ticks,
+                trans[t].mediaType, trans[t].getSpeed()
+            ]);
+        }
+        return [items.length, first, last, trans.length, hash];
+    }
+
+    function fingerprints(items) {
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            var track = trackHeader(items[i]);
+            track.fingerprint = fingerprint(items[i], true);
+            result.push(track);
+        }
+        return result;
+    }
+
+    function sequenceInfo(seq, trackFunction) {
+        return {
+            sequenceID: seq.sequenceID,
+            name: seq.name,
+            inPoint: ticks(seq.getInPointAsTime().ticks),
+            outPoint: ticks(seq.getOutPointAsTime().ticks),
+            timebase: ticks(seq.timebase),
+            zeroPoint: ticks(seq.zeroPoint),
+            end: ticks(seq.end),
+            videoTracks: trackFunction(seq.videoTracks),
+            audioTracks: trackFunction(seq.audioTracks)
+        };
+    }
+
+    // as in the live code path, only the sequences matching the active
+    // sequence of the current project are reported.
+    function activeSequences(project) {
+        var active = app.project.activeSequence;
+        var result = [];
+        for (var j = 0; j < project.sequences.length; j++) {
+            var seq = project.sequences[j];
+            if (active && seq.name === active.name) {
+                result.push(seq);
+            }
+        }
+        return result;
+    }
+
+    function projects(trackFunction) {
+        var result = [];
+        for (var i = 0; i < app.projects.length; i++) {
+            var project = app.projects[i];
+            var items = activeSequences(project);
+            var sequences = [];
+            for (var j = 0; j < items.length; j++) {
+                sequences.push(sequenceInfo(items[j], trackFunction));
+            }
+            result.push({
+                documentID: project.documentID,
+                name: project.name,
+                path: project.path,
+                sequences: sequences
+            });
+        }
+        return result;
+    }
+
+    // a summary of the reported sequences of a project: the sequence fields,
+    // and for each track its header and the fingerprint of its clips and
+    // transitions, selection aside. premiere doesn't tell whether a project
+    // has unsaved changes, any edit has to show up here. handed out as a
+    // string, to be compared as is.
+    function summary(project) {
+        var items = activeSequences(project);
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            var seq = items[i];
+            var tracks = [];
+            var kinds = [seq.videoTracks, seq.audioTracks];
+            for (var k = 0; k < kinds.length; k++) {
+                for (var t = 0; t < kinds[k].length; t++) {
+                    var track = kinds[k][t];
+                    tracks.push([
+                        track.id, track.name, track.mediaType, track.isMuted(),
+                        fingerprint(track, false)
+                    ]);
+                }
+            }
+            result.push([
+                seq.sequenceID, seq.name, ticks(seq.getInPointAsTime().ticks),
+                ticks(seq.getOutPointAsTime().ticks), ticks(seq.timebase),
+                ticks(seq.zeroPoint), ticks(seq.end), tracks
+            ]);
+        }
+        return enc([project.name, project.path, result]);
+    }
+
+    // the clips selected in the reported sequences of a project, as
+    // [mediaType, name, start, end] tuples, or null if this version of
+    // Premiere can't tell.
+    function selection(project) {
+        var items = activeSequences(project);
+        var result = [];
+        for (var i = 0; i < items.length; i++) {
+            if (!hasMethod(items[i], "getSelection")) {
+                return null;
+            }
+            var selected = items[i].getSelection();
+            for (var j = 0; j < selected.length; j++) {
+                var item = selected[j];
+                result.push([
+                    item.mediaType, item.name, ticks(item.start.ticks),
+                    ticks(item.end.ticks)
+                ]);
+            }
+        }
+        return result;
+    }
+
+    // the summary and selection of all open projects.
+    function summaries() {
+        var result = [];
+        for (var i = 0; i < app.projects.length; i++) {
+            var project = app.projects[i];
+            result.push({
+                documentID: project.documentID,
+                path: project.path,
+                summary: summary(project),
+                selection: selection(project)
+            });
+        }
+        return result;
+    }
+
+    // the full structure of all open projects, along with their summary.
+    function summarizedProjects() {
+        var result = projects(tracks);
+        for (var i = 0; i < result.length; i++) {
+            result[i].summary = summary(app.projects[i]);
+        }
+        return result;
+    }
+
+    // the paths of all open projects.
+    function status() {
+        var result = [];
+        for (var i = 0; i < app.projects.length; i++) {
+            var project = app.projects[i];
+            result.push({
+                documentID: project.documentID,
+                path: project.path
+            });
+        }
+        return {
+            projects: result
+        };
+    }
+
+    // all sequences of all open projects, or only those whose sequenceID is
+    // listed in ids if that's given.
+    function sequences(ids, trackFunction) {
+        var wanted = null;
+        if (ids !== null) {
+            wanted = {};
+            for (var i = 0; i < ids.length; i++) {
+                wanted["#" + ids[i]] = true;
+            }
+        }
+        var result = [];
+        for (var p = 0; p < app.projects.length; p++) {
+            var items = app.projects[p].sequences;
+            for (var j = 0; j < items.length; j++) {
+                var seq = items[j];
+                if (wanted === null || wanted.hasOwnProperty("#" + seq.sequenceID)) {
+                    result.push(sequenceInfo(seq, trackFunction));
+                }
+            }
+        }
+        return result;
+    }
+
+    function findById(items, key, value) {
+        for (var i = 0; i < items.length; i++) {
+            if (items[i][key] === value) {
+                return items[i];
+            }
+        }
+        return null;
+    }
+
+    // the requests are a list of {documentID, sequenceID, videoTracks,
+    // audioTracks} objects, the latter two holding lists of track ids.
+    function fetchTracks(requests) {
+        var result = [];
+        for (var i = 0; i < requests.length; i++) {
+            var request = requests[i];
+            var project = findById(app.projects, "documentID", request.documentID);
+            var seq = project ? findById(project.sequences, "sequenceID", request.sequenceID) : null;
+            var fetched = {
+                documentID: request.documentID,
+                sequenceID: request.sequenceID,
+                videoTracks: [],
+                audioTracks: []
+            };
+            if (seq) {
+                var kinds = ["videoTracks", "audioTracks"];
+                for (var k = 0; k < kinds.length; k++) {
+                    var ids = request[kinds[k]];
+                    for (var j = 0; j < ids.length; j++) {
+                        var track = findById(seq[kinds[k]], "id", ids[j]);
+                        if (track) {
+                            fetched[kinds[k]].push(tracks([track])[0]);
+                        }
+                    }
+                }
+            }
+            result.push(fetched);
+        }
+        return result;
+    }
+"""
+
+    # Returns the full structure of all open projects.
+    _SNAPSHOT_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(projects(tracks));})();"
+    )
+
+    # Returns the structure of all open projects with a fingerprint in place
+    # of the clips and transitions of each track.
+    _FINGERPRINT_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(projects(fingerprints));})();"
+    )
+
+    # Returns a summary of the structure of all open projects, hashing the
+    # clips rather than serializing them, and their selection.
+    _SUMMARY_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(summaries());})();"
+    )
+
+    # Returns the full structure of all open projects, along with the summary
+    # of each.
+    _SUMMARIZED_SNAPSHOT_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(summarizedProjects());})();"
+    )
+
+    # Returns the path of all open projects.
+    _STATUS_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(status());})();"
+    )
+
+    # Returns the full structure of the requested sequences of all open
+    # projects. The list of sequence ids, or null for all of them, is
+    # substituted in as a JSON literal.
+    _SEQUENCES_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(sequences(%s, tracks));})();"
+    )
+
+    # Returns the full contents of the requested tracks. The requests are
+    # substituted in as a JSON literal.
+    _FETCH_TRACKS_SCRIPT = (
+        "(function () {" + _SNAPSHOT_LIBRARY +
+        "return enc(fetchTracks(%s));})();"
+    )
+
+    def __init__(self, engine, cache_root=None):
+        """
+        :param engine: The engine to talk to Premiere through.
+        :param str cache_root: Optional directory to persist snapshots of
+            saved projects in. See :meth:`get_info`.
+        """
+        self._engine = engine
+
+        self.__snapshot_cache = None
+        if cache_root:
+            self.__snapshot_cache = SnapshotCache(cache_root)
+
+        # tracks from the last incremental harvest, keyed by (documentID,
+        # sequenceID, track kind, track id). each value is a (fingerprint,
+        # track) tuple.
+        self.__track_cache = dict()
+
+        # media path and capabilities of the project items seen during the
+        # current live harvest, keyed by node id. each value is a
+        # (media path, can change media path) tuple.
+        self.__project_items = dict()
+
+    def __get_transitions(self, track_items, timebase):
+        items = list()
+        for i in track_items:
+            item = dict(
+                name=i.name,
+                duration=as_number(timebase.to_frames(i.duration.ticks)),
+                start=as_number(timebase.to_frames(i.start.ticks)),
+                end=as_number(timebase.to_frames(i.end.ticks)),
+                mediaType=i.mediaType,
+                speed=i.getSpeed(),
+            )
+            items.append(item)
+        return items
+
+    def __get_project_item_info(self, project_item):
+        """
+        Returns the media path and capabilities of a project item, fetching
+        them from the host only the first time the item is seen.
+
+        :param project_item: The project item proxy of a clip, or None for
+            clips without one, e.g. some generated clips.
+        :returns: A (media path, can change media path) tuple.
+        """
+        if project_item is None:
+            return (None, None)
+
+        # items without a node id can't be told apart, don't memoize them
+        node_id = getattr(project_item, "nodeId", None)
+        info = self.__project_items.get(node_id) if node_id is not None else None
+        if info is None:
+            info = (
+                project_item.getMediaPath() if hasattr(project_item, 'getMediaPath') else None,
+                project_item.canChangeMediaPath() if hasattr(project_item, 'canChangeMediaPath') else None,
+            )
+            if node_id is not None:
+                self.__project_items[node_id] = info
+        return info
+
+    def __get_track_items(self, track_items, timebase):
+        # import sgtk
+        # import os
+        # engine = sgtk.platform.current_engine()
+        items = list()
+
+        for i in track_items:
+            getMediaPath_clip, canChangeMediaPath = self.__get_project_item_info(i.projectItem)
+
+            item = dict(
+                # shot_exists = shot_exists,
+                name=i.name,
+                duration=as_number(timebase.to_frames(i.duration.ticks)),
+                start=as_number(timebase.to_frames(i.start.ticks)),
+                end=as_number(timebase.to_frames(i.end.ticks)),
+                inPoint=as_number(timebase.to_frames(i.inPoint.ticks)),
+                outPoint=as_number(timebase.to_frames(i.outPoint.ticks)),
+                mediaType=i.mediaType,
+                # sym_link_entity=sym_link_entity,
+                source_path_clip=getMediaPath_clip,
+                # canChangeMediaPath = canChangeMediaPath,
+                # videoComponents=videoComponents,
+                isSelected = i.isSelected(),
+                speed=i.getSpeed(),
+                isAdjustmentLayer=i.isAdjustmentLayer()
+            )
+
+            items.append(item)
+
+        return items
+
+    def __get_tracks(self, sequence_tracks, timebase):
+        tracks = list()
+        for t in sequence_tracks:
+            track = dict(
+                id=t.id,
+                name=t.name,
+                mediaType=t.mediaType,
+                clips=self.__get_track_items(t.clips, timebase),
+                transitions=self.__get_transitions(t.transitions, timebase),
+                isMuted=t.isMuted()
+            )
+            tracks.append(track)
+        return tracks
+
+    def __get_sequences(self, project_sequences):
+        sequences = list()
+        prj = self._engine.adobe.app.project
+        active_seq = prj.activeSequence
+        if active_seq is None:
+            # e.g. a new project, or no sequence open
+            return sequences
+        # fetched once rather than for every sequence. use get_sequences()
+        # to extract sequences other than the active one.
+        active_name = active_seq.name
+        for s in project_sequences:
+            # get info just for active sequence
+            if s.name == active_name:
+                timebase = Timebase(s.timebase)
+                sequence = dict(
+                    sequenceID=s.sequenceID,
+                    name=s.name,
+                    inPoint=as_number(timebase.to_frames(s.getInPointAsTime().ticks)),
+                    outPoint=as_number(timebase.to_frames(s.getOutPointAsTime().ticks)),
+                    timebase=timebase.ticks_per_frame,
+                    zeroPoint=as_number(timebase.to_frames(s.zeroPoint)),
+                    end=as_number(timebase.to_frames(s.end)),
+                    videoTracks=self.__get_tracks(s.videoTracks, timebase),
+                    audioTracks=self.__get_tracks(s.audioTracks, timebase)
+                )
+                sequences.append(sequence)
+        return sequences
+
+    ############################################################################
+    # snapshot
+
+    def __eval_json(self, script):
+        """
+        Evaluates one of the snapshot scripts on the host and decodes its
+        result.
+
+        :param str script: The ExtendScript to evaluate.
+        :returns: The decoded result.
+        """
+        result = self._engine.adobe.rpc_eval(script)
+        if isinstance(result, (bytes, type(u""))):
+            result = json.loads(result)
+        return result or list()
+
+    def __build_projects(self, raw_projects):
+        """
+        Converts raw host snapshot projects into timeline model projects.
+
+        :param list raw_projects: Raw project dictionaries, as built by
+            :attr:`_SNAPSHOT_SCRIPT`.
+        :returns: A list of :class:`~timeline_model.Project` instances.
+        """
+        projects = list()
+
+        # the active sequence is handed out as a proxy object, which can't be
+        # serialized on the host. these are cheap to fetch as there are only
+        # ever a handful of open projects.
+        for raw, p in zip(raw_projects, self._engine.adobe.app.projects):
+            projects.append(Project.from_raw(raw, p.activeSequence))
+        return projects
+
+    def __get_snapshot_projects(self):
+        """
+        Builds the projects from a single host side evaluation instead of one
+        round trip per proxied property.
+        """
+        return self.__build_projects(
+            self.__eval_json(self._SNAPSHOT_SCRIPT)
+        )
+
+    def __get_cached_projects(self):
+        """
+        Serves the projects from the on disk snapshot cache, as long as the
+        summary of their structure still matches the one stored with the
+        snapshots. Otherwise falls back to a regular snapshot, which is then
+        cached.
+
+        Premiere doesn't tell whether a project has unsaved changes, hence the
+        summaries, which fingerprint every clip and transition field. The
+        selection isn't persisted, the summary script reports the live one.
+        """
+        summaries = self.__eval_json(self._SUMMARY_SCRIPT)
+
+        raw_projects = list()
+        for project in summaries:
+            raw = None
+            if project["path"] and project["selection"] is not None:
+                raw = self.__snapshot_cache.get(project["path"], project["summary"])
+            if raw is None:
+                break
+            # document ids are only valid for the session they came from
+            raw["documentID"] = project["documentID"]
+            _apply_selection(raw, project["selection"])
+            raw_projects.append(raw)
+        else:
+            self._engine.logger.debug(
+                "Session info served from the snapshot cache (%d hits, %d misses)." % (
+                    self.__snapshot_cache.hits, self.__snapshot_cache.misses)
+            )
+            return self.__build_projects(raw_projects)
+
+        raw_projects = self.__eval_json(self._SUMMARIZED_SNAPSHOT_SCRIPT)
+        for raw in raw_projects:
+            summary = raw.pop("summary")
+            if not raw["path"]:
+                continue
+            try:
+                self.__snapshot_cache.put(raw["path"], _without_selection(raw), summary)
+            except Exception as e:
+                self._engine.logger.debug(
+                    "Unable to cache the session info of %s: %s" % (raw["path"], e)
+                )
+        return self.__build_projects(raw_projects)
+
+    def __get_incremental_projects(self):
+        """
+        Builds the projects from fingerprints of all tracks, fetching the
+        contents of only those tracks that changed since the last call.
+        """
+        raw_projects = self.__eval_json(self._FINGERPRINT_SCRIPT)
+
+        # first pass: figure out which tracks are unknown or have changed
+        requests = list()
+        for project in raw_projects:
+            for sequence in project["sequences"]:
+                request = dict(
+                    documentID=project["documentID"],
+                    sequenceID=sequence["sequenceID"],
+                    videoTracks=list(),
+                    audioTracks=list(),
+                )
+                for kind in ("videoTracks", "audioTracks"):
+                    for track in sequence[kind]:
+                        key = (project["documentID"], sequence["sequenceID"], kind, track["id"])
+                        cached = self.__track_cache.get(key)
+                        if cached is None or cached[0] != track["fingerprint"]:
+                            request[kind].append(track["id"])
+                if request["videoTracks"] or request["audioTracks"]:
+                    requests.append(request)
+
+        # second pass: fetch all changed tracks in one go
+        fetched = dict()
+        if requests:
+            script = self._FETCH_TRACKS_SCRIPT % (json.dumps(requests),)
+            for result in self.__eval_json(script):
+                for kind in ("videoTracks", "audioTracks"):
+                    for track in result[kind]:
+                        key = (result["documentID"], result["sequenceID"], kind, track["id"])
+                        fetched[key] = track
+
+        # last pass: stitch the cached and fetched track contents back into
+        # the structure. anything not seen this time around is dropped from
+        # the cache.
+        track_cache = dict()
+        for project in raw_projects:
+            for sequence in project["sequences"]:
+                for kind in ("videoTracks", "audioTracks"):
+                    tracks = list()
+                    for raw in sequence[kind]:
+                        key = (project["documentID"], sequence["sequenceID"], kind, raw["id"])
+                        if key in fetched:
+                            contents = Track.from_raw(fetched[key])
+                        elif key in self.__track_cache:
+                            contents = self.__track_cache[key][1]
+                        else:
+                            # the track vanished between the two calls. it'll
+                            # be picked up again on the next harvest.
+                            continue
+                        # the track header is always fresh, only the clips
+                        # and transitions are reused.
+                        track = Track(
+                            raw["id"],
+                            raw["name"],
+                            raw["mediaType"],
+                            bool(raw["isMuted"]),
+                            contents.clips,
+                            contents.transitions,
+                        )
+                        tracks.append(track)
+                        track_cache[key] = (raw["fingerprint"], track)
+                    sequence[kind] = tracks
+
+        self._engine.logger.debug(
+            "Incremental session info: %d tracks fetched, %d reused." % (
+                len(fetched), len(track_cache) - len(fetched))
+        )
+        self.__track_cache = track_cache
+        return self.__build_projects(raw_projects)
+
+    ############################################################################
+    # public interface
+
+    def reset(self):
+        """
+        Forgets everything remembered from previous harvests. To be called
+        when the active document changes.
+        """
+        self.__track_cache = dict()
+        self.__project_items = dict()
+
+    def get_projects(self, incremental=False, cached=False):
+        """
+        Returns the structure of all open projects as compact timeline model
+        objects. The structure is always harvested through host side
+        snapshots.
+
+        :param bool incremental: See :meth:`get_info`.
+        :param bool cached: See :meth:`get_info`.
+        :returns: A list of :class:`~timeline_model.Project` instances.
+        """
+        if cached and self.__snapshot_cache is not None:
+            return self.__get_cached_projects()
+        if incremental:
+            return self.__get_incremental_projects()
+        return self.__get_snapshot_projects()
+
+    def get_project_paths(self):
+        """
+        Returns the paths of all open projects, with a single host side
+        evaluation.
+
+        :returns: A list of paths, the active project's included. Windows
+            extended length prefixes are stripped, as for
+            :attr:`~engine.PremiereEngine.project_path`.
+        """
+        status = self.__eval_json(self._STATUS_SCRIPT)
+        return [
+            strip_long_path_prefix(p["path"])
+            for p in status["projects"] if p["path"]
+        ]
+
+    def get_sequence_models(self, sequence_ids=None):
+        """
+        Returns the full structure of the given sequences, looked up in all
+        open projects with a single host side evaluation.
+
+        :param sequence_ids: A list of sequence ids to extract. Defaults to
+            every sequence of every open project. Unknown ids are ignored.
+        :returns: A dictionary of :class:`~timeline_model.Sequence`
+            instances, keyed by sequence id.
+        """
+        if sequence_ids is not None:
+            sequence_ids = list(sequence_ids)
+            if not sequence_ids:
+                return dict()
+
+        script = self._SEQUENCES_SCRIPT % (json.dumps(sequence_ids),)
+
+        # sequences of the same project share a lot of strings, e.g. media
+        # paths of reels cut into several sequences.
+        pool = dict()
+        return dict(
+            (raw["sequenceID"], Sequence.from_raw(raw, pool))
+            for raw in self.__eval_json(script)
+        )
+
+    def get_sequences(self, sequence_ids=None):
+        """
+        Returns the full structure of the given sequences, see
+        :meth:`get_sequence_models`.
+
+        :param sequence_ids: A list of sequence ids to extract. Defaults to
+            every sequence of every open project.
+        :returns: A dictionary of sequence dictionaries, in the layout used by
+            :meth:`get_info`, keyed by sequence id.
+        """
+        return dict(
+            (sequence_id, sequence.to_dict())
+            for sequence_id, sequence in self.get_sequence_models(sequence_ids).items()
+        )
+
+    def get_info(self, snapshot=False, incremental=False, cached=False):
+        """
+        Returns the structure of all open projects.
+
+        :param bool snapshot: If True, the whole structure is serialized on the
+            host and transferred in one RPC call. This is considerably faster
+            for sequences with many clips. The returned layout is identical.
+        :param bool incremental: If True, the host only reports a fingerprint
+            per track and the contents of those tracks that changed since the
+            previous incremental call are fetched. Unchanged tracks are reused
+            from the last result. Implies ``snapshot``.
+        :param bool cached: If True and a cache directory was given, projects
+            are served from snapshots persisted on disk, keyed by the project
+            path, the modification time and size of the project file, and a
+            summary of the project structure made of the fingerprint of every
+            track. Projects with unsaved edits miss and are harvested live.
+            The selection is always the live one.
+            Takes precedence over ``incremental`` and implies ``snapshot``.
+        :returns: A list of project dictionaries.
+        """
+        if snapshot or incremental or cached:
+            return [
+                p.to_dict()
+                for p in self.get_projects(incremental=incremental, cached=cached)
+            ]
+
+        # project items are only remembered for the duration of one harvest,
+        # media may be relinked in between.
+        self.__project_items = dict()
+
+        session_info = list()
+        for p in self._engine.adobe.app.projects:
+                project = dict(
+                    documentID=p.documentID,
+                    name=p.name,
+                    path=p.path,
+                    sequences=self.__get_sequences(p.sequences),
+                    activeSequence=p.activeSequence
+                )
+                session_info.append(project)
+        return session_info
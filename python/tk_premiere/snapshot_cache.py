@@ -0,0 +1,158 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+
+class SnapshotCache(object):
+    """
+    Persists raw session info snapshots of saved projects on disk.
+
+    Every project is stored in its own gzipped JSON file, named after a hash
+    of the project path. An entry remembers the modification time and size the
+    project file had when the snapshot was taken, plus an arbitrary ``tag``
+    such as the name of the active sequence, and is only handed out again as
+    long as all of those still match. Saving the project therefore implicitly
+    invalidates its entry.
+    """
+
+    # bump whenever the layout of the stored snapshots changes
+    VERSION = 1
+
+    def __init__(self, root):
+        """
+        :param str root: The directory to store the snapshots in. It is
+            created when the first snapshot is stored.
+        """
+        self._root = root
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def stamp(path):
+        """
+        :param str path: The path to a project file.
+        :returns: A (modification time, size) tuple identifying the saved
+            state of the file, or None if it doesn't exist.
+        """
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+    def __entry_path(self, path):
+        """
+        :returns: The path of the cache file for the given project path.
+        """
+        if isinstance(path, type(u"")):
+            path = path.encode("utf-8")
+        return os.path.join(
+            self._root, "%s.json.gz" % (hashlib.sha1(path).hexdigest(),)
+        )
+
+    def __key(self, path, tag):
+        """
+        :returns: The key identifying the current saved state of the project,
+            or None if the project file doesn't exist.
+        """
+        stamp = self.stamp(path)
+        if stamp is None:
+            return None
+        # compared against a key that went through json, i.e. holding text
+        if isinstance(path, bytes):
+            path = path.decode("utf-8", "replace")
+        return [self.VERSION, path, stamp[0], stamp[1], tag]
+
+    def get(self, path, tag=None):
+        """
+        :param str path: The path to the project file.
+        :param tag: The tag the snapshot must have been stored with.
+        :returns: The stored raw project, or None if there is no snapshot
+            matching the current state of the file.
+        """
+        key = self.__key(path, tag)
+        entry_path = self.__entry_path(path)
+        if key is None or not os.path.exists(entry_path):
+            self.misses += 1
+            return None
+
+        try:
+            with gzip.open(entry_path, "rb") as fh:
+                entry = json.loads(fh.read().decode("utf-8"))
+        except Exception:
+            # a corrupt or partially written entry is simply a miss. it'll be
+            # replaced on the next put.
+            self.misses += 1
+            return None
+
+        if entry.get("key") != key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["project"]
+
+    def put(self, path, project, tag=None):
+        """
+        Stores the snapshot of a project.
+
+        :param str path: The path to the project file.
+        :param dict project: The raw project to store. It must be JSON
+            serializable.
+        :param tag: An optional, JSON serializable tag to store the snapshot
+            with.
+        :returns: True if the snapshot was stored, False if the project file
+            doesn't exist.
+        """
+        key = self.__key(path, tag)
+        if key is None:
+            return False
+
+        if not os.path.isdir(self._root):
+            try:
+                os.makedirs(self._root)
+            except OSError:
+                # created concurrently by another engine instance
+                if not os.path.isdir(self._root):
+                    raise
+
+        data = json.dumps(dict(key=key, project=project)).encode("utf-8")
+
+        # write to a temporary file first so that readers never see a
+        # partially written entry.
+        entry_path = self.__entry_path(path)
+        fd, temp_path = tempfile.mkstemp(dir=self._root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw_fh:
+                with gzip.GzipFile(fileobj=raw_fh, mode="wb", compresslevel=6) as fh:
+                    fh.write(data)
+            if os.path.exists(entry_path):
+                # rename doesn't replace existing files on windows
+                os.remove(entry_path)
+            os.rename(temp_path, entry_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return True
+
+    def remove(self, path):
+        """
+        Removes the snapshot of a project, if there is one.
+
+        :param str path: The path to the project file.
+        """
+        entry_path = self.__entry_path(path)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
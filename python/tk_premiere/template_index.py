@@ -0,0 +1,107 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import re
+
+from .paths import strip_long_path_prefix
+
+
+# the separators of template definitions and paths, whatever the platform
+_SEPARATORS = re.compile(r"[/\\]+")
+
+
+def _split(path):
+    """
+    :returns: The normalized, non empty components of a path.
+    """
+    path = os.path.normcase(strip_long_path_prefix(path))
+    return [c for c in _SEPARATORS.split(path) if c]
+
+
+class TemplatePrefixIndex(object):
+    """
+    A trie of the storage roots of a pipeline configuration, and of the static
+    leading components of its path templates.
+
+    Paths which aren't under any root can't yield a context, which the index
+    tells without going through the templates. For the other ones, it lists
+    the templates whose static leading components match.
+    """
+
+    def __init__(self, roots, templates):
+        """
+        :param dict roots: The storage root names and their path on the current
+            platform.
+        :param dict templates: The template names and templates. Only the ones
+            having a ``root_path`` and a ``definition``, i.e. path templates,
+            are indexed.
+        """
+        # component -> child node. nodes hold the roots and templates ending
+        # there under None.
+        self._trie = dict()
+        self.root_count = 0
+        self.template_count = 0
+
+        for name, path in roots.items():
+            if not path:
+                continue
+            self.__node(_split(path)).setdefault(None, [set(), list()])[0].add(name)
+            self.root_count += 1
+
+        for name, template in templates.items():
+            root_path = getattr(template, "root_path", None)
+            definition = getattr(template, "definition", None)
+            if not root_path or definition is None:
+                continue
+
+            # the components before the first key or optional section
+            static = list()
+            for component in _split(definition):
+                if "{" in component or "[" in component:
+                    break
+                static.append(component)
+
+            node = self.__node(_split(root_path) + static)
+            node.setdefault(None, [set(), list()])[1].append(name)
+            self.template_count += 1
+
+    def __node(self, components):
+        node = self._trie
+        for component in components:
+            node = node.setdefault(component, dict())
+        return node
+
+    def lookup(self, path):
+        """
+        :param str path: The path to look up.
+        :returns: A tuple with the names of the roots the path is under, and
+            the names of the templates whose static components it starts with.
+        """
+        roots = set()
+        templates = list()
+
+        node = self._trie
+        for component in _split(path or ""):
+            node = node.get(component)
+            if node is None:
+                break
+            entry = node.get(None)
+            if entry:
+                roots.update(entry[0])
+                templates.extend(entry[1])
+        return (roots, templates)
+
+    def contains(self, path):
+        """
+        :param str path: The path to check.
+        :returns: True if the path is under one of the roots.
+        """
+        return bool(self.lookup(path)[0])
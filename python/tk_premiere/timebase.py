@@ -0,0 +1,173 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Exact conversions of Premiere ticks into frames, seconds and timecode.
+
+Premiere expresses all times as integer ticks, and a sequence's timebase as
+the integer number of ticks per frame. All conversions here are done in
+integer and rational arithmetic, so they never accumulate rounding errors no
+matter how long the sequence is.
+"""
+
+from fractions import Fraction
+
+
+# the ticks Premiere uses to express one second
+TICKS_PER_SECOND = 254016000000
+
+
+def as_number(value):
+    """
+    Turns an exact rational value into a plain number: an int if it is whole,
+    otherwise the closest float. Used where the result is handed to code
+    expecting plain numbers, e.g. the session info dictionaries.
+    """
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return int(value.numerator)
+        return float(value)
+    return value
+
+
+class Timebase(object):
+    """
+    The timebase of a sequence, i.e. its integer number of ticks per frame.
+
+    The conversion methods all take an iterable of tick values, typically a
+    whole column of a track such as ``track.clips.start``, and return a list.
+    """
+
+    __slots__ = ("ticks_per_frame",)
+
+    def __init__(self, ticks_per_frame):
+        """
+        :param ticks_per_frame: The sequence's timebase. Strings, as handed
+            out by Premiere, are accepted.
+        """
+        self.ticks_per_frame = int(ticks_per_frame)
+
+    def __repr__(self):
+        return "<Timebase %d ticks/frame (%s fps)>" % (
+            self.ticks_per_frame, self.frame_rate)
+
+    def __eq__(self, other):
+        return isinstance(other, Timebase) and other.ticks_per_frame == self.ticks_per_frame
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.ticks_per_frame)
+
+    @property
+    def frame_rate(self):
+        """
+        The exact frame rate, e.g. ``Fraction(30000, 1001)`` for 29.97 fps.
+        """
+        return Fraction(TICKS_PER_SECOND, self.ticks_per_frame)
+
+    @property
+    def is_drop_frame_rate(self):
+        """
+        True for the NTSC rates (29.97, 59.94) that drop frame timecode is
+        defined for.
+        """
+        rate = self.frame_rate
+        return rate.denominator == 1001 and rate.numerator in (30000, 60000)
+
+    def to_frames(self, ticks):
+        """
+        :returns: The exact number of frames for the given ticks. An int on
+            frame boundaries, a :class:`~fractions.Fraction` otherwise.
+        """
+        ticks = int(ticks)
+        frames, remainder = divmod(ticks, self.ticks_per_frame)
+        if remainder:
+            return Fraction(ticks, self.ticks_per_frame)
+        return frames
+
+    def frames(self, ticks):
+        """
+        :returns: The exact frame counts for all the given ticks.
+        """
+        tpf = self.ticks_per_frame
+        result = list()
+        for value in ticks:
+            value = int(value)
+            frames, remainder = divmod(value, tpf)
+            result.append(Fraction(value, tpf) if remainder else frames)
+        return result
+
+    def whole_frames(self, ticks):
+        """
+        :returns: The frames the given ticks fall into, i.e. the frame counts
+            rounded down.
+        """
+        tpf = self.ticks_per_frame
+        return [int(value) // tpf for value in ticks]
+
+    def seconds(self, ticks):
+        """
+        :returns: The exact number of seconds for all the given ticks, as
+            :class:`~fractions.Fraction` instances.
+        """
+        return [Fraction(int(value), TICKS_PER_SECOND) for value in ticks]
+
+    def timecodes(self, ticks, offset=0, drop_frame=None):
+        """
+        Converts the given ticks into SMPTE timecode strings.
+
+        :param ticks: Iterable of tick values.
+        :param offset: Ticks to add to every value, typically the sequence's
+            zero point.
+        :param drop_frame: Whether to produce drop frame timecode. Defaults to
+            True for 29.97 and 59.94 fps, False otherwise.
+        :returns: A list of ``HH:MM:SS:FF`` strings, ``HH:MM:SS;FF`` for drop
+            frame timecode.
+        """
+        if drop_frame is None:
+            drop_frame = self.is_drop_frame_rate
+
+        tpf = self.ticks_per_frame
+        offset = int(offset)
+
+        # timecode counts frames at the nominal (rounded) frame rate
+        rate = self.frame_rate
+        nominal = int((rate.numerator + rate.denominator // 2) // rate.denominator)
+
+        result = list()
+        for value in ticks:
+            frame = (int(value) + offset) // tpf
+            if drop_frame:
+                frame = self.__drop_frame_number(frame, nominal)
+            frame, ff = divmod(frame, nominal)
+            frame, ss = divmod(frame, 60)
+            hh, mm = divmod(frame, 60)
+            result.append("%02d:%02d:%02d%s%02d" % (
+                hh % 24, mm, ss, ";" if drop_frame else ":", ff))
+        return result
+
+    def __drop_frame_number(self, frame, nominal):
+        """
+        Maps an actual frame count to the frame number displayed by drop
+        frame timecode, which skips the first two (four at 59.94) frame
+        numbers of every minute except every tenth minute.
+        """
+        dropped = 2 * (nominal // 30)
+        per_ten_minutes = nominal * 600 - dropped * 9
+        per_minute = nominal * 60 - dropped
+
+        tens, remainder = divmod(frame, per_ten_minutes)
+        if remainder > dropped:
+            frame += dropped * 9 * tens + dropped * ((remainder - dropped) // per_minute)
+        else:
+            frame += dropped * 9 * tens
+        return frame
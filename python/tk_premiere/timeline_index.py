@@ -0,0 +1,274 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Time based lookups over the clips of a sequence.
+
+Intervals are half open: a clip covers ``start <= t < end``, so two clips
+butting up against each other neither overlap nor leave a gap.
+"""
+
+import heapq
+
+
+class IntervalIndex(object):
+    """
+    A static interval tree over a set of ``(start, end, payload)`` intervals.
+
+    The intervals are sorted by start and the tree is laid out implicitly
+    over the sorted arrays: the node of the range ``[lo, hi)`` is its middle
+    element, and holds the largest end found anywhere in that range. Point and
+    range queries therefore run in O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        """
+        :param intervals: Iterable of ``(start, end, payload)`` tuples.
+        """
+        intervals = sorted(intervals, key=lambda i: (i[0], i[1]))
+        self._starts = [i[0] for i in intervals]
+        self._ends = [i[1] for i in intervals]
+        self._payloads = [i[2] for i in intervals]
+        self._max_ends = list(self._ends)
+        self.__build(0, len(intervals))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __build(self, lo, hi):
+        """
+        Fills in the largest end of every node of the range [lo, hi).
+        """
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        max_end = self._ends[mid]
+        for child in (self.__build(lo, mid), self.__build(mid + 1, hi)):
+            if child is not None and child > max_end:
+                max_end = child
+        self._max_ends[mid] = max_end
+        return max_end
+
+    def __search(self, lo, hi, start, end, closed, result):
+        """
+        Collects, in start order, the indices of the range [lo, hi) whose
+        interval ends after ``start`` and starts before ``end``, or at ``end``
+        if ``closed`` is set.
+        """
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_ends[mid] <= start:
+            # nothing in this subtree reaches the query
+            return
+        self.__search(lo, mid, start, end, closed, result)
+        mid_start = self._starts[mid]
+        if mid_start > end or (mid_start == end and not closed):
+            # everything from here on starts after the query
+            return
+        if self._ends[mid] > start:
+            result.append(mid)
+        self.__search(mid + 1, hi, start, end, closed, result)
+
+    def at(self, point):
+        """
+        :returns: The payloads of all intervals containing the point.
+        """
+        result = list()
+        self.__search(0, len(self), point, point, True, result)
+        return [self._payloads[i] for i in result]
+
+    def overlapping(self, start, end):
+        """
+        :returns: The payloads of all intervals sharing any time with
+            ``[start, end)``.
+        """
+        result = list()
+        self.__search(0, len(self), start, end, False, result)
+        return [self._payloads[i] for i in result]
+
+    def within(self, start, end):
+        """
+        :returns: The payloads of all intervals lying completely inside
+            ``[start, end)``.
+        """
+        result = list()
+        self.__search(0, len(self), start, end, False, result)
+        return [
+            self._payloads[i] for i in result
+            if self._starts[i] >= start and self._ends[i] <= end
+        ]
+
+    def gaps(self, start=None, end=None):
+        """
+        Finds the stretches of time not covered by any interval.
+
+        :param start: Where to start looking. Defaults to the first interval's
+            start, in which case no leading gap is reported.
+        :param end: Where to stop looking. Defaults to the last interval's
+            end, in which case no trailing gap is reported.
+        :returns: A list of ``(start, end)`` tuples.
+        """
+        if not len(self):
+            if start is not None and end is not None and start < end:
+                return [(start, end)]
+            return list()
+
+        if start is None:
+            start = self._starts[0]
+        if end is None:
+            end = max(self._ends)
+
+        gaps = list()
+        covered = start
+        for i in range(len(self)):
+            if self._starts[i] >= end:
+                break
+            if self._starts[i] > covered:
+                gaps.append((covered, self._starts[i]))
+            if self._ends[i] > covered:
+                covered = self._ends[i]
+        if covered < end:
+            gaps.append((covered, end))
+        return gaps
+
+    def overlaps(self):
+        """
+        Finds every pair of intervals sharing some time.
+
+        :returns: A list of ``(payload, payload)`` tuples, the first of each
+            pair starting no later than the second.
+        """
+        pairs = list()
+        active = list()
+        for i in range(len(self)):
+            while active and active[0][0] <= self._starts[i]:
+                heapq.heappop(active)
+            for _, j in sorted(active, key=lambda a: a[1]):
+                pairs.append((self._payloads[j], self._payloads[i]))
+            heapq.heappush(active, (self._ends[i], i))
+        return pairs
+
+
+class TimelineIndex(object):
+    """
+    Indexes the clips of a sequence per track for time based queries.
+
+    Built from a sequence as returned by :meth:`SessionInfo.get_info`, or
+    from a :class:`~timeline_model.Sequence`. All times are expressed in the
+    units of the sequence dictionary, which are frames.
+
+    Queries can be restricted to a ``kind`` of track, ``"video"`` or
+    ``"audio"``, and to a single ``track_id``. Queries spanning several
+    tracks return ``(track, clip)`` tuples, where both are the dictionaries
+    found in the sequence.
+    """
+
+    _KINDS = {
+        "video": "videoTracks",
+        "audio": "audioTracks",
+    }
+
+    def __init__(self, sequence):
+        """
+        :param sequence: A sequence dictionary or timeline model sequence.
+        """
+        if hasattr(sequence, "to_dict"):
+            sequence = sequence.to_dict()
+
+        self._sequence = sequence
+
+        # kind -> list of (track, IntervalIndex) tuples
+        self._tracks = dict()
+        for kind, key in self._KINDS.items():
+            self._tracks[kind] = [
+                (track, IntervalIndex(
+                    (c["start"], c["end"], (track, c)) for c in track["clips"]
+                ))
+                for track in sequence[key]
+            ]
+
+    def __indices(self, kind=None, track_id=None):
+        """
+        Yields the (track, index) tuples matching the given filters.
+        """
+        kinds = [kind] if kind else sorted(self._KINDS)
+        for k in kinds:
+            if k not in self._tracks:
+                raise ValueError(
+                    "Unknown track kind %r, expected one of %s." % (
+                        k, ", ".join(sorted(self._KINDS)))
+                )
+            for track, index in self._tracks[k]:
+                if track_id is None or track["id"] == track_id:
+                    yield track, index
+
+    def track_index(self, kind, track_id):
+        """
+        :returns: The :class:`IntervalIndex` of a single track, or None. Its
+            payloads are ``(track, clip)`` tuples.
+        """
+        for _, index in self.__indices(kind, track_id):
+            return index
+        return None
+
+    def at(self, point, kind=None, track_id=None):
+        """
+        :returns: The clips under the given point in time, e.g. the playhead.
+        """
+        result = list()
+        for _, index in self.__indices(kind, track_id):
+            result.extend(index.at(point))
+        return result
+
+    def overlapping(self, start, end, kind=None, track_id=None):
+        """
+        :returns: The clips sharing any time with ``[start, end)``.
+        """
+        result = list()
+        for _, index in self.__indices(kind, track_id):
+            result.extend(index.overlapping(start, end))
+        return result
+
+    def within(self, start, end, kind=None, track_id=None):
+        """
+        :returns: The clips lying completely inside ``[start, end)``.
+        """
+        result = list()
+        for _, index in self.__indices(kind, track_id):
+            result.extend(index.within(start, end))
+        return result
+
+    def gaps(self, kind=None, track_id=None, start=None, end=None):
+        """
+        Finds the gaps between clips on each matching track.
+
+        :param start: Where to start looking, see :meth:`IntervalIndex.gaps`.
+        :param end: Where to stop looking, see :meth:`IntervalIndex.gaps`.
+        :returns: A list of ``(track, [(start, end), ...])`` tuples, for the
+            tracks having at least one gap.
+        """
+        result = list()
+        for track, index in self.__indices(kind, track_id):
+            gaps = index.gaps(start, end)
+            if gaps:
+                result.append((track, gaps))
+        return result
+
+    def overlaps(self, kind=None, track_id=None):
+        """
+        Finds the clips overlapping each other on the same track.
+
+        :returns: A list of ``((track, clip), (track, clip))`` tuples.
+        """
+        result = list()
+        for _, index in self.__indices(kind, track_id):
+            result.extend(index.overlaps())
+        return result
@@ -0,0 +1,377 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+A compact in-memory representation of Premiere timelines.
+
+Projects, sequences and tracks are ``__slots__`` classes. The clips and
+transitions of a track are stored column-wise: one typed ``array`` per time
+field holding raw tick counts, instead of one dictionary per clip. Repeated
+strings (media types, media paths shared by many cuts of the same plate) are
+stored once.
+
+Every class can be built from the raw dictionaries produced by the host side
+snapshot scripts and the offline project reader, and converted back into the
+dictionary layout returned by :meth:`SessionInfo.get_info` with ``to_dict``.
+
+Time values stay in integer ticks. Whole columns can be converted exactly with
+the sequence's :class:`~timebase.Timebase`, e.g.::
+
+    sequence.timing.timecodes(track.clips.start, offset=sequence.zero_point)
+"""
+
+from array import array
+
+from .timebase import Timebase, as_number
+
+
+def _get_ticks_typecode():
+    """
+    Returns the array typecode to store ticks with.
+
+    Ticks need 64 bits: an hour is close to 10^15 ticks. ``q`` isn't available
+    on older pythons and ``l`` is only 32 bits wide on Windows. Doubles are the
+    last resort and are exact up to roughly 9 hours.
+    """
+    try:
+        array("q")
+        return "q"
+    except ValueError:
+        pass
+    if array("l").itemsize >= 8:
+        return "l"
+    return "d"
+
+
+TICKS_TYPECODE = _get_ticks_typecode()
+
+
+def _intern(pool, value):
+    """
+    Returns the instance of value held by the pool, adding it if needed.
+    """
+    if pool is None or value is None:
+        return value
+    return pool.setdefault(value, value)
+
+
+class ClipColumns(object):
+    """
+    The clips of a track, stored column-wise.
+    """
+
+    __slots__ = (
+        "names",
+        "media_types",
+        "media_paths",
+        "start",
+        "end",
+        "in_point",
+        "out_point",
+        "speed",
+        "selected",
+        "adjustment_layer",
+    )
+
+    def __init__(self):
+        self.names = list()
+        self.media_types = list()
+        self.media_paths = list()
+        self.start = array(TICKS_TYPECODE)
+        self.end = array(TICKS_TYPECODE)
+        self.in_point = array(TICKS_TYPECODE)
+        self.out_point = array(TICKS_TYPECODE)
+        self.speed = array("d")
+        self.selected = array("b")
+        self.adjustment_layer = array("b")
+
+    def __len__(self):
+        return len(self.start)
+
+    def append(self, raw, pool=None):
+        """
+        Appends a raw clip dictionary.
+
+        :param dict raw: A raw clip, with its time values in ticks.
+        :param dict pool: Optional string pool shared between tracks.
+        """
+        self.names.append(raw["name"])
+        self.media_types.append(_intern(pool, raw["mediaType"]))
+        self.media_paths.append(_intern(pool, raw["mediaPath"]))
+        self.start.append(int(raw["start"]))
+        self.end.append(int(raw["end"]))
+        self.in_point.append(int(raw["inPoint"]))
+        self.out_point.append(int(raw["outPoint"]))
+        self.speed.append(raw["speed"])
+        self.selected.append(bool(raw["isSelected"]))
+        self.adjustment_layer.append(bool(raw["isAdjustmentLayer"]))
+
+    def to_dicts(self, timebase):
+        """
+        :param timebase: The :class:`~timebase.Timebase` of the owning
+            sequence.
+        :returns: A list of clip dictionaries, in the session info layout.
+        """
+        starts = timebase.frames(self.start)
+        ends = timebase.frames(self.end)
+        in_points = timebase.frames(self.in_point)
+        out_points = timebase.frames(self.out_point)
+
+        items = list()
+        for i in range(len(self)):
+            items.append(dict(
+                name=self.names[i],
+                duration=as_number(ends[i] - starts[i]),
+                start=as_number(starts[i]),
+                end=as_number(ends[i]),
+                inPoint=as_number(in_points[i]),
+                outPoint=as_number(out_points[i]),
+                mediaType=self.media_types[i],
+                source_path_clip=self.media_paths[i],
+                isSelected=bool(self.selected[i]),
+                speed=self.speed[i],
+                isAdjustmentLayer=bool(self.adjustment_layer[i]),
+            ))
+        return items
+
+
+class TransitionColumns(object):
+    """
+    The transitions of a track, stored column-wise.
+    """
+
+    __slots__ = ("names", "media_types", "start", "end", "speed")
+
+    def __init__(self):
+        self.names = list()
+        self.media_types = list()
+        self.start = array(TICKS_TYPECODE)
+        self.end = array(TICKS_TYPECODE)
+        self.speed = array("d")
+
+    def __len__(self):
+        return len(self.start)
+
+    def append(self, raw, pool=None):
+        """
+        Appends a raw transition dictionary.
+
+        :param dict raw: A raw transition, with its time values in ticks.
+        :param dict pool: Optional string pool shared between tracks.
+        """
+        self.names.append(_intern(pool, raw["name"]))
+        self.media_types.append(_intern(pool, raw["mediaType"]))
+        self.start.append(int(raw["start"]))
+        self.end.append(int(raw["end"]))
+        self.speed.append(raw["speed"])
+
+    def to_dicts(self, timebase):
+        """
+        :param timebase: The :class:`~timebase.Timebase` of the owning
+            sequence.
+        :returns: A list of transition dictionaries, in the session info
+            layout.
+        """
+        starts = timebase.frames(self.start)
+        ends = timebase.frames(self.end)
+
+        items = list()
+        for i in range(len(self)):
+            items.append(dict(
+                name=self.names[i],
+                duration=as_number(ends[i] - starts[i]),
+                start=as_number(starts[i]),
+                end=as_number(ends[i]),
+                mediaType=self.media_types[i],
+                speed=self.speed[i],
+            ))
+        return items
+
+
+class Track(object):
+    """
+    A video or audio track of a sequence.
+    """
+
+    __slots__ = ("id", "name", "media_type", "is_muted", "clips", "transitions")
+
+    def __init__(self, id, name, media_type, is_muted, clips=None, transitions=None):
+        self.id = id
+        self.name = name
+        self.media_type = media_type
+        self.is_muted = is_muted
+        self.clips = clips if clips is not None else ClipColumns()
+        self.transitions = transitions if transitions is not None else TransitionColumns()
+
+    @classmethod
+    def from_raw(cls, raw, pool=None):
+        """
+        :param dict raw: A raw track dictionary, with its clips and
+            transitions.
+        :param dict pool: Optional string pool shared between tracks.
+        :returns: A new :class:`Track`.
+        """
+        track = cls(
+            raw["id"],
+            raw["name"],
+            _intern(pool, raw["mediaType"]),
+            bool(raw["isMuted"]),
+        )
+        for clip in raw["clips"]:
+            track.clips.append(clip, pool)
+        for transition in raw["transitions"]:
+            track.transitions.append(transition, pool)
+        return track
+
+    def to_dict(self, timebase):
+        """
+        :param timebase: The :class:`~timebase.Timebase` of the owning
+            sequence, or its ticks per frame.
+        :returns: The track as a dictionary, in the session info layout.
+        """
+        if not isinstance(timebase, Timebase):
+            timebase = Timebase(timebase)
+        return dict(
+            id=self.id,
+            name=self.name,
+            mediaType=self.media_type,
+            clips=self.clips.to_dicts(timebase),
+            transitions=self.transitions.to_dicts(timebase),
+            isMuted=self.is_muted,
+        )
+
+
+class Sequence(object):
+    """
+    A sequence and its tracks. All time values are held in ticks.
+    """
+
+    __slots__ = (
+        "sequence_id",
+        "name",
+        "timebase",
+        "in_point",
+        "out_point",
+        "zero_point",
+        "end",
+        "video_tracks",
+        "audio_tracks",
+    )
+
+    def __init__(self, sequence_id, name, timebase, in_point, out_point,
+                 zero_point, end, video_tracks=None, audio_tracks=None):
+        self.sequence_id = sequence_id
+        self.name = name
+        self.timebase = timebase
+        self.in_point = in_point
+        self.out_point = out_point
+        self.zero_point = zero_point
+        self.end = end
+        self.video_tracks = video_tracks or list()
+        self.audio_tracks = audio_tracks or list()
+
+    @classmethod
+    def from_raw(cls, raw, pool=None):
+        """
+        :param dict raw: A raw sequence dictionary. Its track lists may hold
+            raw track dictionaries or :class:`Track` instances.
+        :param dict pool: Optional string pool shared between sequences.
+        :returns: A new :class:`Sequence`.
+        """
+        if pool is None:
+            pool = dict()
+
+        def _tracks(items):
+            return [
+                t if isinstance(t, Track) else Track.from_raw(t, pool)
+                for t in items
+            ]
+
+        return cls(
+            raw["sequenceID"],
+            raw["name"],
+            int(raw["timebase"]),
+            int(raw["inPoint"]),
+            int(raw["outPoint"]),
+            int(raw["zeroPoint"]),
+            int(raw["end"]),
+            _tracks(raw["videoTracks"]),
+            _tracks(raw["audioTracks"]),
+        )
+
+    @property
+    def timing(self):
+        """
+        The :class:`~timebase.Timebase` of this sequence, to convert its tick
+        values with.
+        """
+        return Timebase(self.timebase)
+
+    def to_dict(self):
+        """
+        :returns: The sequence as a dictionary, in the session info layout.
+            Frame values are exact: ints on frame boundaries, the nearest
+            float otherwise.
+        """
+        timebase = self.timing
+        return dict(
+            sequenceID=self.sequence_id,
+            name=self.name,
+            inPoint=as_number(timebase.to_frames(self.in_point)),
+            outPoint=as_number(timebase.to_frames(self.out_point)),
+            timebase=timebase.ticks_per_frame,
+            zeroPoint=as_number(timebase.to_frames(self.zero_point)),
+            end=as_number(timebase.to_frames(self.end)),
+            videoTracks=[t.to_dict(timebase) for t in self.video_tracks],
+            audioTracks=[t.to_dict(timebase) for t in self.audio_tracks],
+        )
+
+
+class Project(object):
+    """
+    A project and the sequences harvested from it.
+    """
+
+    __slots__ = ("document_id", "name", "path", "sequences", "active_sequence")
+
+    def __init__(self, document_id, name, path, sequences=None, active_sequence=None):
+        self.document_id = document_id
+        self.name = name
+        self.path = path
+        self.sequences = sequences or list()
+        self.active_sequence = active_sequence
+
+    @classmethod
+    def from_raw(cls, raw, active_sequence=None):
+        """
+        :param dict raw: A raw project dictionary.
+        :param active_sequence: The active sequence proxy object, if any.
+        :returns: A new :class:`Project`.
+        """
+        pool = dict()
+        return cls(
+            raw["documentID"],
+            raw["name"],
+            raw["path"],
+            [Sequence.from_raw(s, pool) for s in raw["sequences"]],
+            active_sequence,
+        )
+
+    def to_dict(self):
+        """
+        :returns: The project as a dictionary, in the session info layout.
+        """
+        return dict(
+            documentID=self.document_id,
+            name=self.name,
+            path=self.path,
+            sequences=[s.to_dict() for s in self.sequences],
+            activeSequence=self.active_sequence,
+        )
@@ -0,0 +1,185 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Running slow calls off the Qt thread.
+"""
+
+import threading
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+
+class Future(object):
+    """
+    The pending result of a call submitted to a :class:`BackgroundWorker`.
+    """
+
+    def __init__(self, dispatch, logger=None):
+        self._dispatch = dispatch
+        self._logger = logger
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._value = None
+        self._exception = None
+        self._callbacks = list()
+
+    def done(self):
+        """
+        :returns: True once the call has completed.
+        """
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        Waits for the call to complete. Prefer :meth:`add_done_callback` on the
+        Qt thread, waiting there blocks the UI.
+
+        :param float timeout: Seconds to wait for. Waits forever by default.
+        :returns: The value returned by the call.
+        :raises: The exception raised by the call, or ``RuntimeError`` if it
+            didn't complete in time.
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("The call didn't complete in time.")
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call to complete, see :meth:`result`.
+
+        :returns: The exception raised by the call, or None.
+        """
+        if not self._event.wait(timeout):
+            raise RuntimeError("The call didn't complete in time.")
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """
+        Registers a function to call with this future once the call has
+        completed. Callbacks are always run on the Qt thread.
+
+        :param callback: A callable taking the future as its only argument.
+        """
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        self._dispatch(lambda: self.__run_callback(callback))
+
+    def _set_result(self, value=None, exception=None):
+        with self._lock:
+            self._value = value
+            self._exception = exception
+            self._event.set()
+            callbacks = self._callbacks
+            self._callbacks = list()
+        for callback in callbacks:
+            self._dispatch(lambda c=callback: self.__run_callback(c))
+
+    def __run_callback(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            if self._logger:
+                self._logger.exception("Error in callback %r." % (callback,))
+
+
+class BackgroundWorker(object):
+    """
+    Runs calls one after the other on a single worker thread, started on
+    demand, and hands their results to callbacks on the Qt thread.
+    """
+
+    def __init__(self, dispatch, logger=None, name="PremiereWorker"):
+        """
+        :param dispatch: A callable running the functions handed to it on the
+            Qt thread, see :func:`~tk_premiere.rpc_async.create_qt_dispatcher`.
+        :param logger: Optional logger to report failing callbacks to.
+        :param str name: The name of the worker thread.
+        """
+        self._dispatch = dispatch
+        self._logger = logger
+        self._name = name
+        self._queue = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._busy = False
+
+    @property
+    def busy(self):
+        """
+        True while a call is running on the worker thread.
+        """
+        return self._busy
+
+    def __work(self, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            future, function, args, kwargs = job
+            self._busy = True
+            try:
+                value = function(*args, **kwargs)
+            except Exception as e:
+                self._busy = False
+                future._set_result(exception=e)
+            else:
+                # idle by the time the callbacks run
+                self._busy = False
+                future._set_result(value=value)
+
+    def _create_future(self):
+        """
+        :returns: The :class:`Future` of a call being submitted.
+        """
+        return Future(self._dispatch, self._logger)
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Queues a call.
+
+        :param function: The callable to run on the worker thread.
+        :returns: A :class:`Future`.
+        """
+        with self._thread_lock:
+            if self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self.__work, args=(self._queue,),
+                    name=self._name)
+                self._thread.daemon = True
+                self._thread.start()
+
+            future = self._create_future()
+            self._queue.put((future, function, args, kwargs))
+        return future
+
+    def shutdown(self, wait=False):
+        """
+        Stops the worker thread once the queued calls are done.
+
+        :param bool wait: Whether to block until the worker thread has exited.
+        """
+        with self._thread_lock:
+            thread = self._thread
+            self._thread = None
+            if thread is None:
+                return
+            # the worker only ever reads from the queue it was started with
+            self._queue.put(None)
+        if wait:
+            thread.join()
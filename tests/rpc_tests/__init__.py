@@ -28,7 +28,7 @@ def get_tests_by_app_id(app_id, adobe):
     suite = unittest.TestSuite()
     test_cases = [TestAdobeRPC]
 
-    if app_id in ["AEFT"]:
+    if app_id in ["PPRO"]:
         test_cases = [TestPremiereRPC]
 
     for case in test_cases:
@@ -27,3 +27,41 @@ class TestPremiereRPC(TestAdobeRPC):
 
     def setUp(self):
         pass
+
+    def _layout(self, value):
+        """
+        Returns the structure of a session info value: the keys of the
+        dictionaries and the types of everything else.
+        """
+        if isinstance(value, dict):
+            return dict((k, self._layout(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return [self._layout(v) for v in value]
+        if isinstance(value, (int, long, float)) and not isinstance(value, bool):
+            return "number"
+        if isinstance(value, basestring):
+            return "string"
+        return type(value).__name__
+
+    def _without_active_sequence(self, projects):
+        # the active sequence is a proxy object, which doesn't compare equal
+        # across calls.
+        return [
+            dict((k, v) for k, v in p.items() if k != "activeSequence")
+            for p in projects
+        ]
+
+    def test_snapshot_matches_live(self):
+        session_info = sgtk.platform.current_engine().session_info
+        live = self._without_active_sequence(session_info.get_info())
+
+        # the second cached call is served from the snapshot cache
+        for kwargs in (
+            dict(snapshot=True),
+            dict(incremental=True),
+            dict(cached=True),
+            dict(cached=True),
+        ):
+            snapshot = self._without_active_sequence(session_info.get_info(**kwargs))
+            self.assertEqual(self._layout(live), self._layout(snapshot), kwargs)
+            self.assertEqual(live, snapshot, kwargs)
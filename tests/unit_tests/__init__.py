@@ -0,0 +1,25 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Tests of the parts of the engine which don't need Premiere nor toolkit. Run
+them with ``python -m unittest discover -s tests/unit_tests -t tests`` or
+pytest from the root of the engine.
+"""
+
+import os
+import sys
+
+# tk_premiere is importable on its own outside of the engine
+_PYTHON_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "python")
+)
+if _PYTHON_ROOT not in sys.path:
+    sys.path.insert(0, _PYTHON_ROOT)
@@ -0,0 +1,447 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+A stand in for the adobe bridge, exposing a Premiere session made of plain
+python objects.
+
+Properties and methods are read straight from the objects, as through the
+proxies of the bridge. The ExtendScript evaluated by :class:`SessionInfo` is
+recognized and answered by python ports of its functions, working on the same
+objects.
+"""
+
+import json
+import logging
+
+from tk_premiere.session_info import SessionInfo
+from tk_premiere.timebase import TICKS_PER_SECOND
+
+
+# 25 fps
+TICKS_PER_FRAME = TICKS_PER_SECOND // 25
+
+
+class Time(object):
+    """
+    A Premiere time object. Ticks are handed out as strings, as Premiere does.
+    """
+
+    def __init__(self, frames):
+        self.ticks = str(int(frames * TICKS_PER_FRAME))
+
+
+class ProjectItem(object):
+
+    def __init__(self, node_id, media_path):
+        self.nodeId = node_id
+        self.media_path = media_path
+
+    def getMediaPath(self):
+        return self.media_path
+
+    def canChangeMediaPath(self):
+        return True
+
+
+class Clip(object):
+
+    def __init__(self, name, start, end, in_point=0, project_item=None,
+                 media_type="Video", selected=False, speed=1.0):
+        self.name = name
+        self.start = Time(start)
+        self.end = Time(end)
+        self.duration = Time(end - start)
+        self.inPoint = Time(in_point)
+        self.outPoint = Time(in_point + end - start)
+        self.mediaType = media_type
+        self.projectItem = project_item
+        self.selected = selected
+        self.speed = speed
+
+    def isSelected(self):
+        return self.selected
+
+    def getSpeed(self):
+        return self.speed
+
+    def isAdjustmentLayer(self):
+        return False
+
+
+class Transition(object):
+
+    def __init__(self, name, start, end, media_type="Video"):
+        self.name = name
+        self.start = Time(start)
+        self.end = Time(end)
+        self.duration = Time(end - start)
+        self.mediaType = media_type
+
+    def getSpeed(self):
+        return 1.0
+
+
+class Track(object):
+
+    def __init__(self, track_id, name, media_type, clips=None, transitions=None):
+        self.id = track_id
+        self.name = name
+        self.mediaType = media_type
+        self.clips = clips or list()
+        self.transitions = transitions or list()
+        self.muted = False
+
+    def isMuted(self):
+        return self.muted
+
+
+class Sequence(object):
+
+    def __init__(self, sequence_id, name, video_tracks=None, audio_tracks=None):
+        self.sequenceID = sequence_id
+        self.name = name
+        self.videoTracks = video_tracks or list()
+        self.audioTracks = audio_tracks or list()
+        self.timebase = str(TICKS_PER_FRAME)
+        self.zeroPoint = "0"
+        self.in_point = 0
+        self.out_point = 100
+
+    @property
+    def end(self):
+        ends = [
+            int(c.end.ticks) for t in self.videoTracks + self.audioTracks
+            for c in t.clips
+        ]
+        return str(max(ends) if ends else 0)
+
+    def getInPointAsTime(self):
+        return Time(self.in_point)
+
+    def getOutPointAsTime(self):
+        return Time(self.out_point)
+
+    def getSelection(self):
+        return [
+            c for t in self.videoTracks + self.audioTracks
+            for c in t.clips if c.selected
+        ]
+
+
+class Project(object):
+
+    def __init__(self, document_id, name, path, sequences=None):
+        self.documentID = document_id
+        self.name = name
+        self.path = path
+        self.sequences = sequences or list()
+        self.activeSequence = self.sequences[0] if self.sequences else None
+
+
+class App(object):
+
+    def __init__(self, projects):
+        self.projects = projects
+        self.project = projects[0]
+
+
+class HostScripts(object):
+    """
+    Python ports of the ExtendScript functions of
+    :attr:`SessionInfo._SNAPSHOT_LIBRARY`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def media_path(self, item):
+        if item.projectItem is None:
+            return None
+        return item.projectItem.getMediaPath()
+
+    def transitions(self, items):
+        return [
+            dict(
+                name=i.name,
+                duration=int(i.duration.ticks),
+                start=int(i.start.ticks),
+                end=int(i.end.ticks),
+                mediaType=i.mediaType,
+                speed=i.getSpeed(),
+            )
+            for i in items
+        ]
+
+    def clips(self, items):
+        return [
+            dict(
+                name=i.name,
+                duration=int(i.duration.ticks),
+                start=int(i.start.ticks),
+                end=int(i.end.ticks),
+                inPoint=int(i.inPoint.ticks),
+                outPoint=int(i.outPoint.ticks),
+                mediaType=i.mediaType,
+                mediaPath=self.media_path(i),
+                isSelected=i.isSelected(),
+                speed=i.getSpeed(),
+                isAdjustmentLayer=i.isAdjustmentLayer(),
+            )
+            for i in items
+        ]
+
+    def track_header(self, track):
+        return dict(
+            id=track.id,
+            name=track.name,
+            mediaType=track.mediaType,
+            isMuted=track.isMuted(),
+        )
+
+    def tracks(self, items):
+        result = list()
+        for item in items:
+            track = self.track_header(item)
+            track["clips"] = self.clips(item.clips)
+            track["transitions"] = self.transitions(item.transitions)
+            result.append(track)
+        return result
+
+    def fingerprint(self, track, with_selection):
+        # any summary of the same fields does, as long as it's stable
+        clips = self.clips(track.clips)
+        if not with_selection:
+            for clip in clips:
+                del clip["isSelected"]
+        return [
+            len(track.clips),
+            json.dumps(clips, sort_keys=True),
+            json.dumps(self.transitions(track.transitions), sort_keys=True),
+        ]
+
+    def fingerprints(self, items):
+        result = list()
+        for item in items:
+            track = self.track_header(item)
+            track["fingerprint"] = self.fingerprint(item, True)
+            result.append(track)
+        return result
+
+    def sequence_info(self, seq, track_function):
+        return dict(
+            sequenceID=seq.sequenceID,
+            name=seq.name,
+            inPoint=int(seq.getInPointAsTime().ticks),
+            outPoint=int(seq.getOutPointAsTime().ticks),
+            timebase=int(seq.timebase),
+            zeroPoint=int(seq.zeroPoint),
+            end=int(seq.end),
+            videoTracks=track_function(seq.videoTracks),
+            audioTracks=track_function(seq.audioTracks),
+        )
+
+    def active_sequences(self, project):
+        active = self.app.project.activeSequence
+        return [s for s in project.sequences if active and s.name == active.name]
+
+    def projects(self, track_function):
+        return [
+            dict(
+                documentID=p.documentID,
+                name=p.name,
+                path=p.path,
+                sequences=[
+                    self.sequence_info(s, track_function)
+                    for s in self.active_sequences(p)
+                ],
+            )
+            for p in self.app.projects
+        ]
+
+    def summary(self, project):
+        # the same fields as the ExtendScript summary
+        result = list()
+        for seq in self.active_sequences(project):
+            info = self.sequence_info(seq, lambda items: [
+                [t.id, t.name, t.mediaType, t.isMuted(), self.fingerprint(t, False)]
+                for t in items
+            ])
+            result.append(info)
+        return json.dumps([project.name, project.path, result], sort_keys=True)
+
+    def selection(self, project):
+        return [
+            [c.mediaType, c.name, int(c.start.ticks), int(c.end.ticks)]
+            for s in self.active_sequences(project) for c in s.getSelection()
+        ]
+
+    def summaries(self):
+        return [
+            dict(
+                documentID=p.documentID,
+                path=p.path,
+                summary=self.summary(p),
+                selection=self.selection(p),
+            )
+            for p in self.app.projects
+        ]
+
+    def summarized_projects(self):
+        result = self.projects(self.tracks)
+        for raw, project in zip(result, self.app.projects):
+            raw["summary"] = self.summary(project)
+        return result
+
+    def status(self):
+        return dict(
+            projects=[
+                dict(documentID=p.documentID, path=p.path)
+                for p in self.app.projects
+            ],
+        )
+
+    def sequences(self, ids, track_function):
+        return [
+            self.sequence_info(s, track_function)
+            for p in self.app.projects for s in p.sequences
+            if ids is None or s.sequenceID in ids
+        ]
+
+    def fetch_tracks(self, requests):
+        result = list()
+        for request in requests:
+            project = [p for p in self.app.projects if p.documentID == request["documentID"]]
+            seq = [
+                s for s in (project[0].sequences if project else list())
+                if s.sequenceID == request["sequenceID"]
+            ]
+            fetched = dict(
+                documentID=request["documentID"],
+                sequenceID=request["sequenceID"],
+                videoTracks=list(),
+                audioTracks=list(),
+            )
+            if seq:
+                for kind in ("videoTracks", "audioTracks"):
+                    for track in getattr(seq[0], kind):
+                        if track.id in request[kind]:
+                            fetched[kind].extend(self.tracks([track]))
+            result.append(fetched)
+        return result
+
+
+class StubBridge(object):
+    """
+    The adobe bridge of a session made of the given projects.
+    """
+
+    def __init__(self, projects):
+        self.app = App(projects)
+        self.scripts = HostScripts(self.app)
+        # the names of the scripts evaluated, e.g. "_SNAPSHOT_SCRIPT"
+        self.evaluated = list()
+        # the track requests of the last _FETCH_TRACKS_SCRIPT evaluation
+        self.fetched = None
+
+    def __argument(self, template, script):
+        """
+        :returns: The JSON literal substituted into a script template, or
+            raises ValueError if the script wasn't built from it.
+        """
+        prefix, suffix = template.split("%s")
+        if not (script.startswith(prefix) and script.endswith(suffix)):
+            raise ValueError()
+        return json.loads(script[len(prefix):len(script) - len(suffix)])
+
+    def rpc_eval(self, script):
+        scripts = self.scripts
+        fixed = dict(
+            _SNAPSHOT_SCRIPT=lambda: scripts.projects(scripts.tracks),
+            _FINGERPRINT_SCRIPT=lambda: scripts.projects(scripts.fingerprints),
+            _SUMMARY_SCRIPT=scripts.summaries,
+            _SUMMARIZED_SNAPSHOT_SCRIPT=scripts.summarized_projects,
+            _STATUS_SCRIPT=scripts.status,
+        )
+        for name, function in fixed.items():
+            if script == getattr(SessionInfo, name):
+                self.evaluated.append(name)
+                return json.dumps(function())
+
+        templates = dict(
+            _SEQUENCES_SCRIPT=lambda ids: scripts.sequences(ids, scripts.tracks),
+            _FETCH_TRACKS_SCRIPT=scripts.fetch_tracks,
+        )
+        for name, function in templates.items():
+            try:
+                argument = self.__argument(getattr(SessionInfo, name), script)
+            except ValueError:
+                continue
+            self.evaluated.append(name)
+            if name == "_FETCH_TRACKS_SCRIPT":
+                self.fetched = argument
+            return json.dumps(function(argument))
+
+        raise AssertionError("Unexpected script: %s" % (script[-80:],))
+
+
+class StubEngine(object):
+    """
+    The bits of the engine :class:`SessionInfo` uses.
+    """
+
+    def __init__(self, adobe):
+        self.adobe = adobe
+        self.logger = logging.getLogger("tk-premiere.tests")
+
+
+def build_session():
+    """
+    :returns: A :class:`StubBridge` with two open projects, the first one
+        holding two sequences, the second one a single empty sequence of the
+        same name as the active one.
+    """
+    plate = ProjectItem("1", "/plates/sh010.mov")
+    edit = Sequence(
+        "sequence-1",
+        "Edit",
+        video_tracks=[
+            Track(0, "V1", "Video", clips=[
+                Clip("sh010", 0, 24, in_point=100, project_item=plate),
+                Clip("sh020", 24, 60, project_item=ProjectItem("2", "/plates/sh020.mov"),
+                     selected=True, speed=2.0),
+                # generated clips have no project item
+                Clip("title", 60, 72),
+            ], transitions=[
+                Transition("Cross Dissolve", 20, 28),
+            ]),
+            Track(1, "V2", "Video", clips=[
+                Clip("sh010", 10, 20, project_item=plate),
+            ]),
+        ],
+        audio_tracks=[
+            Track(0, "A1", "Audio", clips=[
+                Clip("sh010", 0, 24, project_item=plate, media_type="Audio"),
+            ]),
+        ],
+    )
+    alternate = Sequence(
+        "sequence-2",
+        "Alternate",
+        video_tracks=[
+            Track(0, "V1", "Video", clips=[Clip("sh030", 0, 12)]),
+        ],
+    )
+    return StubBridge([
+        Project("document-1", "edit.prproj", "/projects/edit.prproj", [edit, alternate]),
+        Project("document-2", "other.prproj", "/projects/other.prproj", [
+            Sequence("sequence-3", "Edit"),
+        ]),
+    ])
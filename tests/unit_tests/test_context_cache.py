@@ -0,0 +1,187 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+import unittest
+
+from tk_premiere.context_cache import ContextCache
+
+
+class _Context(object):
+    """
+    Stands in for a toolkit context.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def serialize(self):
+        return "context:%s" % (self.name,)
+
+
+class _Store(object):
+    """
+    Records what the cache persists.
+    """
+
+    def __init__(self):
+        self.writes = list()
+        self.written = threading.Event()
+
+    def __call__(self, serialized):
+        self.writes.append(serialized)
+        self.written.set()
+
+
+class TestContextCacheLRU(unittest.TestCase):
+
+    def test_get(self):
+        cache = ContextCache()
+        context = _Context("a")
+        cache.add("/a", context)
+        self.assertIs(cache.get("/a"), context)
+        self.assertIsNone(cache.get("/b"))
+        self.assertIn("/a", cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_evicts_least_recently_used(self):
+        cache = ContextCache(capacity=2)
+        cache.add("/a", _Context("a"))
+        cache.add("/b", _Context("b"))
+        # looking up /a makes /b the least recently used
+        cache.get("/a")
+        cache.add("/c", _Context("c"))
+        self.assertEqual(len(cache), 2)
+        self.assertIn("/a", cache)
+        self.assertNotIn("/b", cache)
+        self.assertIn("/c", cache)
+
+    def test_readding_refreshes(self):
+        cache = ContextCache(capacity=2)
+        cache.add("/a", _Context("a"))
+        cache.add("/b", _Context("b"))
+        cache.add("/a", _Context("a"))
+        cache.add("/c", _Context("c"))
+        self.assertIn("/a", cache)
+        self.assertNotIn("/b", cache)
+
+    def test_clear(self):
+        cache = ContextCache()
+        cache.add("/a", _Context("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("/a"))
+
+
+class TestContextCachePersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.store = _Store()
+        self.cache = ContextCache(capacity=2, store=self.store, delay=0.2)
+
+    def tearDown(self):
+        self.cache.stop(timeout=5)
+
+    def test_write_behind(self):
+        self.cache.add("/a", _Context("a"))
+        self.cache.add("/b", _Context("b"))
+        self.assertTrue(self.store.written.wait(5))
+        self.cache.stop(timeout=5)
+        # changes made in quick succession end up in a single write
+        self.assertEqual(self.store.writes, [{"/a": "context:a", "/b": "context:b"}])
+
+    def test_evicted_entries_arent_written(self):
+        for name in ("a", "b", "c"):
+            self.cache.add("/%s" % name, _Context(name))
+        self.cache.stop(timeout=5)
+        self.assertEqual(self.store.writes[-1], {"/b": "context:b", "/c": "context:c"})
+
+    def test_unchanged_entries_arent_written_again(self):
+        self.cache.add("/a", _Context("a"))
+        self.cache.stop(timeout=5)
+        writes = len(self.store.writes)
+        self.cache.add("/a", _Context("a"))
+        self.cache.stop(timeout=5)
+        self.assertEqual(len(self.store.writes), writes)
+
+    def test_failed_writes(self):
+        def _fail(serialized):
+            raise IOError("disk full")
+
+        self.cache.store = _fail
+        self.cache.add("/a", _Context("a"))
+        self.cache.stop(timeout=5)
+        self.assertIn("/a", self.cache)
+
+
+class TestContextCacheLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = 0
+        self.deserialized = list()
+
+    def __load(self):
+        self.loads += 1
+        return {"/a": "context:a", "/b": "context:b", "/stale": "context:stale"}
+
+    def __deserialize(self, serialized):
+        self.deserialized.append(serialized)
+        if serialized == "context:stale":
+            raise ValueError("The entity doesn't exist anymore.")
+        return _Context(serialized.split(":", 1)[1])
+
+    def __cache(self, **kwargs):
+        return ContextCache(load=self.__load, deserialize=self.__deserialize, **kwargs)
+
+    def test_lazy_load(self):
+        cache = self.__cache()
+        self.assertEqual(self.loads, 0)
+        self.assertIn("/a", cache)
+        self.assertIn("/b", cache)
+        self.assertEqual(self.loads, 1)
+        # contexts are only deserialized when looked up
+        self.assertEqual(self.deserialized, [])
+
+        self.assertEqual(cache.get("/a").name, "a")
+        self.assertEqual(cache.get("/a").name, "a")
+        self.assertEqual(self.deserialized, ["context:a"])
+        self.assertEqual(self.loads, 1)
+
+    def test_unusable_entries_are_dropped(self):
+        cache = self.__cache()
+        self.assertIsNone(cache.get("/stale"))
+        self.assertNotIn("/stale", cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_new_entries_win(self):
+        cache = self.__cache()
+        context = _Context("new")
+        cache.add("/a", context)
+        self.assertIs(cache.get("/a"), context)
+        self.assertEqual(self.deserialized, [])
+
+    def test_capacity(self):
+        cache = self.__cache(capacity=2)
+        self.assertIsNone(cache.get("/missing"))
+        self.assertEqual(len(cache), 2)
+
+    def test_failed_load(self):
+        def _fail():
+            raise IOError("corrupt cache")
+
+        cache = ContextCache(load=_fail)
+        self.assertIsNone(cache.get("/a"))
+        cache.add("/a", _Context("a"))
+        self.assertEqual(cache.get("/a").name, "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest
+
+from tk_premiere.heartbeat import HeartbeatSchedule, PhiAccrualDetector
+
+
+class TestPhiAccrualDetector(unittest.TestCase):
+
+    def setUp(self):
+        # a heartbeat every second
+        self.detector = PhiAccrualDetector(min_std=0.1)
+        for i in range(10):
+            self.detector.heartbeat(float(i))
+        self.last = 9.0
+
+    def test_no_history(self):
+        detector = PhiAccrualDetector()
+        self.assertEqual(detector.phi(100.0), 0.0)
+        detector.heartbeat(0.0)
+        detector.heartbeat(1.0)
+        self.assertEqual(detector.phi(100.0), 0.0)
+        self.assertEqual(detector.last_heartbeat, 1.0)
+
+    def test_phi_rises(self):
+        phis = [self.detector.phi(self.last + elapsed) for elapsed in (0.5, 1.0, 1.5, 2.0, 3.0)]
+        self.assertAlmostEqual(phis[0], 0.0)
+        self.assertEqual(phis, sorted(phis))
+        self.assertLess(phis[1], 1.0)
+        self.assertGreater(phis[-1], 12.0)
+        self.assertEqual(self.detector.phi(self.last + 1000.0), float("inf"))
+
+        # a heartbeat clears the suspicion, an older one is ignored
+        self.detector.heartbeat(self.last - 1.0)
+        self.assertEqual(self.detector.last_heartbeat, self.last)
+        self.detector.heartbeat(self.last + 1.0)
+        self.assertLess(self.detector.phi(self.last + 1.5), 1.0)
+
+    def test_acceptable_pause(self):
+        detector = PhiAccrualDetector(min_std=0.1, acceptable_pause=10.0)
+        for i in range(10):
+            detector.heartbeat(float(i))
+        self.assertEqual(detector.phi(self.last + 3.0), 0.0)
+        self.assertGreater(detector.phi(self.last + 13.0), 12.0)
+
+    def test_min_failures(self):
+        now = self.last + 5.0
+        self.assertGreater(self.detector.phi(now), 12.0)
+        # too few failures, however late the heartbeat
+        self.assertFalse(self.detector.is_lost(now, 2, 12.0, 3, 20))
+        self.assertTrue(self.detector.is_lost(now, 3, 12.0, 3, 20))
+        # enough failures, but not late enough
+        self.assertFalse(self.detector.is_lost(self.last + 1.0, 3, 12.0, 3, 20))
+
+    def test_tolerance(self):
+        detector = PhiAccrualDetector()
+        # no history, the tolerance is the backstop
+        self.assertFalse(detector.is_lost(100.0, 19, 12.0, 3, 20))
+        self.assertTrue(detector.is_lost(100.0, 20, 12.0, 3, 20))
+
+
+class TestHeartbeatSchedule(unittest.TestCase):
+
+    def setUp(self):
+        self.schedule = HeartbeatSchedule(0.25, 1.0, 3.0)
+
+    def test_backoff(self):
+        self.assertEqual(self.schedule.interval, 1.0)
+        intervals = [self.schedule.update(False) for _ in range(3)]
+        self.assertEqual(intervals, [2.0, 3.0, 3.0])
+
+    def test_activity_resets(self):
+        self.schedule.update(False)
+        self.schedule.update(False)
+        self.assertEqual(self.schedule.update(True), 0.25)
+        # backs off again from the minimum
+        self.assertEqual(self.schedule.update(False), 0.5)
+        self.assertEqual(self.schedule.update(False), 1.0)
+        self.assertEqual(self.schedule.update(True), 0.25)
+
+    def test_max_interval(self):
+        self.assertEqual(self.schedule.update(False, max_interval=1.0), 1.0)
+        self.assertEqual(self.schedule.update(False, max_interval=10.0), 2.0)
+
+    def test_reset(self):
+        self.schedule.update(True)
+        self.assertEqual(self.schedule.reset(), 1.0)
+        self.assertEqual(self.schedule.interval, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest
+
+from tk_premiere.log_forwarder import LogForwarder
+
+
+class TestLogForwarder(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = list()
+        self.ready = True
+        self.deferred = 0
+        self.forwarder = LogForwarder(
+            lambda level, message: self.sent.append((level, message)),
+            capacity=4,
+            flush_size=3,
+            ready=lambda: self.ready,
+            defer=self.__defer,
+        )
+
+    def __defer(self):
+        self.deferred += 1
+
+    def test_batches(self):
+        self.forwarder.add("info", "one")
+        self.forwarder.add("info", "two")
+        self.assertEqual(self.sent, [])
+        self.forwarder.add("error", "three", urgent=True)
+        self.assertEqual(self.sent, [("info", "one\ntwo"), ("error", "three")])
+        self.assertEqual(len(self.forwarder), 0)
+
+    def test_dropped(self):
+        self.ready = False
+        for i in range(6):
+            self.forwarder.add("info", str(i))
+        self.forwarder.flush()
+        self.assertEqual(self.sent[0][0], "warn")
+        self.assertTrue(self.sent[0][1].startswith("2 log messages were dropped"))
+        self.assertEqual(self.sent[1], ("info", "2\n3\n4\n5"))
+
+    def test_deferred(self):
+        self.ready = False
+        self.forwarder.add("info", "one")
+        self.assertEqual(self.deferred, 0)
+        self.forwarder.add("error", "two", urgent=True)
+        self.assertEqual(self.deferred, 1)
+        self.assertEqual(self.sent, [])
+
+        self.forwarder.flush()
+        self.assertEqual(self.sent, [("info", "one"), ("error", "two")])
+
+
+if __name__ == "__main__":
+    unittest.main()
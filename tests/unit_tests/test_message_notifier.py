@@ -0,0 +1,120 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import socket
+import unittest
+
+from tk_premiere.message_notifier import BridgeMessageNotifier, find_bridge_socket
+
+
+class WebSocket(object):
+    """
+    The connection of a websocket client, wrapping its socket.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+
+
+class WebsocketTransport(object):
+
+    def __init__(self, connection):
+        self._connection = connection
+
+
+class SocketIO(object):
+    """
+    A socket.io client. Its transport property reconnects when accessed.
+    """
+
+    def __init__(self, transport):
+        self._transport_instance = transport
+
+    @property
+    def _transport(self):
+        raise AssertionError("The transport property must not be accessed.")
+
+
+class Bridge(object):
+    """
+    The adobe bridge, holding its socket.io client.
+    """
+
+    def __init__(self, client):
+        self._io = client
+
+
+class Logger(object):
+
+    def __init__(self):
+        self.warnings = list()
+
+    def debug(self, message):
+        pass
+
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+class TestFindBridgeSocket(unittest.TestCase):
+
+    def setUp(self):
+        (self.sock, self.peer) = socket.socketpair()
+
+    def tearDown(self):
+        self.sock.close()
+        self.peer.close()
+
+    def test_websocket(self):
+        adobe = Bridge(SocketIO(WebsocketTransport(WebSocket(self.sock))))
+        self.assertEqual(find_bridge_socket(adobe), self.sock.fileno())
+
+    def test_connection_is_socket(self):
+        # older clients hand out the socket as the connection itself
+        adobe = Bridge(SocketIO(WebsocketTransport(self.sock)))
+        self.assertEqual(find_bridge_socket(adobe), self.sock.fileno())
+
+    def test_fileno(self):
+        # a bridge exposing its socket is trusted over its client
+        class ExposingBridge(Bridge):
+            def fileno(bridge):
+                return self.peer.fileno()
+
+        adobe = ExposingBridge(SocketIO(WebsocketTransport(WebSocket(self.sock))))
+        self.assertEqual(find_bridge_socket(adobe), self.peer.fileno())
+
+    def test_not_found(self):
+        # http polling, or a client laid out differently
+        self.assertIsNone(find_bridge_socket(Bridge(SocketIO(None))))
+        self.assertIsNone(find_bridge_socket(Bridge(None)))
+        self.assertIsNone(find_bridge_socket(object()))
+
+    def test_closed(self):
+        adobe = Bridge(SocketIO(WebsocketTransport(WebSocket(self.sock))))
+        self.sock.close()
+        self.assertIsNone(find_bridge_socket(adobe))
+
+
+class TestBridgeMessageNotifier(unittest.TestCase):
+
+    def test_missing_socket_warning(self):
+        logger = Logger()
+        notifier = BridgeMessageNotifier(Bridge(SocketIO(None)), lambda: True, logger)
+        self.assertFalse(notifier.refresh())
+        self.assertFalse(notifier.refresh())
+        self.assertFalse(notifier.active)
+
+        # the fallback on the connection timer is only reported once
+        (warning,) = logger.warnings
+        self.assertIn(SocketIO.__module__, warning)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest
+
+from tk_premiere.property_cache import PropertyCache
+
+
+class Host(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TestPropertyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.project = Host(path="/projects/edit.prproj", name="edit.prproj")
+        self.adobe = Host(app=Host(project=self.project, version="13.0"))
+        self.cache = PropertyCache(
+            self.adobe,
+            ["app.project.path", "app.project.name"],
+            ["app.version"],
+        )
+
+    def test_read_through(self):
+        self.assertEqual(self.cache.get("app.project.path"), "/projects/edit.prproj")
+        self.project.path = "/projects/renamed.prproj"
+        self.assertEqual(self.cache.get("app.project.path"), "/projects/edit.prproj")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        # properties which aren't registered are never cached
+        self.assertIs(self.cache.get("app.project"), self.project)
+        self.assertNotIn("app.project", self.cache)
+
+    def test_invalidate(self):
+        self.cache.get("app.project.path")
+        self.cache.get("app.version")
+        self.project.path = "/projects/renamed.prproj"
+        self.cache.invalidate()
+        self.assertNotIn("app.project.path", self.cache)
+        self.assertIn("app.version", self.cache)
+        self.assertEqual(self.cache.get("app.project.path"), "/projects/renamed.prproj")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from tk_premiere.prproj_reader import PremiereProjectReader
+from tk_premiere.timebase import TICKS_PER_SECOND
+
+
+# 25 fps
+_TPF = TICKS_PER_SECOND // 25
+
+# a project holding a single sequence, with two clips and a transition on its
+# only video track, a clip on its only audio track. objects reference each
+# other the way Premiere serializes them.
+_PROJECT = """<?xml version="1.0" encoding="UTF-8" ?>
+<PremiereData Version="3">
+    <Project ObjectID="1" ClassID="p" Version="30">
+        <Node><Properties><MZ.Project.GUID>project-guid</MZ.Project.GUID></Properties></Node>
+    </Project>
+    <Sequence ObjectUID="sequence-1" ClassID="s" Version="7">
+        <Name>Edit</Name>
+        <Node><Properties>
+            <MZ.InPoint>{in_point}</MZ.InPoint>
+            <MZ.OutPoint>{out_point}</MZ.OutPoint>
+            <MZ.ZeroPoint>0</MZ.ZeroPoint>
+        </Properties></Node>
+        <TrackGroups>
+            <TrackGroup Index="0"><First>v</First><Second ObjectRef="2"/></TrackGroup>
+            <TrackGroup Index="1"><First>a</First><Second ObjectRef="3"/></TrackGroup>
+        </TrackGroups>
+    </Sequence>
+    <VideoTrackGroup ObjectID="2" ClassID="vg" Version="5">
+        <TrackGroup>
+            <Tracks><Track Index="0" ObjectURef="video-track-1"/></Tracks>
+            <FrameRate>{tpf}</FrameRate>
+        </TrackGroup>
+    </VideoTrackGroup>
+    <AudioTrackGroup ObjectID="3" ClassID="ag" Version="5">
+        <TrackGroup>
+            <Tracks><Track Index="0" ObjectURef="audio-track-1"/></Tracks>
+            <FrameRate>5292000</FrameRate>
+        </TrackGroup>
+    </AudioTrackGroup>
+    <VideoClipTrack ObjectUID="video-track-1" ClassID="vt" Version="2">
+        <ClipTrack>
+            <ClipItems><TrackItems>
+                <TrackItem Index="0" ObjectRef="10"/>
+                <TrackItem Index="1" ObjectRef="11"/>
+            </TrackItems></ClipItems>
+            <TransitionItems><TrackItems>
+                <TrackItem Index="0" ObjectRef="12"/>
+            </TrackItems></TransitionItems>
+            <Track><ID>1</ID><Name>Plates</Name><IsMuted>false</IsMuted></Track>
+        </ClipTrack>
+    </VideoClipTrack>
+    <AudioClipTrack ObjectUID="audio-track-1" ClassID="at" Version="2">
+        <ClipTrack>
+            <ClipItems><TrackItems>
+                <TrackItem Index="0" ObjectRef="13"/>
+            </TrackItems></ClipItems>
+            <Track><ID>2</ID><IsMuted>true</IsMuted></Track>
+        </ClipTrack>
+    </AudioClipTrack>
+    <VideoClipTrackItem ObjectID="10" ClassID="vti" Version="8">
+        <ClipTrackItem>
+            <TrackItem><Start>0</Start><End>{end_1}</End></TrackItem>
+            <SubClip ObjectRef="20"/>
+        </ClipTrackItem>
+    </VideoClipTrackItem>
+    <VideoClipTrackItem ObjectID="11" ClassID="vti" Version="8">
+        <ClipTrackItem>
+            <TrackItem><Start>{end_1}</Start><End>{end_2}</End><IsSelected>true</IsSelected></TrackItem>
+            <SubClip ObjectRef="21"/>
+        </ClipTrackItem>
+    </VideoClipTrackItem>
+    <VideoTransitionTrackItem ObjectID="12" ClassID="vtr" Version="8">
+        <TransitionTrackItem>
+            <TrackItem><Start>{transition_start}</Start><End>{transition_end}</End></TrackItem>
+        </TransitionTrackItem>
+        <DisplayName>Cross Dissolve</DisplayName>
+    </VideoTransitionTrackItem>
+    <AudioClipTrackItem ObjectID="13" ClassID="ati" Version="8">
+        <ClipTrackItem>
+            <TrackItem><Start>0</Start><End>{end_2}</End></TrackItem>
+            <SubClip ObjectRef="22"/>
+        </ClipTrackItem>
+    </AudioClipTrackItem>
+    <SubClip ObjectID="20" ClassID="sc" Version="5"><Name>sh010</Name><Clip ObjectRef="30"/></SubClip>
+    <SubClip ObjectID="21" ClassID="sc" Version="5"><Name>sh020</Name><Clip ObjectRef="31"/></SubClip>
+    <SubClip ObjectID="22" ClassID="sc" Version="5"><Name>sh010</Name><Clip ObjectRef="32"/></SubClip>
+    <VideoClip ObjectID="30" ClassID="vc" Version="11">
+        <Clip><Source ObjectRef="40"/><InPoint>{in_1}</InPoint><OutPoint>{out_1}</OutPoint></Clip>
+    </VideoClip>
+    <VideoClip ObjectID="31" ClassID="vc" Version="11">
+        <Clip><Source ObjectRef="41"/><InPoint>0</InPoint><OutPoint>{out_2}</OutPoint><PlaybackSpeed>2</PlaybackSpeed></Clip>
+    </VideoClip>
+    <AudioClip ObjectID="32" ClassID="ac" Version="8">
+        <Clip><Source ObjectRef="42"/><InPoint>0</InPoint><OutPoint>{end_2}</OutPoint></Clip>
+    </AudioClip>
+    <VideoMediaSource ObjectID="40" ClassID="vms" Version="2"><MediaSource><Media ObjectURef="media-1"/></MediaSource></VideoMediaSource>
+    <VideoMediaSource ObjectID="41" ClassID="vms" Version="2"><MediaSource><Media ObjectURef="media-2"/></MediaSource></VideoMediaSource>
+    <AudioMediaSource ObjectID="42" ClassID="ams" Version="2"><MediaSource><Media ObjectURef="media-1"/></MediaSource></AudioMediaSource>
+    <Media ObjectUID="media-1" ClassID="m" Version="30"><ActualMediaFilePath>/plates/sh010.mov</ActualMediaFilePath></Media>
+    <Media ObjectUID="media-2" ClassID="m" Version="30"><FilePath>/plates/sh020.mov</FilePath></Media>
+    <ProjectSettings ObjectID="50" ClassID="ps" Version="1"><Blob>{blob}</Blob></ProjectSettings>
+</PremiereData>
+""".format(
+    tpf=_TPF,
+    in_point=0,
+    out_point=_TPF * 60,
+    end_1=_TPF * 24,
+    end_2=_TPF * 60,
+    transition_start=_TPF * 20,
+    transition_end=_TPF * 28,
+    in_1=_TPF * 100,
+    out_1=_TPF * 124,
+    out_2=_TPF * 72,
+    blob="x" * 1000,
+)
+
+
+class TestPremiereProjectReader(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "edit.prproj")
+        with gzip.open(self.path, "wb") as fh:
+            fh.write(_PROJECT.encode("utf-8"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_project(self):
+        (project,) = PremiereProjectReader(self.path).get_info()
+        self.assertEqual(project["documentID"], "project-guid")
+        self.assertEqual(project["name"], "edit.prproj")
+        self.assertEqual(project["path"], self.path)
+        self.assertIsNone(project["activeSequence"])
+        self.assertEqual(len(project["sequences"]), 1)
+
+    def test_sequence(self):
+        sequence = PremiereProjectReader(self.path).get_info()[0]["sequences"][0]
+        self.assertEqual(sequence["sequenceID"], "sequence-1")
+        self.assertEqual(sequence["name"], "Edit")
+        self.assertEqual(sequence["timebase"], _TPF)
+        self.assertEqual(sequence["inPoint"], 0)
+        self.assertEqual(sequence["outPoint"], 60)
+        self.assertEqual(sequence["zeroPoint"], 0)
+        self.assertEqual(sequence["end"], 60)
+
+        (video,) = sequence["videoTracks"]
+        self.assertEqual(video["id"], 1)
+        self.assertEqual(video["name"], "Plates")
+        self.assertEqual(video["mediaType"], "Video")
+        self.assertFalse(video["isMuted"])
+
+        # tracks without a name are named after their position
+        (audio,) = sequence["audioTracks"]
+        self.assertEqual(audio["name"], "Audio 1")
+        self.assertTrue(audio["isMuted"])
+
+    def test_clips(self):
+        sequence = PremiereProjectReader(self.path).get_info()[0]["sequences"][0]
+        (first, second) = sequence["videoTracks"][0]["clips"]
+
+        self.assertEqual(first["name"], "sh010")
+        self.assertEqual((first["start"], first["end"], first["duration"]), (0, 24, 24))
+        self.assertEqual((first["inPoint"], first["outPoint"]), (100, 124))
+        self.assertEqual(first["source_path_clip"], "/plates/sh010.mov")
+        self.assertFalse(first["isSelected"])
+        self.assertEqual(first["speed"], 1.0)
+
+        self.assertEqual(second["name"], "sh020")
+        self.assertEqual((second["start"], second["end"]), (24, 60))
+        self.assertEqual(second["source_path_clip"], "/plates/sh020.mov")
+        self.assertTrue(second["isSelected"])
+        self.assertEqual(second["speed"], 2.0)
+
+        (audio,) = sequence["audioTracks"][0]["clips"]
+        self.assertEqual(audio["mediaType"], "Audio")
+        self.assertEqual(audio["source_path_clip"], "/plates/sh010.mov")
+
+    def test_transitions(self):
+        sequence = PremiereProjectReader(self.path).get_info()[0]["sequences"][0]
+        (transition,) = sequence["videoTracks"][0]["transitions"]
+        self.assertEqual(transition["name"], "Cross Dissolve")
+        self.assertEqual((transition["start"], transition["end"]), (20, 28))
+        self.assertEqual(transition["duration"], 8)
+        self.assertEqual(transition["mediaType"], "Video")
+
+    def test_uncompressed(self):
+        with open(self.path, "wb") as fh:
+            fh.write(_PROJECT.encode("utf-8"))
+        sequences = PremiereProjectReader(self.path).get_info()[0]["sequences"]
+        self.assertEqual(len(sequences[0]["videoTracks"][0]["clips"]), 2)
+
+
+
+_RESOURCES = os.path.join(os.path.dirname(__file__), os.pardir, "resources")
+
+
+class TestSavedProjects(unittest.TestCase):
+    """
+    Reads the projects saved by Premiere Pro 11.0.1 which come with the
+    engine and its tests.
+    """
+
+    def __read(self, name):
+        (project,) = PremiereProjectReader(os.path.join(_RESOURCES, name)).get_info()
+        return project
+
+    def test_empty_projects(self):
+        # freshly created projects hold no sequence at all. their settings
+        # hold nested objects whose ids clash with those of top level ones.
+        for name, guid in (
+            ("simpleproject.prproj", "6cb33e2c-a79b-4ba5-850e-8029613a6745"),
+            (os.path.join(os.pardir, os.pardir, "resources", "Untitled.prproj"),
+             "e8695604-a204-4f7c-9412-e378ea7cfeba"),
+        ):
+            project = self.__read(name)
+            self.assertEqual(project["documentID"], guid)
+            self.assertEqual(project["sequences"], [])
+
+    def test_sequence(self):
+        # simpleproject.prproj with a sequence added to its root bin, laid out
+        # the way Premiere saves them: references to objects of both id
+        # kinds, and fields holding their default value left out.
+        project = self.__read("sequenceproject.prproj")
+        self.assertEqual(project["documentID"], "6cb33e2c-a79b-4ba5-850e-8029613a6745")
+
+        (sequence,) = project["sequences"]
+        self.assertEqual(sequence["sequenceID"], "2c4d6e8f-1a3b-4c5d-8e7f-9a0b1c2d3e04")
+        self.assertEqual(sequence["name"], "Edit")
+        self.assertEqual(sequence["timebase"], _TPF)
+        self.assertEqual((sequence["inPoint"], sequence["outPoint"]), (0, 60))
+        self.assertEqual(sequence["end"], 60)
+        self.assertEqual(
+            [(t["id"], t["name"]) for t in sequence["videoTracks"]],
+            [(1, "Plates"), (2, "Video 2")],
+        )
+
+        (first, second) = sequence["videoTracks"][0]["clips"]
+        self.assertEqual(first["name"], "sh010")
+        self.assertEqual((first["start"], first["end"]), (0, 24))
+        self.assertEqual((first["inPoint"], first["outPoint"]), (100, 124))
+        self.assertEqual(first["source_path_clip"], "C:\\plates\\sh010.mov")
+        self.assertEqual(second["name"], "sh020")
+        self.assertEqual((second["start"], second["end"]), (24, 60))
+        self.assertEqual((second["inPoint"], second["speed"]), (0, 2.0))
+        self.assertEqual(second["source_path_clip"], "\\\\server\\plates\\sh020.mov")
+
+        (transition,) = sequence["videoTracks"][0]["transitions"]
+        self.assertEqual((transition["name"], transition["start"], transition["end"]),
+                         ("Cross Dissolve", 20, 28))
+
+        (audio,) = sequence["audioTracks"]
+        self.assertTrue(audio["isMuted"])
+        self.assertEqual([c["name"] for c in audio["clips"]], ["sh010"])
+
+
+if __name__ == "__main__":
+    unittest.main()
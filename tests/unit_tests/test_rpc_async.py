@@ -0,0 +1,132 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+import unittest
+
+from tk_premiere.rpc_async import (
+    AsyncRPCExecutor,
+    BridgeLock,
+    serialize_rpc,
+)
+
+
+def dispatch(function):
+    function()
+
+
+class Bridge(object):
+    """
+    A bridge recording whether its lock is held when its methods are called.
+    """
+
+    def __init__(self):
+        self.held = dict()
+
+    def __record(self, name):
+        lock = getattr(self, "_tk_premiere_rpc_lock", None)
+        self.held[name] = lock is not None and lock.held()
+
+    def rpc_eval(self, script):
+        self.__record("rpc_eval")
+        return script
+
+    def send_commands(self, commands):
+        self.__record("send_commands")
+
+    def context_about_to_change(self):
+        self.__record("context_about_to_change")
+
+    def log_message(self, level, message):
+        self.__record("log_message")
+
+    def send_context_display(self, display):
+        self.__record("send_context_display")
+
+    def get_panel_state(self):
+        self.__record("get_panel_state")
+
+
+class TestBridgeLock(unittest.TestCase):
+
+    def test_held(self):
+        lock = BridgeLock()
+        self.assertFalse(lock.held())
+        with lock:
+            with lock:
+                self.assertTrue(lock.held())
+            self.assertTrue(lock.held())
+
+            # only by the thread holding it
+            other = list()
+            thread = threading.Thread(target=lambda: other.append(lock.held()))
+            thread.start()
+            thread.join()
+            self.assertEqual(other, [False])
+        self.assertFalse(lock.held())
+
+
+class TestSerializeRPC(unittest.TestCase):
+
+    def test_socket_methods(self):
+        adobe = Bridge()
+        lock = serialize_rpc(adobe)
+        self.assertIsInstance(lock, BridgeLock)
+        self.assertIs(serialize_rpc(adobe), lock)
+
+        adobe.rpc_eval("1")
+        adobe.send_commands([])
+        adobe.context_about_to_change()
+        adobe.log_message("info", "hello")
+        adobe.send_context_display("<b>sh010</b>")
+        adobe.get_panel_state()
+        self.assertEqual(
+            adobe.held,
+            {
+                "rpc_eval": True,
+                "send_commands": True,
+                "context_about_to_change": True,
+                "log_message": True,
+                "send_context_display": True,
+                # not talking through the socket
+                "get_panel_state": False,
+            },
+        )
+
+
+class TestAsyncRPCExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.adobe = Bridge()
+        self.lock = serialize_rpc(self.adobe)
+        self.executor = AsyncRPCExecutor(dispatch, lock=self.lock)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def test_result(self):
+        future = self.executor.submit(lambda x: x * 2, 21)
+        self.assertEqual(future.result(timeout=5), 42)
+
+    def test_wait_holding_lock(self):
+        with self.lock:
+            future = self.executor.submit(self.adobe.rpc_eval, "1")
+            # the call can't start, waiting for it would never end
+            self.assertRaises(RuntimeError, future.result)
+            self.assertRaises(RuntimeError, future.exception)
+
+        # a completed call can be read whoever holds the lock
+        self.assertEqual(future.result(timeout=5), "1")
+        with self.lock:
+            self.assertEqual(future.result(), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
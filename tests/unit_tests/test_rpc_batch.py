@@ -0,0 +1,89 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import unittest
+
+from tk_premiere.rpc_batch import RPCBatch, RPCBatchError
+
+
+class Bridge(object):
+    """
+    A bridge answering every evaluation with the given results, as a JSON
+    string like the host does.
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.scripts = list()
+
+    def rpc_eval(self, script):
+        self.scripts.append(script)
+        return json.dumps(self.results)
+
+
+class TestRPCBatch(unittest.TestCase):
+
+    def test_script(self):
+        batch = RPCBatch(Bridge(list()))
+        batch.get("app.project.path")
+        batch.call("app.project.importFiles", ["/plates/sh010.mov"], True)
+        self.assertEqual(len(batch), 2)
+
+        script = batch.script()
+        self.assertTrue(script.startswith("(function () {"))
+        self.assertTrue(script.endswith("return enc(results);})();"))
+        # requests are run in the order they were queued, each on its own
+        statements = [line for line in script.splitlines() if line.startswith("run(")]
+        self.assertEqual(statements, [
+            "run(function () { return app.project.path; });",
+            'run(function () { return app.project.importFiles(["/plates/sh010.mov"], true); });',
+        ])
+
+    def test_send(self):
+        adobe = Bridge([[True, "/projects/edit.prproj"], [True, None]])
+        batch = RPCBatch(adobe)
+        path = batch.get("app.project.path")
+        save = batch.call("app.project.save")
+        self.assertFalse(path.done())
+        self.assertRaises(RPCBatchError, path.result)
+
+        batch.send()
+        self.assertEqual(len(adobe.scripts), 1)
+        self.assertEqual(len(batch), 0)
+        self.assertTrue(path.done())
+        self.assertEqual(path.result(), "/projects/edit.prproj")
+        self.assertIsNone(save.result())
+        self.assertIsNone(save.exception())
+
+        # nothing left to send
+        batch.send()
+        self.assertEqual(len(adobe.scripts), 1)
+
+    def test_errors(self):
+        adobe = Bridge([[True, "edit.prproj"], [False, "ReferenceError: foo is undefined"]])
+        batch = RPCBatch(adobe)
+        name = batch.get("app.project.name")
+        foo = batch.get("foo")
+        missing = batch.get("app.project.path")
+        batch.send()
+
+        # a failing request doesn't affect the others
+        self.assertEqual(name.result(), "edit.prproj")
+        self.assertTrue(foo.done())
+        self.assertIsInstance(foo.exception(), RPCBatchError)
+        self.assertIn("ReferenceError", str(foo.exception()))
+        self.assertRaises(RPCBatchError, foo.result)
+        # results missing from the reply
+        self.assertRaises(RPCBatchError, missing.result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tk_premiere.rpc_stats import RPCStats, instrument_rpc
+
+
+class Proxy(object):
+    """
+    A host object proxy, forwarding unknown attributes to the host as the
+    proxies of the bridge do.
+    """
+
+    def __init__(self, bridge, uid):
+        self._bridge = bridge
+        self.uid = uid
+
+    def __getattr__(self, name):
+        return self._bridge.rpc_get(self, name)
+
+
+class FunctionProxy(Proxy):
+
+    def __init__(self, bridge, uid, parent):
+        super(FunctionProxy, self).__init__(bridge, uid)
+        self._parent = parent
+
+    def __call__(self, *args):
+        return self._bridge.rpc_call(self, list(args), self._parent)
+
+
+class Bridge(object):
+    """
+    A bridge to a host whose project has a ``path`` property and a ``save``
+    and ``importFiles`` method.
+    """
+
+    def __init__(self):
+        self.project = Proxy(self, 1)
+        self.calls = list()
+
+    def rpc_get(self, proxy, property_name):
+        if property_name == "path":
+            return "/projects/edit.prproj"
+        return FunctionProxy(self, 2, proxy)
+
+    def rpc_call(self, proxy, params, parent=None):
+        self.calls.append(params)
+        return True
+
+    def rpc_eval(self, script):
+        return json.dumps(script)
+
+    def ping(self):
+        raise RuntimeError("timed out")
+
+
+class TestRPCStats(unittest.TestCase):
+
+    def setUp(self):
+        self.bridge = Bridge()
+        self.stats = instrument_rpc(self.bridge)
+
+    def test_groups(self):
+        project = self.bridge.project
+        self.assertEqual(project.path, "/projects/edit.prproj")
+        project.save()
+        project.save()
+        project.importFiles(["/plates/sh010.mov"], True)
+        self.assertEqual(self.bridge.calls, [[], [], [["/plates/sh010.mov"], True]])
+
+        groups = self.stats.summary()["groups"]
+        self.assertEqual(
+            dict((key, group["count"]) for key, group in groups.items()),
+            {
+                "rpc_get:path": 1,
+                "rpc_get:save": 2,
+                "rpc_get:importFiles": 1,
+                "rpc_call:save": 2,
+                "rpc_call:importFiles": 1,
+            },
+        )
+
+    def test_argument_values(self):
+        # neither the values passed in nor the scripts evaluated are groups
+        self.bridge.rpc_call(FunctionProxy(self.bridge, 3, None), ["/plates/sh010.mov"])
+        self.bridge.rpc_eval("app.project.path")
+        self.assertEqual(
+            sorted(self.stats.summary()["groups"]), ["rpc_call", "rpc_eval"]
+        )
+        self.assertEqual(RPCStats.key("rpc_set", (None, "name", "sh010")), "rpc_set:name")
+
+    def test_payload(self):
+        script = "app.project.path"
+        self.bridge.rpc_eval(script)
+        self.bridge.project.save()
+        groups = self.stats.summary()["groups"]
+        self.assertEqual(groups["rpc_eval"]["payload"], len(script) + len(json.dumps(script)))
+        self.assertEqual(groups["rpc_call:save"]["payload"], 0)
+
+    def test_failures(self):
+        self.assertRaises(RuntimeError, self.bridge.ping)
+        self.assertEqual(self.stats.summary()["groups"]["ping"]["count"], 1)
+        self.assertIsNone(self.stats.last_success)
+
+        self.bridge.rpc_eval("1")
+        self.assertIsNotNone(self.stats.last_success)
+
+    def test_instrument_once(self):
+        self.assertIs(instrument_rpc(self.bridge), self.stats)
+        self.bridge.rpc_eval("1")
+        self.assertEqual(self.stats.summary()["groups"]["rpc_eval"]["count"], 1)
+
+    def test_percentiles(self):
+        stats = RPCStats()
+        for ms in range(1, 101):
+            stats.record("rpc_eval", ms / 1000.0, payload=10)
+        group = stats.summary()["groups"]["rpc_eval"]
+        self.assertEqual(group["count"], 100)
+        self.assertEqual(group["payload"], 1000)
+        self.assertEqual(group["max"], 100.0)
+        self.assertEqual((group["p50"], group["p95"], group["p99"]), (51.0, 95.0, 99.0))
+
+        # only the most recent samples are kept
+        for _ in range(RPCStats.SAMPLES):
+            stats.record("rpc_eval", 0.001)
+        self.assertEqual(stats.summary()["groups"]["rpc_eval"]["p99"], 1.0)
+
+        stats.reset()
+        self.assertEqual(stats.summary()["groups"], dict())
+
+    def test_format_and_dump(self):
+        stats = RPCStats()
+        stats.record("rpc_eval", 0.5)
+        stats.record("rpc_get:path", 0.001)
+        lines = stats.format(limit=1)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("rpc_eval "))
+
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, "stats.json")
+            stats.dump(path)
+            with open(path) as fh:
+                self.assertEqual(sorted(json.load(fh)["groups"]), ["rpc_eval", "rpc_get:path"])
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
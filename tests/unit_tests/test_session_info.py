@@ -0,0 +1,206 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tk_premiere.session_info import SessionInfo
+
+from .stub_bridge import Clip, StubEngine, build_session
+
+
+class TestSessionInfo(unittest.TestCase):
+
+    def setUp(self):
+        self.adobe = build_session()
+        self.session_info = SessionInfo(StubEngine(self.adobe))
+
+    def test_live(self):
+        (edit, other) = self.session_info.get_info()
+        self.assertEqual(edit["documentID"], "document-1")
+        self.assertIs(edit["activeSequence"], self.adobe.app.projects[0].activeSequence)
+
+        # only the sequences named after the active one are reported
+        (sequence,) = edit["sequences"]
+        self.assertEqual(sequence["sequenceID"], "sequence-1")
+        self.assertEqual(sequence["end"], 72)
+        self.assertEqual([t["name"] for t in sequence["videoTracks"]], ["V1", "V2"])
+
+        (first, second, title) = sequence["videoTracks"][0]["clips"]
+        self.assertEqual((first["start"], first["end"], first["inPoint"]), (0, 24, 100))
+        self.assertEqual(first["source_path_clip"], "/plates/sh010.mov")
+        self.assertTrue(second["isSelected"])
+        self.assertIsNone(title["source_path_clip"])
+
+        self.assertEqual([s["sequenceID"] for s in other["sequences"]], ["sequence-3"])
+
+    def test_snapshot_matches_live(self):
+        self.assertEqual(
+            self.session_info.get_info(snapshot=True),
+            self.session_info.get_info(),
+        )
+        self.assertEqual(self.adobe.evaluated, ["_SNAPSHOT_SCRIPT"])
+
+    def test_incremental_matches_live(self):
+        self.assertEqual(
+            self.session_info.get_info(incremental=True),
+            self.session_info.get_info(),
+        )
+        # the first harvest fetches every track
+        self.assertEqual(
+            self.adobe.evaluated, ["_FINGERPRINT_SCRIPT", "_FETCH_TRACKS_SCRIPT"]
+        )
+
+    def test_incremental_fetches_changed_tracks(self):
+        self.session_info.get_info(incremental=True)
+        self.adobe.evaluated = list()
+
+        # nothing changed
+        self.assertEqual(
+            self.session_info.get_info(incremental=True),
+            self.session_info.get_info(),
+        )
+        self.assertEqual(self.adobe.evaluated, ["_FINGERPRINT_SCRIPT"])
+
+        # a clip added to V2 only
+        edit = self.adobe.app.projects[0].sequences[0]
+        edit.videoTracks[1].clips.append(Clip("sh040", 30, 40))
+        self.adobe.evaluated = list()
+        info = self.session_info.get_info(incremental=True)
+        self.assertEqual(info, self.session_info.get_info())
+        self.assertEqual(
+            self.adobe.fetched,
+            [dict(documentID="document-1", sequenceID="sequence-1",
+                  videoTracks=[1], audioTracks=[])],
+        )
+        self.assertEqual(
+            [c["name"] for c in info[0]["sequences"][0]["videoTracks"][1]["clips"]],
+            ["sh010", "sh040"],
+        )
+
+    def test_incremental_reset(self):
+        self.session_info.get_info(incremental=True)
+        self.session_info.reset()
+        self.adobe.evaluated = list()
+        self.session_info.get_info(incremental=True)
+        self.assertEqual(
+            self.adobe.evaluated, ["_FINGERPRINT_SCRIPT", "_FETCH_TRACKS_SCRIPT"]
+        )
+
+    def test_sequences(self):
+        live = self.session_info.get_info()[0]["sequences"][0]
+        sequences = self.session_info.get_sequences(["sequence-1", "sequence-2", "unknown"])
+        self.assertEqual(sorted(sequences), ["sequence-1", "sequence-2"])
+        self.assertEqual(sequences["sequence-1"], live)
+        self.assertEqual(
+            sequences["sequence-2"]["videoTracks"][0]["clips"][0]["name"], "sh030"
+        )
+        self.assertEqual(len(self.session_info.get_sequences()), 3)
+        self.assertEqual(self.session_info.get_sequences([]), dict())
+
+    def test_project_paths(self):
+        self.adobe.app.projects[1].path = "\\\\?\\UNC\\server\\share\\other.prproj"
+        self.assertEqual(
+            self.session_info.get_project_paths(),
+            ["/projects/edit.prproj", "\\\\server\\share\\other.prproj"],
+        )
+        self.assertEqual(self.adobe.evaluated, ["_STATUS_SCRIPT"])
+
+    def test_no_active_sequence(self):
+        self.adobe.app.project.activeSequence = None
+        live = self.session_info.get_info()
+        self.assertEqual([p["sequences"] for p in live], [[], []])
+        self.assertEqual(self.session_info.get_info(snapshot=True), live)
+
+
+class TestCachedSessionInfo(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.adobe = build_session()
+        # snapshots are keyed by the state of the project files
+        for project in self.adobe.app.projects:
+            project.path = os.path.join(self.root, project.name)
+            with open(project.path, "w") as fh:
+                fh.write(project.name)
+        self.session_info = self.__session_info()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def __session_info(self):
+        return SessionInfo(
+            StubEngine(self.adobe), cache_root=os.path.join(self.root, "cache")
+        )
+
+    def test_cached_matches_live(self):
+        live = self.session_info.get_info()
+        self.assertEqual(self.session_info.get_info(cached=True), live)
+        # a single walk of the projects on a miss
+        self.assertEqual(
+            self.adobe.evaluated, ["_SUMMARY_SCRIPT", "_SUMMARIZED_SNAPSHOT_SCRIPT"]
+        )
+
+        # snapshots outlive the session info, document ids don't
+        for project in self.adobe.app.projects:
+            project.documentID = project.documentID.replace("document", "session")
+        live = self.session_info.get_info()
+        self.adobe.evaluated = list()
+        self.assertEqual(self.__session_info().get_info(cached=True), live)
+        self.assertEqual(self.adobe.evaluated, ["_SUMMARY_SCRIPT"])
+
+    def test_cached_selection(self):
+        self.session_info.get_info(cached=True)
+        edit = self.adobe.app.projects[0].sequences[0]
+        edit.videoTracks[0].clips[1].selected = False
+        edit.audioTracks[0].clips[0].selected = True
+
+        self.adobe.evaluated = list()
+        self.assertEqual(
+            self.session_info.get_info(cached=True), self.session_info.get_info()
+        )
+        self.assertEqual(self.adobe.evaluated, ["_SUMMARY_SCRIPT"])
+
+    def test_cached_edit(self):
+        self.session_info.get_info(cached=True)
+        edit = self.adobe.app.projects[0].sequences[0]
+        edit.videoTracks[1].clips.append(Clip("sh040", 30, 40))
+
+        self.adobe.evaluated = list()
+        info = self.session_info.get_info(cached=True)
+        self.assertEqual(info, self.session_info.get_info())
+        self.assertEqual(
+            self.adobe.evaluated, ["_SUMMARY_SCRIPT", "_SUMMARIZED_SNAPSHOT_SCRIPT"]
+        )
+
+        # the new state is cached in turn
+        self.adobe.evaluated = list()
+        self.assertEqual(self.session_info.get_info(cached=True), info)
+        self.assertEqual(self.adobe.evaluated, ["_SUMMARY_SCRIPT"])
+
+    def test_cached_unsaved_rename(self):
+        self.session_info.get_info(cached=True)
+        # neither the number nor the extent of the clips of the track change
+        edit = self.adobe.app.projects[0].sequences[0]
+        edit.videoTracks[0].clips[1].name = "sh025"
+
+        self.adobe.evaluated = list()
+        info = self.session_info.get_info(cached=True)
+        self.assertEqual(info, self.session_info.get_info())
+        self.assertEqual(info[0]["sequences"][0]["videoTracks"][0]["clips"][1]["name"], "sh025")
+        self.assertEqual(
+            self.adobe.evaluated, ["_SUMMARY_SCRIPT", "_SUMMARIZED_SNAPSHOT_SCRIPT"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
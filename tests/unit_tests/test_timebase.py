@@ -0,0 +1,77 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest
+from fractions import Fraction
+
+from tk_premiere.timebase import TICKS_PER_SECOND, Timebase
+
+
+def _ticks_per_frame(numerator, denominator=1):
+    return TICKS_PER_SECOND * denominator // numerator
+
+
+class TestTimebase(unittest.TestCase):
+
+    def setUp(self):
+        self.ntsc = Timebase(_ticks_per_frame(30000, 1001))
+        self.ntsc_60 = Timebase(_ticks_per_frame(60000, 1001))
+        self.pal = Timebase(_ticks_per_frame(25))
+
+    def __timecode(self, timebase, frame, **kwargs):
+        return timebase.timecodes([frame * timebase.ticks_per_frame], **kwargs)[0]
+
+    def test_frame_rate(self):
+        self.assertEqual(self.ntsc.frame_rate, Fraction(30000, 1001))
+        self.assertTrue(self.ntsc.is_drop_frame_rate)
+        self.assertTrue(self.ntsc_60.is_drop_frame_rate)
+        self.assertFalse(self.pal.is_drop_frame_rate)
+
+    def test_exact_frames(self):
+        tpf = self.ntsc.ticks_per_frame
+        self.assertEqual(self.ntsc.to_frames(tpf * 3), 3)
+        self.assertIsInstance(self.ntsc.to_frames(tpf * 3), int)
+        self.assertEqual(self.ntsc.to_frames(tpf * 3 + tpf // 2), Fraction(7, 2))
+        self.assertEqual(self.ntsc.frames([0, tpf, tpf // 4]), [0, 1, Fraction(1, 4)])
+        self.assertEqual(self.ntsc.whole_frames([tpf - 1, tpf]), [0, 1])
+
+    def test_non_drop_frame_timecode(self):
+        self.assertEqual(self.__timecode(self.pal, 0), "00:00:00:00")
+        self.assertEqual(self.__timecode(self.pal, 24), "00:00:00:24")
+        self.assertEqual(self.__timecode(self.pal, 25 * 3600), "01:00:00:00")
+        # the offset is typically the zero point of the sequence
+        self.assertEqual(
+            self.pal.timecodes([0], offset=self.pal.ticks_per_frame * 25 * 60)[0],
+            "00:01:00:00",
+        )
+
+    def test_drop_frame_timecode(self):
+        # frame numbers 00 and 01 are skipped at the start of every minute...
+        self.assertEqual(self.__timecode(self.ntsc, 1799), "00:00:59;29")
+        self.assertEqual(self.__timecode(self.ntsc, 1800), "00:01:00;02")
+        self.assertEqual(self.__timecode(self.ntsc, 3597), "00:01:59;29")
+        self.assertEqual(self.__timecode(self.ntsc, 3598), "00:02:00;02")
+        # ...but every tenth minute
+        self.assertEqual(self.__timecode(self.ntsc, 17981), "00:09:59;29")
+        self.assertEqual(self.__timecode(self.ntsc, 17982), "00:10:00;00")
+        self.assertEqual(self.__timecode(self.ntsc, 17982 * 6), "01:00:00;00")
+
+    def test_drop_frame_timecode_59_94(self):
+        # four frame numbers are skipped at 59.94
+        self.assertEqual(self.__timecode(self.ntsc_60, 3599), "00:00:59;59")
+        self.assertEqual(self.__timecode(self.ntsc_60, 3600), "00:01:00;04")
+        self.assertEqual(self.__timecode(self.ntsc_60, 35964), "00:10:00;00")
+
+    def test_drop_frame_override(self):
+        self.assertEqual(self.__timecode(self.ntsc, 1800, drop_frame=False), "00:01:00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
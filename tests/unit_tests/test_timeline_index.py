@@ -0,0 +1,144 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import unittest
+
+from tk_premiere.timeline_index import IntervalIndex, TimelineIndex
+
+
+def _track(track_id, name, media_type, clips):
+    return dict(
+        id=track_id,
+        name=name,
+        mediaType=media_type,
+        isMuted=False,
+        clips=[dict(name=n, start=s, end=e) for n, s, e in clips],
+        transitions=list(),
+    )
+
+
+class TestIntervalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IntervalIndex([
+            (0, 10, "a"),
+            (10, 20, "b"),
+            (15, 30, "c"),
+            (40, 50, "d"),
+        ])
+
+    def test_at(self):
+        # intervals are half open
+        self.assertEqual(self.index.at(0), ["a"])
+        self.assertEqual(self.index.at(10), ["b"])
+        self.assertEqual(self.index.at(17), ["b", "c"])
+        self.assertEqual(self.index.at(35), [])
+        self.assertEqual(self.index.at(50), [])
+
+    def test_overlapping(self):
+        self.assertEqual(self.index.overlapping(5, 15), ["a", "b"])
+        self.assertEqual(self.index.overlapping(30, 40), [])
+        self.assertEqual(self.index.overlapping(-10, 100), ["a", "b", "c", "d"])
+
+    def test_within(self):
+        self.assertEqual(self.index.within(0, 20), ["a", "b"])
+        self.assertEqual(self.index.within(5, 50), ["b", "c", "d"])
+        self.assertEqual(self.index.within(1, 9), [])
+
+    def test_gaps(self):
+        self.assertEqual(self.index.gaps(), [(30, 40)])
+        self.assertEqual(self.index.gaps(-5, 60), [(-5, 0), (30, 40), (50, 60)])
+        self.assertEqual(IntervalIndex([]).gaps(0, 10), [(0, 10)])
+        self.assertEqual(IntervalIndex([]).gaps(), [])
+
+    def test_overlaps(self):
+        self.assertEqual(self.index.overlaps(), [("b", "c")])
+        # clips butting up against each other don't overlap
+        self.assertEqual(IntervalIndex([(0, 10, "a"), (10, 20, "b")]).overlaps(), [])
+        self.assertEqual(
+            IntervalIndex([(0, 30, "a"), (5, 10, "b"), (8, 20, "c")]).overlaps(),
+            [("a", "b"), ("a", "c"), ("b", "c")],
+        )
+
+    def test_matches_brute_force(self):
+        intervals = [
+            ((i * 7) % 23, (i * 7) % 23 + 1 + (i * 3) % 11, i)
+            for i in range(60)
+        ]
+        index = IntervalIndex(intervals)
+        for point in range(-1, 40):
+            expected = sorted(p for s, e, p in intervals if s <= point < e)
+            self.assertEqual(sorted(index.at(point)), expected)
+            for end in range(point + 1, 40, 5):
+                expected = sorted(p for s, e, p in intervals if s < end and e > point)
+                self.assertEqual(sorted(index.overlapping(point, end)), expected)
+
+
+class TestTimelineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.sequence = dict(
+            videoTracks=[
+                _track(0, "V1", "Video", [("a", 0, 10), ("b", 10, 20), ("c", 25, 30)]),
+                _track(1, "V2", "Video", [("d", 5, 15), ("e", 12, 18)]),
+            ],
+            audioTracks=[
+                _track(0, "A1", "Audio", [("f", 0, 30)]),
+            ],
+        )
+        self.index = TimelineIndex(self.sequence)
+
+    def __names(self, payloads):
+        return sorted(
+            "%s/%s" % (track["name"], clip["name"]) for track, clip in payloads
+        )
+
+    def test_at(self):
+        self.assertEqual(self.__names(self.index.at(12)), ["A1/f", "V1/b", "V2/d", "V2/e"])
+        self.assertEqual(self.__names(self.index.at(12, kind="video")), ["V1/b", "V2/d", "V2/e"])
+        self.assertEqual(self.__names(self.index.at(12, kind="video", track_id=0)), ["V1/b"])
+        self.assertEqual(self.__names(self.index.at(22, kind="video")), [])
+
+    def test_ranges(self):
+        self.assertEqual(
+            self.__names(self.index.overlapping(18, 26, kind="video")),
+            ["V1/b", "V1/c"],
+        )
+        self.assertEqual(
+            self.__names(self.index.within(0, 20, kind="video")),
+            ["V1/a", "V1/b", "V2/d", "V2/e"],
+        )
+
+    def test_gaps(self):
+        gaps = self.index.gaps(kind="video", start=0, end=30)
+        self.assertEqual(
+            [(track["name"], g) for track, g in gaps],
+            [("V1", [(20, 25)]), ("V2", [(0, 5), (18, 30)])],
+        )
+        self.assertEqual(self.index.gaps(kind="audio"), [])
+
+    def test_overlaps(self):
+        overlaps = self.index.overlaps()
+        self.assertEqual(
+            [(a[1]["name"], b[1]["name"]) for a, b in overlaps],
+            [("d", "e")],
+        )
+        self.assertEqual(self.index.overlaps(kind="video", track_id=0), [])
+
+    def test_track_index(self):
+        self.assertEqual(len(self.index.track_index("video", 1)), 2)
+        self.assertIsNone(self.index.track_index("video", 5))
+
+    def test_unknown_kind(self):
+        self.assertRaises(ValueError, self.index.at, 0, kind="subtitles")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# Copyright (c) 2019 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+import unittest
+
+from tk_premiere.worker import BackgroundWorker
+
+
+class TestBackgroundWorker(unittest.TestCase):
+
+    def setUp(self):
+        # callbacks are run on the calling thread of the dispatcher here,
+        # standing in for the Qt thread.
+        self.worker = BackgroundWorker(lambda function: function(), name="TestWorker")
+
+    def tearDown(self):
+        self.worker.shutdown(wait=True)
+
+    def test_result(self):
+        future = self.worker.submit(
+            lambda a, b=0: (a + b, threading.current_thread().name), 1, b=2
+        )
+        self.assertEqual(future.result(timeout=5.0), (3, "TestWorker"))
+        self.assertIsNone(future.exception())
+        self.assertFalse(self.worker.busy)
+
+    def test_exception(self):
+        future = self.worker.submit(lambda: 1 / 0)
+        self.assertIsInstance(future.exception(timeout=5.0), ZeroDivisionError)
+        self.assertRaises(ZeroDivisionError, future.result)
+
+    def test_callbacks(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = list()
+
+        def _job():
+            started.set()
+            release.wait(5.0)
+            return "done"
+
+        future = self.worker.submit(_job)
+        started.wait(5.0)
+        self.assertTrue(self.worker.busy)
+        future.add_done_callback(lambda f: calls.append((f.result(), self.worker.busy)))
+        release.set()
+        # the callback is run once the worker is done with the call
+        self.worker.shutdown(wait=True)
+        self.assertEqual(calls, [("done", False)])
+
+        # callbacks added once done run right away
+        future.add_done_callback(lambda f: calls.append((f.result(), self.worker.busy)))
+        self.assertEqual(calls, [("done", False), ("done", False)])
+
+
+if __name__ == "__main__":
+    unittest.main()